@@ -0,0 +1,17 @@
+from __future__ import annotations
+
+from continuum_engine.checkpoints.manager import (
+	checkpoints_root,
+	forget_checkpoints,
+	latest_checkpoint,
+	list_checkpoints,
+	update_checkpoints,
+)
+
+__all__ = [
+	"checkpoints_root",
+	"forget_checkpoints",
+	"latest_checkpoint",
+	"list_checkpoints",
+	"update_checkpoints",
+]
@@ -0,0 +1,176 @@
+from __future__ import annotations
+
+import json
+import os
+import stat
+import time
+from pathlib import Path
+
+from continuum_engine.utils.walk import DEFAULT_JOBS, tree_stats
+
+MANIFEST_VERSION = 2
+# A directory whose newest file is younger than this may still be being written; its size isn't cached.
+SETTLE_SECONDS = 60.0
+
+
+def checkpoints_root(ws: Path) -> Path:
+	return ws / "models" / "checkpoints"
+
+
+def _manifest_path(ws: Path) -> Path:
+	return ws / ".continuum" / "state" / "checkpoints.json"
+
+
+def _load_manifest(ws: Path) -> dict:
+	path = _manifest_path(ws)
+	if not path.exists():
+		return {}
+	try:
+		manifest = json.loads(path.read_text(encoding="utf-8"))
+	except Exception:
+		return {}
+	if not isinstance(manifest, dict) or manifest.get("version") != MANIFEST_VERSION:
+		return {}
+	if manifest.get("root") != str(checkpoints_root(ws)):
+		return {}
+	entries = manifest.get("entries")
+	return entries if isinstance(entries, dict) else {}
+
+
+def _save_manifest(ws: Path, entries: dict) -> None:
+	path = _manifest_path(ws)
+	path.parent.mkdir(parents=True, exist_ok=True)
+	manifest = {
+		"version": MANIFEST_VERSION,
+		"root": str(checkpoints_root(ws)),
+		"entries": entries,
+	}
+	tmp = path.with_name(path.name + ".tmp")
+	tmp.write_text(json.dumps(manifest, indent=2), encoding="utf-8")
+	os.replace(tmp, path)
+
+
+def _entry_out(root: Path, name: str, rec: dict) -> dict:
+	mtime = rec["mtime_ns"] / 1e9
+	mtime_iso = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(mtime)) if mtime else "unknown"
+	return {
+		"name": name,
+		"path": str(root / name),
+		"is_dir": rec["is_dir"],
+		"mtime": mtime,
+		"mtime_epoch": float(mtime),
+		"mtime_iso": mtime_iso,
+		"size_bytes": rec["size_bytes"],
+	}
+
+
+def _size_of(path: Path, is_dir: bool, st: os.stat_result | None, jobs: int) -> tuple[int, int]:
+	if not is_dir:
+		return (int(st.st_size), int(st.st_mtime_ns)) if st is not None else (0, 0)
+	try:
+		return tree_stats(path, jobs=jobs)
+	except Exception:
+		return 0, 0
+
+
+def _refresh_entries(ws: Path, refresh: bool) -> tuple[dict, dict, bool]:
+	root = checkpoints_root(ws)
+	cached = {} if refresh else _load_manifest(ws)
+	entries: dict = {}
+	stats: dict = {}
+	changed = refresh or not _manifest_path(ws).exists()
+	if not root.exists() or not root.is_dir():
+		return entries, stats, changed or bool(cached)
+	with os.scandir(root) as it:
+		for entry in it:
+			try:
+				st = entry.stat()
+				is_dir = entry.is_dir()
+			except OSError:
+				st = None
+				is_dir = False
+			mtime_ns = int(st.st_mtime_ns) if st is not None else 0
+			prev = cached.get(entry.name)
+			# Writes inside files of a directory entry don't bump its mtime, so only sizes measured
+			# after the entry settled are trusted; younger ones are measured again.
+			if prev and prev.get("mtime_ns") == mtime_ns and prev.get("is_dir") == is_dir and prev.get("settled"):
+				rec = dict(prev)
+			else:
+				rec = {"mtime_ns": mtime_ns, "is_dir": is_dir, "size_bytes": None, "settled": not is_dir}
+				if not is_dir and st is not None:
+					rec["size_bytes"] = int(st.st_size)
+				changed = True
+			entries[entry.name] = rec
+			stats[entry.name] = st
+	if set(cached) - set(entries):
+		changed = True
+	return entries, stats, changed
+
+
+def _fill_size(root: Path, name: str, rec: dict, st: os.stat_result | None, jobs: int) -> bool:
+	if rec.get("size_bytes") is not None:
+		return False
+	size, newest_ns = _size_of(root / name, rec["is_dir"], st, jobs)
+	rec["size_bytes"] = size
+	rec["settled"] = time.time_ns() - max(newest_ns, rec["mtime_ns"]) >= SETTLE_SECONDS * 1e9
+	return True
+
+
+def list_checkpoints(ws: Path, refresh: bool = False, with_sizes: bool = True, jobs: int = DEFAULT_JOBS) -> list[dict]:
+	root = checkpoints_root(ws)
+	entries, stats, changed = _refresh_entries(ws, refresh)
+	if with_sizes:
+		for name, rec in entries.items():
+			if _fill_size(root, name, rec, stats.get(name), jobs):
+				changed = True
+	if changed:
+		_save_manifest(ws, entries)
+	out = [_entry_out(root, name, rec) for name, rec in entries.items()]
+	out.sort(key=lambda e: e.get("mtime", 0), reverse=True)
+	return out
+
+
+def latest_checkpoint(ws: Path, refresh: bool = False, jobs: int = DEFAULT_JOBS) -> dict | None:
+	root = checkpoints_root(ws)
+	entries, stats, changed = _refresh_entries(ws, refresh)
+	if not entries:
+		if changed:
+			_save_manifest(ws, entries)
+		return None
+	name = max(entries, key=lambda n: entries[n]["mtime_ns"])
+	if _fill_size(root, name, entries[name], stats.get(name), jobs):
+		changed = True
+	if changed:
+		_save_manifest(ws, entries)
+	return _entry_out(root, name, entries[name])
+
+
+def forget_checkpoints(ws: Path, names: list[str]) -> None:
+	entries = _load_manifest(ws)
+	if not entries:
+		return
+	for name in names:
+		entries.pop(name, None)
+	_save_manifest(ws, entries)
+
+
+def update_checkpoints(ws: Path, sizes: dict[str, tuple[int, int]]) -> None:
+	# `sizes` maps entry names to (size, newest file mtime_ns) as seen by the caller.
+	root = checkpoints_root(ws)
+	entries = _load_manifest(ws)
+	now_ns = time.time_ns()
+	for name, (size, newest_ns) in sizes.items():
+		try:
+			st = os.stat(root / name)
+		except OSError:
+			entries.pop(name, None)
+			continue
+		is_dir = stat.S_ISDIR(st.st_mode)
+		entries[name] = {
+			"mtime_ns": int(st.st_mtime_ns),
+			"is_dir": is_dir,
+			"size_bytes": size if is_dir else int(st.st_size),
+			# Same rule as _fill_size: a directory still being written is measured again by the next listing.
+			"settled": not is_dir or now_ns - max(newest_ns, int(st.st_mtime_ns)) >= SETTLE_SECONDS * 1e9,
+		}
+	_save_manifest(ws, entries)
@@ -0,0 +1,105 @@
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import shutil
+from pathlib import Path
+
+from continuum_engine.checkpoints import forget_checkpoints, latest_checkpoint, list_checkpoints
+from continuum_engine.daemon import DaemonUnavailable, daemon_query
+from continuum_engine.workspace.validate import ensure_workspace
+
+
+def _daemon_or(ws: Path, args: argparse.Namespace, op: str, local):
+	# --refresh asks for a rescan from disk, which the daemon's cached view would not give.
+	if not args.refresh:
+		try:
+			return daemon_query(ws, op)
+		except DaemonUnavailable:
+			pass
+	return local()
+
+
+def run(args: argparse.Namespace) -> int:
+	ws = Path(args.workspace).expanduser().resolve() if getattr(args, "workspace", None) else Path.cwd().resolve()
+	try:
+		ensure_workspace(ws, require_init=True)
+	except Exception as e:
+		print(f"[err] {e}")
+		return 1
+	checkpoints_root = ws / "models" / "checkpoints"
+
+	if args.ckpt_cmd == "list":
+		entries = _daemon_or(ws, args, "checkpoints", lambda: list_checkpoints(ws, refresh=args.refresh))
+		if args.json:
+			print(json.dumps(entries, indent=2))
+		else:
+			print("NAME\tMTIME\tSIZE_MB\tTYPE")
+			for e in entries:
+				mtime_str = e.get("mtime_iso") or "unknown"
+				size_mb = e["size_bytes"] / (1024 * 1024)
+				typ = "dir" if e["is_dir"] else "file"
+				print(f"{e['name']}\t{mtime_str}\t{size_mb:.2f}\t{typ}")
+		return 0
+
+	if args.ckpt_cmd == "latest":
+		latest = _daemon_or(ws, args, "checkpoints_latest", lambda: latest_checkpoint(ws, refresh=args.refresh))
+		if latest is None:
+			if args.json:
+				print("null")
+			else:
+				print("latest: none")
+			return 0
+		if args.json:
+			print(json.dumps(latest, indent=2))
+		else:
+			mtime_str = latest.get("mtime_iso") or "unknown"
+			size_mb = latest["size_bytes"] / (1024 * 1024)
+			typ = "dir" if latest["is_dir"] else "file"
+			print(f"latest: {latest['name']} {mtime_str} {size_mb:.2f}MB {typ}")
+		return 0
+
+	if args.ckpt_cmd == "prune":
+		entries = list_checkpoints(ws, refresh=args.refresh, with_sizes=False)
+		keep = max(args.keep, 0)
+		to_keep = entries[:keep]
+		to_delete = entries[keep:]
+		if args.dry_run:
+			print(f"would_delete_count: {len(to_delete)}")
+			print(f"kept_count: {len(to_keep)}")
+			return 0
+		try:
+			checkpoints_root_resolved = checkpoints_root.resolve(strict=False)
+		except Exception:
+			try:
+				checkpoints_root_resolved = checkpoints_root.resolve()
+			except Exception:
+				checkpoints_root_resolved = checkpoints_root
+		deleted_count = 0
+		deleted_names = []
+		for e in to_delete:
+			p = Path(e["path"])
+			try:
+				p_resolved = p.resolve()
+			except Exception:
+				print(f"[err] Refusing to delete outside checkpoints_root: {p}")
+				continue
+			if not str(p_resolved).startswith(str(checkpoints_root_resolved) + os.sep) and p_resolved != checkpoints_root_resolved:
+				print(f"[err] Refusing to delete outside checkpoints_root: {p}")
+				continue
+			try:
+				if p.is_dir():
+					shutil.rmtree(p)
+				else:
+					p.unlink()
+				deleted_count += 1
+				deleted_names.append(e["name"])
+			except Exception as ex:
+				print(f"[err] Failed to delete {p}: {ex}")
+		if deleted_names:
+			forget_checkpoints(ws, deleted_names)
+		print(f"deleted_count: {deleted_count}")
+		print(f"kept_count: {len(to_keep)}")
+		return 0
+	return 1
@@ -0,0 +1,43 @@
+from __future__ import annotations
+
+import argparse
+from pathlib import Path
+
+from continuum_engine.create import (
+	CreateContext,
+	list_targets as list_create_targets,
+	create_target,
+	run_doctor as run_create_doctor,
+)
+
+
+def run(args: argparse.Namespace) -> int:
+	ws = Path(args.workspace).expanduser().resolve() if args.workspace else Path.cwd().resolve()
+	if not ws.exists():
+		print(f"[err] Workspace path does not exist: {ws}")
+		return 1
+	if not ws.is_dir():
+		print(f"[err] Workspace path is not a directory: {ws}")
+		return 1
+	ctx = CreateContext(
+		workspace=ws,
+		dry_run=args.dry_run,
+		debug=args.debug,
+		yes=args.yes or args.no_prompt,
+		jobs=args.jobs,
+		force=args.force,
+	)
+	if not args.target:
+		print("[err] Missing create target. Use `continuum create list` to see options.")
+		return 1
+	if args.json and args.target != "doctor":
+		print("[err] --json is only valid with `continuum create doctor`.")
+		return 1
+	if args.target == "list":
+		list_create_targets()
+		return 0
+	if args.target == "doctor":
+		return run_create_doctor(ctx, json_output=args.json)
+	if args.target == "all":
+		return create_target("engine", ctx)
+	return create_target(args.target, ctx)
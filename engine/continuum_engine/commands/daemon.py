@@ -0,0 +1,46 @@
+from __future__ import annotations
+
+import argparse
+import json
+from pathlib import Path
+
+from continuum_engine.daemon import DaemonUnavailable, daemon_query, start_daemon, stop_daemon
+from continuum_engine.workspace.validate import ensure_workspace
+
+
+def run(args: argparse.Namespace) -> int:
+	ws = Path(args.workspace).expanduser().resolve() if args.workspace else Path.cwd().resolve()
+	try:
+		ensure_workspace(ws, require_init=True)
+	except Exception as e:
+		print(f"[err] {e}")
+		return 1
+	if args.daemon_cmd == "run":
+		from continuum_engine.daemon.server import Daemon
+
+		return Daemon(ws).serve()
+	if args.daemon_cmd == "start":
+		try:
+			info = start_daemon(ws)
+		except Exception as e:
+			print(f"[err] {e}")
+			return 1
+		print(f"[ok] daemon running (pid {info['pid']}, watch: {info['watch']})")
+		return 0
+	if args.daemon_cmd == "stop":
+		if stop_daemon(ws):
+			print("[ok] daemon stopped")
+		else:
+			print("daemon: not running")
+		return 0
+	try:
+		info = daemon_query(ws, "ping")
+	except DaemonUnavailable:
+		info = None
+	if args.json:
+		print(json.dumps({"running": info is not None, **(info or {})}, indent=2))
+	elif info is None:
+		print("daemon: not running")
+	else:
+		print(f"daemon: running (pid {info['pid']}, uptime {info['uptime']}s, served {info['served']}, watch: {info['watch']})")
+	return 0
@@ -0,0 +1,52 @@
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+from pathlib import Path
+
+from continuum_engine.runs.manager import count_runs
+
+
+def run(args: argparse.Namespace) -> int:
+	ws = Path(args.workspace).expanduser().resolve() if args.workspace else Path.cwd().resolve()
+	print(f"python: {sys.executable}")
+	print(f"VIRTUAL_ENV: {os.environ.get('VIRTUAL_ENV') or 'not set'}")
+	print(f"workspace: {ws}")
+	try:
+		ws_exists = ws.exists()
+		ws_is_dir = ws.is_dir()
+	except Exception as e:
+		print(f"[err] Workspace check failed: {e}")
+		return 1
+	print(f"workspace_exists: {ws_exists}")
+	print(f"workspace_is_dir: {ws_is_dir}")
+	cont = ws / ".continuum"
+	print(f".continuum_exists: {cont.exists()}")
+	for name in ["runs", "logs", "cache", "state"]:
+		p = cont / name
+		print(f".continuum/{name}: {'ok' if p.exists() else 'missing'}")
+	cfg = ws / "continuum.yaml"
+	print(f"continuum.yaml: {cfg.exists()}")
+	run_count = 0
+	if cont.exists() and (cont / "runs").is_dir():
+		try:
+			run_count = count_runs(ws)
+		except Exception as e:
+			print(f"[err] Run count failed: {e}")
+	print(f"run_count: {run_count}")
+	cache = None
+	if cont.exists():
+		try:
+			from continuum_engine.ollama.cache import cache_stats
+
+			cache = cache_stats(ws)
+		except Exception as e:
+			print(f"[err] Ollama cache check failed: {e}")
+	if cache is None:
+		print("ollama_cache: none")
+	else:
+		hit_rate = f"{cache['hit_rate']:.1%}" if cache["hit_rate"] is not None else "n/a"
+		print(f"ollama_cache: {cache['entries']} entries, {cache['bytes']}/{cache['max_bytes']} bytes")
+		print(f"ollama_cache_hits: {cache['hits']} (misses {cache['misses']}, hit_rate {hit_rate}, evictions {cache['evictions']})")
+	return 0
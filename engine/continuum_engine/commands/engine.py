@@ -0,0 +1,68 @@
+from __future__ import annotations
+
+import argparse
+import os
+import shutil
+import subprocess
+import traceback
+from pathlib import Path
+
+from continuum_engine.engine import find_run_all, run_sharded, shardable
+from continuum_engine.runs.launch import launch, log_options_from_args
+
+
+def run(args: argparse.Namespace) -> int:
+	ws = Path(args.workspace).expanduser().resolve() if args.workspace else Path.cwd().resolve()
+	if not ws.exists():
+		print(f"[err] Workspace path does not exist: {ws}")
+		return 1
+	if not ws.is_dir():
+		print(f"[err] Workspace path is not a directory: {ws}")
+		return 1
+	run_all = find_run_all(ws)
+	if run_all is None:
+		print("[err] Data engine not found. Expected run_all.py under external/Model_Data-1O/app or external/model_data_1o/app")
+		return 1
+	if shutil.which("python3") is None:
+		print("[err] python3 not found. Run `continuum install base`.")
+		return 1
+	passthrough = args.passthrough
+	if passthrough and passthrough[0] == "--":
+		passthrough = passthrough[1:]
+	print(f"Running data engine: {run_all}")
+	if args.shards:
+		if not (ws / ".continuum").exists():
+			print("[err] Sharded mode needs an initialized workspace. Run `continuum init`.")
+			return 1
+		try:
+			opted_in = shardable(ws)
+		except ValueError as e:
+			print(f"[err] {e}")
+			return 1
+		if not opted_in:
+			print("[err] Sharded mode is opt-in: each shard's run_all.py must read its stage dirs from CONTINUUM_STAGE{1,2,3}_*_DIR or ./continuum.yaml, or every shard processes the whole dataset.")
+			print("      Once it does, set engine.shardable: true in continuum.yaml.")
+			return 1
+		jobs = args.jobs or min(args.shards, os.cpu_count() or 1)
+		return run_sharded(
+			ws,
+			run_all,
+			passthrough,
+			shards=args.shards,
+			jobs=jobs,
+			retries=args.retries,
+			log_opts=log_options_from_args(args),
+			debug=args.debug,
+		)
+	cmd = ["python3", str(run_all)] + passthrough
+	if not (ws / ".continuum").exists():
+		try:
+			result = subprocess.run(cmd)
+			return result.returncode
+		except Exception as e:
+			if args.debug:
+				print(traceback.format_exc())
+				return 1
+			print(f"[err] {e}")
+			return 1
+	return launch(ws, "engine", cmd, log_opts=log_options_from_args(args), debug=args.debug)
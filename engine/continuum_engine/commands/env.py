@@ -0,0 +1,93 @@
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import platform
+import shutil
+import sys
+from pathlib import Path
+
+from continuum_engine.probe import cached_packages
+
+
+def run(args: argparse.Namespace) -> int:
+	ws = Path(args.workspace).expanduser().resolve() if args.workspace else Path.cwd().resolve()
+	if not ws.exists():
+		print(f"[err] Workspace path does not exist: {ws}")
+		return 1
+	if not ws.is_dir():
+		print(f"[err] Workspace path is not a directory: {ws}")
+		return 1
+	try:
+		disk = shutil.disk_usage(ws)
+	except Exception as e:
+		print(f"[err] {e}")
+		return 1
+
+	ram_total = None
+	ram_free = None
+	try:
+		import psutil  # type: ignore
+		vm = psutil.virtual_memory()
+		ram_total = int(vm.total)
+		ram_free = int(vm.available)
+	except Exception:
+		pass
+
+	packages, probe_meta = cached_packages(ws, refresh=args.refresh, timeout=args.probe_timeout)
+	torch_info = packages["torch"]
+
+	env = {
+		"python": {
+			"executable": sys.executable,
+			"version": sys.version,
+			"platform": platform.platform(),
+		},
+		"venv": {
+			"virtual_env": os.environ.get("VIRTUAL_ENV"),
+		},
+		"hardware": {
+			"cpu_count": os.cpu_count(),
+			"ram_total_bytes": ram_total,
+			"ram_free_bytes": ram_free,
+			"disk_total_bytes": int(disk.total),
+			"disk_free_bytes": int(disk.free),
+		},
+		"torch": torch_info,
+		"optional_libs": packages["optional_libs"],
+		"probe": probe_meta,
+	}
+
+	initialized = (ws / ".continuum").exists()
+	want_write = (initialized and not args.no_write) or (not initialized and args.write and not args.no_write)
+	if want_write:
+		state_dir = ws / ".continuum" / "state"
+		if state_dir.exists() and state_dir.is_dir():
+			out_path = state_dir / "env.json"
+			tmp = out_path.with_name(out_path.name + ".tmp")
+			tmp.write_text(json.dumps(env, indent=2), encoding="utf-8")
+			os.replace(tmp, out_path)
+			print(f"[ok] Wrote env artifact: {out_path}")
+
+	if args.json:
+		print(json.dumps(env, indent=2))
+		return 0
+
+	top_gpu_name = None
+	top_gpu_mem = None
+	if torch_info.get("gpus"):
+		g0 = max(torch_info["gpus"], key=lambda g: g.get("total_memory_bytes") or 0)
+		top_gpu_name = g0.get("name")
+		top_gpu_mem = g0.get("total_memory_bytes")
+	print(f"python: {sys.executable}")
+	print(f"venv: {os.environ.get('VIRTUAL_ENV') or 'not set'}")
+	print(f"torch_installed: {torch_info.get('installed')}")
+	print(f"cuda_available: {torch_info.get('cuda_available')}")
+	print(f"gpu_count: {torch_info.get('device_count')}")
+	print(f"top_gpu: {top_gpu_name or 'n/a'}")
+	print(f"top_gpu_mem_bytes: {top_gpu_mem if top_gpu_mem is not None else 'n/a'}")
+	print(f"disk_free_bytes: {int(disk.free)}")
+	print(f"ram_free_bytes: {ram_free if ram_free is not None else 'n/a'}")
+	print(f"probe: {probe_meta['source']}")
+	return 0
@@ -0,0 +1,98 @@
+from __future__ import annotations
+
+import argparse
+import json
+import shlex
+import sys
+from pathlib import Path
+
+from continuum_engine.infer import InferUnavailable, server_status, submit
+from continuum_engine.probe import backend_capabilities, check_backend, choose_backend
+from continuum_engine.runs.launch import launch, log_options_from_args
+from continuum_engine.utils.jsonl import write_jsonl
+from continuum_engine.workspace.validate import ensure_workspace
+
+
+def run(args: argparse.Namespace) -> int:
+	ws = Path(args.workspace).expanduser().resolve() if args.workspace else Path.cwd().resolve()
+	try:
+		ensure_workspace(ws, require_init=True)
+	except Exception as e:
+		print(f"[err] {e}")
+		return 1
+	if args.submit:
+		return _submit(ws, args)
+	if not args.script:
+		print("[err] --script is required (except with --submit)")
+		return 1
+	script_path = Path(args.script).expanduser()
+	if not script_path.is_absolute():
+		script_path = (Path.cwd() / script_path).resolve()
+	if not script_path.exists():
+		print(f"[err] Script not found: {script_path}")
+		return 1
+	passthrough = args.passthrough
+	if passthrough and passthrough[0] == "--":
+		passthrough = passthrough[1:]
+
+	selected = args.backend
+	source = None
+	if selected != "python":
+		caps, source = backend_capabilities(ws, refresh=args.refresh_backend)
+		if selected == "auto":
+			selected = choose_backend(caps)
+		else:
+			err = check_backend(selected, caps)
+			if err is not None:
+				print(f"[err] {err}")
+				return 1
+
+	cmd = [sys.executable, str(script_path), *passthrough]
+	if args.serve:
+		try:
+			info = server_status(ws)
+			print(f"[err] an inference server is already running for this workspace (pid {info['pid']}, {info['script']})")
+			return 1
+		except (InferUnavailable, RuntimeError):
+			pass
+		cmd = [
+			sys.executable, "-m", "continuum_engine.infer.server",
+			"--workspace", str(ws),
+			"--script", str(script_path),
+			"--max-batch-size", str(args.max_batch_size),
+			"--max-wait-ms", str(args.max_wait_ms),
+		]
+
+	if args.dry_run:
+		print(f"backend: {selected}" + (f" ({source})" if source else ""))
+		print(shlex.join(cmd))
+		return 0
+
+	return launch(ws, "infer-serve" if args.serve else "infer", cmd, log_opts=log_options_from_args(args))
+
+
+def _read_inputs(args: argparse.Namespace):
+	for value in args.input or []:
+		yield value
+	if args.input_file is None and args.input:
+		return
+	stream = sys.stdin if args.input_file in (None, "-") else open(args.input_file, encoding="utf-8")
+	try:
+		for line in stream:
+			if line.strip():
+				yield json.loads(line)
+	finally:
+		if stream is not sys.stdin:
+			stream.close()
+
+
+def _submit(ws: Path, args: argparse.Namespace) -> int:
+	try:
+		write_jsonl(submit(ws, _read_inputs(args)))
+	except InferUnavailable as e:
+		print(f"[err] {e}")
+		return 1
+	except (OSError, ValueError, RuntimeError) as e:
+		print(f"[err] {e}")
+		return 1
+	return 0
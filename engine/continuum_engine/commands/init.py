@@ -0,0 +1,28 @@
+from __future__ import annotations
+
+import argparse
+from pathlib import Path
+
+from continuum_engine.runs.manager import create_run, finish_run
+from continuum_engine.workspace.layout import init_workspace
+
+
+def run(args: argparse.Namespace) -> int:
+	ws = Path(args.workspace).expanduser().resolve() if args.workspace else Path.cwd().resolve()
+	try:
+		if not ws.exists():
+			raise FileNotFoundError(f"Workspace path does not exist: {ws}")
+		if not ws.is_dir():
+			raise NotADirectoryError(f"Workspace path is not a directory: {ws}")
+		init_workspace(ws)
+		try:
+			run = create_run(ws, command="init")
+			finish_run(run, "success")
+			print(f"[run] {run.run_id}")
+		except Exception as e:
+			print(f"[warn] Run logging failed: {e}")
+		print(f"[ok] Workspace initialized at: {ws}")
+		return 0
+	except Exception as e:
+		print(f"[err] {e}")
+		return 1
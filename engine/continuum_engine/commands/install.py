@@ -0,0 +1,42 @@
+from __future__ import annotations
+
+import argparse
+from pathlib import Path
+
+from continuum_engine.install import (
+	InstallContext,
+	install_target,
+	list_targets,
+	run_doctor,
+)
+
+
+def run(args: argparse.Namespace) -> int:
+	ws = Path(args.workspace).expanduser().resolve() if args.workspace else Path.cwd().resolve()
+	if not ws.exists():
+		print(f"[err] Workspace path does not exist: {ws}")
+		return 1
+	if not ws.is_dir():
+		print(f"[err] Workspace path is not a directory: {ws}")
+		return 1
+	ctx = InstallContext(
+		workspace=ws,
+		dry_run=args.dry_run,
+		debug=args.debug,
+		yes=args.yes or args.no_prompt,
+		jobs=args.jobs,
+	)
+	if not args.target:
+		print("[err] Missing install target. Use `continuum install list` to see options.")
+		return 1
+	if args.json and args.target != "doctor":
+		print("[err] --json is only valid with `continuum install doctor`.")
+		return 1
+	if args.target == "list":
+		list_targets()
+		return 0
+	if args.target == "doctor":
+		return run_doctor(ctx, json_output=args.json)
+	if args.target == "all":
+		return install_target("full", ctx)
+	return install_target(args.target, ctx)
@@ -0,0 +1,43 @@
+from __future__ import annotations
+
+import argparse
+from pathlib import Path
+
+from continuum_engine.pull import (
+	PullContext,
+	list_targets as list_pull_targets,
+	pull_target,
+	run_doctor as run_pull_doctor,
+)
+
+
+def run(args: argparse.Namespace) -> int:
+	ws = Path(args.workspace).expanduser().resolve() if args.workspace else Path.cwd().resolve()
+	if not ws.exists():
+		print(f"[err] Workspace path does not exist: {ws}")
+		return 1
+	if not ws.is_dir():
+		print(f"[err] Workspace path is not a directory: {ws}")
+		return 1
+	ctx = PullContext(
+		workspace=ws,
+		dry_run=args.dry_run,
+		debug=args.debug,
+		yes=args.yes or args.no_prompt,
+		jobs=args.jobs,
+		retries=args.retries,
+	)
+	if not args.target:
+		print("[err] Missing pull target. Use `continuum pull list` to see options.")
+		return 1
+	if args.json and args.target != "doctor":
+		print("[err] --json is only valid with `continuum pull doctor`.")
+		return 1
+	if args.target == "list":
+		list_pull_targets()
+		return 0
+	if args.target == "doctor":
+		return run_pull_doctor(ctx, json_output=args.json)
+	if args.target == "all":
+		return pull_target("data_models", ctx)
+	return pull_target(args.target, ctx)
@@ -0,0 +1,138 @@
+from __future__ import annotations
+
+import argparse
+import json
+from datetime import datetime, timezone
+from pathlib import Path
+
+from continuum_engine.daemon import DaemonUnavailable, daemon_query
+from continuum_engine.runs.index import normalize_since
+from continuum_engine.runs.logs import follow, tail_with_position
+from continuum_engine.runs.manager import iter_runs, query_runs, read_run_meta, reindex_runs
+from continuum_engine.runs.telemetry import summarize_telemetry
+from continuum_engine.utils.jsonl import write_jsonl
+from continuum_engine.workspace.validate import ensure_workspace
+
+
+def _parse_iso(value: str | None) -> datetime | None:
+	if not value:
+		return None
+	try:
+		return datetime.fromisoformat(value.replace("Z", "+00:00"))
+	except ValueError:
+		return None
+
+
+def _wall_seconds(meta: dict) -> float | None:
+	started = _parse_iso(meta.get("started_at"))
+	if started is None:
+		return None
+	finished = _parse_iso(meta.get("finished_at"))
+	if finished is None:
+		if meta.get("status") != "running":
+			return None
+		finished = datetime.now(timezone.utc)
+	return (finished - started).total_seconds()
+
+
+def _show_log(run_dir: Path, meta: dict, args: argparse.Namespace) -> int:
+	log_path = Path(meta.get(f"{args.stream}_path") or run_dir / f"{args.stream}.log")
+	lines, position = tail_with_position(log_path, args.tail if args.tail is not None else 10)
+	for line in lines:
+		print(line)
+	if not args.follow:
+		return 0
+
+	def finished() -> bool:
+		try:
+			return read_run_meta(run_dir).get("status") != "running"
+		except Exception:
+			return True
+
+	try:
+		for line in follow(log_path, finished, start=position):
+			print(line, flush=True)
+	except KeyboardInterrupt:
+		return 130
+	return 0
+
+
+def run(args: argparse.Namespace) -> int:
+	ws = Path(args.workspace).expanduser().resolve() if getattr(args, "workspace", None) else Path.cwd().resolve()
+	if args.runs_cmd == "list":
+		try:
+			ensure_workspace(ws, require_init=True)
+			if args.since:
+				args.since = normalize_since(args.since)
+			if args.jsonl:
+				# Stream straight from the SQLite cursor; the daemon would hand back one big list.
+				write_jsonl(iter_runs(ws, limit=args.limit, status=args.status, since=args.since))
+				return 0
+			try:
+				entries = daemon_query(ws, "runs", limit=args.limit, status=args.status, since=args.since)
+			except DaemonUnavailable:
+				entries = query_runs(ws, limit=args.limit, status=args.status, since=args.since)
+			if args.json:
+				print(json.dumps(entries, indent=2))
+			else:
+				print("RUN_ID\tSTATUS\tCOMMAND\tSTARTED_AT")
+				for meta in entries:
+					run_id = meta.get("run_id", "unknown")
+					status = meta.get("status", "unknown")
+					command = meta.get("command", "unknown")
+					started = meta.get("started_at", "unknown")
+					print(f"{run_id}\t{status}\t{command}\t{started}")
+			return 0
+		except Exception as e:
+			print(f"[err] {e}")
+			return 1
+	if args.runs_cmd == "show":
+		try:
+			ensure_workspace(ws, require_init=True)
+			run_dir = ws / ".continuum" / "runs" / args.run_id
+			if not run_dir.exists() or not run_dir.is_dir():
+				raise FileNotFoundError(f"Run not found: {args.run_id}")
+			meta = read_run_meta(run_dir)
+			if args.tail is not None or args.follow:
+				return _show_log(run_dir, meta, args)
+			stdout_path = meta.get("stdout_path")
+			stderr_path = meta.get("stderr_path")
+			telemetry = summarize_telemetry(run_dir)
+			wall = _wall_seconds(meta)
+			if args.json:
+				out = dict(meta)
+				out["wall_seconds"] = wall
+				out["telemetry"] = telemetry
+				print(json.dumps(out, indent=2))
+			else:
+				print(f"run_id: {meta.get('run_id')}")
+				print(f"status: {meta.get('status')}")
+				print(f"command: {meta.get('command')}")
+				print(f"workspace: {meta.get('workspace')}")
+				print(f"started_at: {meta.get('started_at')}")
+				print(f"finished_at: {meta.get('finished_at')}")
+				print(f"stdout_path: {stdout_path if stdout_path else 'missing'}")
+				print(f"stderr_path: {stderr_path if stderr_path else 'missing'}")
+				print(f"wall_seconds: {wall if wall is not None else 'unknown'}")
+				if telemetry:
+					peak_rss = telemetry.get("peak_rss_bytes")
+					avg_cpu = telemetry.get("avg_cpu_percent")
+					peak_gpu = telemetry.get("peak_gpu_mem_bytes")
+					print(f"peak_rss_mb: {peak_rss / (1024 * 1024):.1f}" if peak_rss is not None else "peak_rss_mb: n/a")
+					print(f"avg_cpu_percent: {avg_cpu if avg_cpu is not None else 'n/a'}")
+					print(f"peak_gpu_mem_mb: {peak_gpu / (1024 * 1024):.1f}" if peak_gpu is not None else "peak_gpu_mem_mb: n/a")
+					print(f"telemetry_samples: {telemetry.get('samples')}")
+			return 0
+		except Exception as e:
+			print(f"[err] {e}")
+			return 1
+	if args.runs_cmd == "reindex":
+		try:
+			ensure_workspace(ws, require_init=True)
+			count = reindex_runs(ws)
+			print(f"[ok] Indexed {count} runs")
+			return 0
+		except Exception as e:
+			print(f"[err] {e}")
+			return 1
+	return 1
@@ -0,0 +1,78 @@
+from __future__ import annotations
+
+import argparse
+import json
+from pathlib import Path
+
+from continuum_engine.runs.manager import create_run, finish_run
+from continuum_engine.scan import scan_workspace
+from continuum_engine.utils.jsonl import JsonlWriter
+from continuum_engine.utils.walk import DEFAULT_JOBS
+from continuum_engine.workspace.validate import ensure_workspace
+
+
+def run(args: argparse.Namespace) -> int:
+	ws = Path(args.workspace).expanduser().resolve() if args.workspace else Path.cwd().resolve()
+	try:
+		ensure_workspace(ws, require_init=True)
+	except Exception as e:
+		print(f"[err] {e}")
+		return 1
+	run = None
+	try:
+		run = create_run(ws, command="scan")
+		jobs = args.jobs or DEFAULT_JOBS
+		quiet = args.json or args.jsonl
+		writer = JsonlWriter() if args.jsonl else None
+		on_dir = None
+		if writer is not None:
+			def on_dir(rel: str, record: dict) -> None:
+				for name, rec in record["files"].items():
+					writer.write({
+						"type": "file",
+						"path": f"{rel}/{name}" if rel else name,
+						"size": rec[0],
+						"mtime_ns": rec[1],
+						"hash": rec[3],
+					})
+
+		result = scan_workspace(ws, full=args.full, want_hash=not args.no_hash, jobs=jobs, on_dir=on_dir)
+		if args.dedup or args.consolidate:
+			from continuum_engine.scan.dedup import consolidate, find_duplicates
+
+			report = find_duplicates(ws, min_size=args.min_size, jobs=jobs)
+			result["dedup"] = {k: v for k, v in report.items() if k != "sets"}
+			if writer is not None:
+				for dup in report["sets"]:
+					writer.write({"type": "duplicate_set", **dup})
+			if not quiet:
+				print(
+					f"[ok] {report['duplicate_sets']} duplicate sets, {report['duplicate_files']} redundant files, "
+					f"{report['reclaimable_bytes']} bytes reclaimable (report: .continuum/state/dedup.json)"
+				)
+			if args.consolidate:
+				linked = consolidate(ws, report, args.consolidate, dry_run=args.dry_run)
+				result["dedup"]["consolidate"] = linked
+				if not quiet:
+					prefix = "[dry-run] would link" if args.dry_run else "[ok] linked"
+					print(f"{prefix} {linked['linked']} files ({linked['bytes']} bytes) via {args.consolidate}, {linked['skipped']} skipped")
+					for err in linked["errors"]:
+						print(f"[warn] {err}")
+				if not args.dry_run and linked["linked"]:
+					# Consolidated files have new inodes; refresh the index so the next scan reuses them.
+					scan_workspace(ws, want_hash=not args.no_hash, jobs=jobs)
+		finish_run(run, "success")
+		if writer is not None:
+			writer.write({"type": "summary", **result})
+			writer.close()
+		elif args.json:
+			print(json.dumps(result, indent=2))
+		return 0
+	except Exception as e:
+		if run is not None:
+			try:
+				finish_run(run, "failed")
+			except Exception:
+				pass
+		print(f"[err] {e}")
+		return 1
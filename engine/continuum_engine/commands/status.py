@@ -0,0 +1,57 @@
+from __future__ import annotations
+
+import argparse
+import json
+from pathlib import Path
+
+from continuum_engine.daemon import DaemonUnavailable, daemon_query
+from continuum_engine.runs.manager import count_runs, query_runs
+from continuum_engine.workspace.validate import ensure_workspace
+
+
+def _local_status(ws: Path) -> dict:
+	run_count = 0
+	latest = None
+	try:
+		run_count = count_runs(ws)
+		recent = query_runs(ws, limit=1)
+		latest = recent[0] if recent else None
+	except Exception:
+		run_count = 0
+		latest = None
+	return {
+		"workspace": str(ws),
+		"initialized": True,
+		"run_count": run_count,
+		"latest_run": {
+			"run_id": latest.get("run_id"),
+			"status": latest.get("status"),
+			"command": latest.get("command"),
+			"started_at": latest.get("started_at"),
+		} if latest else None,
+	}
+
+
+def run(args: argparse.Namespace) -> int:
+	ws = Path(args.workspace).expanduser().resolve() if args.workspace else Path.cwd().resolve()
+	try:
+		ensure_workspace(ws, require_init=True)
+	except Exception:
+		print("Not a Continuum workspace. Run `continuum init`.")
+		return 1
+	try:
+		out = daemon_query(ws, "status")
+	except DaemonUnavailable:
+		out = _local_status(ws)
+	if args.json:
+		print(json.dumps(out, indent=2))
+	else:
+		print(f"workspace: {out['workspace']}")
+		print(f"initialized: {out['initialized']}")
+		print(f"run_count: {out['run_count']}")
+		if out["latest_run"]:
+			lr = out["latest_run"]
+			print(f"latest_run: {lr['run_id']} {lr['status']} {lr['command']} {lr['started_at']}")
+		else:
+			print("latest_run: none")
+	return 0
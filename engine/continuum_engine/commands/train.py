@@ -0,0 +1,49 @@
+from __future__ import annotations
+
+import argparse
+import shlex
+import shutil
+import sys
+from pathlib import Path
+
+from continuum_engine.runs.launch import launch, log_options_from_args
+from continuum_engine.workspace.validate import ensure_workspace
+
+
+def run(args: argparse.Namespace) -> int:
+	ws = Path(args.workspace).expanduser().resolve() if args.workspace else Path.cwd().resolve()
+	try:
+		ensure_workspace(ws, require_init=True)
+	except Exception as e:
+		print(f"[err] {e}")
+		return 1
+	script_path = Path(args.script).expanduser()
+	if not script_path.is_absolute():
+		script_path = (Path.cwd() / script_path).resolve()
+	if not script_path.exists():
+		print(f"[err] Script not found: {script_path}")
+		return 1
+	passthrough = args.passthrough
+	if passthrough and passthrough[0] == "--":
+		passthrough = passthrough[1:]
+	cmd = []
+	if args.backend == "accelerate":
+		if shutil.which("accelerate"):
+			cmd = ["accelerate", "launch", str(script_path), *passthrough]
+		else:
+			print("[warn] accelerate not found, falling back to python backend.")
+			cmd = [sys.executable, str(script_path), *passthrough]
+	elif args.backend == "torchrun":
+		try:
+			import torch  # type: ignore
+		except Exception:
+			print("[err] torch not installed")
+			return 1
+		cmd = [sys.executable, "-m", "torch.distributed.run", str(script_path), *passthrough]
+	else:
+		cmd = [sys.executable, str(script_path), *passthrough]
+
+	if args.dry_run:
+		print(shlex.join(cmd))
+		return 0
+	return launch(ws, "train", cmd, log_opts=log_options_from_args(args))
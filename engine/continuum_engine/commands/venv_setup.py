@@ -0,0 +1,52 @@
+from __future__ import annotations
+
+import argparse
+import sys
+from pathlib import Path
+
+from continuum_engine.workspace.setup import (
+	ensure_venv_active,
+	generate_requirements,
+	repo_root_from_here,
+	run_cmd,
+)
+
+
+def run(args: argparse.Namespace) -> int:
+	if args.emit:
+		snippet = (
+			'command -v python3 >/dev/null 2>&1 || { echo "python3 not found" >&2; return 1; }\n'
+			'[ -d ".venv" ] || python3 -m venv .venv\n'
+			'. ".venv/bin/activate"\n'
+		)
+		print(snippet, end="")
+		return 0
+	if not ensure_venv_active():
+		print("[err] No active virtual environment detected.")
+		print("Run:")
+		print("  python -m venv .venv")
+		print("  source .venv/bin/activate")
+		return 1
+	try:
+		py = sys.executable
+		print(f"[info] Using Python: {py}")
+		run_cmd([py, "-m", "pip", "install", "-U", "pip", "setuptools", "wheel"])
+		repo_root = repo_root_from_here()
+		run_cmd([py, "-m", "pip", "install", "-e", str(repo_root / "engine")])
+		req_path = Path.cwd() / "requirements.txt"
+		if not req_path.exists() or args.force:
+			generate_requirements(req_path, profile=args.profile)
+			print(f"[ok] Wrote requirements: {req_path}")
+		else:
+			print(f"[ok] Using existing requirements: {req_path}")
+		if not args.no_install:
+			if args.profile == "ai":
+				print("[warn] AI profile installs torch. CUDA/driver mismatches may require manual install.")
+			run_cmd([py, "-m", "pip", "install", "-r", str(req_path)])
+		if args.smoke:
+			run_cmd(["continuum", "--help"])
+			print("[ok] Smoke check passed.")
+		return 0
+	except Exception as e:
+		print(f"[err] {e}")
+		return 1
@@ -0,0 +1,42 @@
+from __future__ import annotations
+
+import argparse
+import signal
+import threading
+from pathlib import Path
+
+from continuum_engine.scan.watch import WorkspaceWatcher
+from continuum_engine.utils.walk import DEFAULT_JOBS
+from continuum_engine.workspace.validate import ensure_workspace
+
+
+def run(args: argparse.Namespace) -> int:
+	ws = Path(args.workspace).expanduser().resolve() if args.workspace else Path.cwd().resolve()
+	try:
+		ensure_workspace(ws, require_init=True)
+	except Exception as e:
+		print(f"[err] {e}")
+		return 1
+	watcher = WorkspaceWatcher(
+		ws,
+		want_hash=args.hash,
+		flush_interval=args.flush_interval,
+		sweep_interval=args.sweep_interval,
+		jobs=args.jobs or DEFAULT_JOBS,
+	)
+	stop = threading.Event()
+	signal.signal(signal.SIGTERM, lambda *_: stop.set())
+
+	def on_flush(w: WorkspaceWatcher) -> None:
+		print(f"[ok] {w.totals['files']} files, {w.totals['bytes']} bytes ({w.mode})", flush=True)
+
+	print(f"[run] watching {ws} (Ctrl-C to stop)", flush=True)
+	try:
+		watcher.run(stop, on_flush=on_flush)
+	except KeyboardInterrupt:
+		pass
+	except Exception as e:
+		print(f"[err] {e}")
+		return 1
+	print(f"[ok] stopped; {watcher.stats['events']} events, {watcher.stats['sweeps']} sweeps, {watcher.stats['overflows']} overflows")
+	return 0
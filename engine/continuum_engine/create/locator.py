@@ -0,0 +1,120 @@
+from __future__ import annotations
+
+import json
+import os
+from collections import deque
+from pathlib import Path
+
+LOCATOR_VERSION = 2
+PRUNE_DIRS = frozenset({
+	".git",
+	"__pycache__",
+	"blobs",
+	"checkpoint",
+	"checkpoints",
+	"weights",
+	"runs",
+	"wandb",
+	"outputs",
+})
+PRUNE_PREFIXES = ("checkpoint-", "global_step")
+WEIGHT_SUFFIXES = (".safetensors", ".bin", ".gguf", ".pt", ".pth", ".ckpt", ".onnx", ".npz")
+
+
+def _index_path(ws: Path) -> Path:
+	return ws / ".continuum" / "cache" / "modelfiles.json"
+
+
+def _load_index(ws: Path) -> dict:
+	try:
+		data = json.loads(_index_path(ws).read_text(encoding="utf-8"))
+	except Exception:
+		return {}
+	if data.get("version") != LOCATOR_VERSION:
+		return {}
+	return data.get("entries") or {}
+
+
+def _save_index(ws: Path, entries: dict) -> None:
+	path = _index_path(ws)
+	try:
+		path.parent.mkdir(parents=True, exist_ok=True)
+		tmp = path.with_name(path.name + ".tmp")
+		tmp.write_text(json.dumps({"version": LOCATOR_VERSION, "entries": entries}, indent=2), encoding="utf-8")
+		os.replace(tmp, path)
+	except OSError:
+		pass
+
+
+def _pruned(name: str) -> bool:
+	return name in PRUNE_DIRS or name.startswith(PRUNE_PREFIXES)
+
+
+def scan_modelfiles(base: Path) -> tuple[Path | None, list[Path], dict[str, int]]:
+	# Breadth-first in name order so the shallowest exact Modelfile wins deterministically.
+	candidates: list[Path] = []
+	visited: dict[str, int] = {}
+	queue = deque([base])
+	while queue:
+		current = queue.popleft()
+		try:
+			visited[str(current)] = current.stat().st_mtime_ns
+			with os.scandir(current) as it:
+				entries = sorted(it, key=lambda e: e.name)
+		except OSError:
+			continue
+		for entry in entries:
+			try:
+				if entry.is_dir(follow_symlinks=False):
+					if not _pruned(entry.name):
+						queue.append(Path(entry.path))
+					continue
+				if not entry.is_file():
+					continue
+			except OSError:
+				continue
+			if entry.name == "Modelfile":
+				return Path(entry.path), candidates, visited
+			lower = entry.name.lower()
+			if "modelfile" in lower and not lower.endswith(WEIGHT_SUFFIXES):
+				candidates.append(Path(entry.path))
+	return None, candidates, visited
+
+
+def _mtime_ns(path: Path) -> int | None:
+	try:
+		return path.stat().st_mtime_ns
+	except OSError:
+		return None
+
+
+def locate_modelfile(ws: Path, base: Path) -> Path | None:
+	if not base.is_dir():
+		return None
+	key = str(base)
+	entries = _load_index(ws)
+	cached = entries.get(key)
+	if cached:
+		path = Path(cached["path"])
+		# Trust the cached hit while the file and every directory the scan walked are untouched.
+		dirs = cached.get("dirs") or {}
+		if _mtime_ns(path) == cached.get("mtime_ns") and all(_mtime_ns(Path(d)) == m for d, m in dirs.items()):
+			return path
+	exact, candidates, visited = scan_modelfiles(base)
+	found = exact
+	if found is None and candidates:
+		found = candidates[0]
+		if len(candidates) > 1:
+			names = ", ".join(str(p.relative_to(base)) for p in candidates)
+			print(f"[warn] Ambiguous Modelfile candidates under {base}: {names}; using {found.relative_to(base)}")
+	if found is None:
+		entries.pop(key, None)
+	else:
+		entries[key] = {
+			"path": str(found),
+			"mtime_ns": _mtime_ns(found),
+			"dirs": visited,
+			"candidates": [str(p) for p in candidates],
+		}
+	_save_index(ws, entries)
+	return found
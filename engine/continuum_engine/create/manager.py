@@ -1,14 +1,18 @@
 from __future__ import annotations
 
+import hashlib
 import json
 import shutil
 import subprocess
-import traceback
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from datetime import datetime, timezone
 from pathlib import Path
 from typing import Callable
 
+from continuum_engine.create.locator import locate_modelfile
+from continuum_engine.ollama import get_inventory, invalidate_inventory, model_digest
+from continuum_engine.plan import DEFAULT_PLAN_JOBS, NodeResult, PlanNode, execute_plan, report_failure, resolve_plan
+
 
 @dataclass
 class Creator:
@@ -18,6 +22,8 @@ class Creator:
 	check: Callable[["CreateContext"], bool]
 	create: Callable[["CreateContext"], None]
 	verify: Callable[["CreateContext"], None]
+	resources: list[str] = field(default_factory=list)
+	modelfile: Callable[["CreateContext"], Path | None] | None = None
 
 
 @dataclass
@@ -26,6 +32,8 @@ class CreateContext:
 	dry_run: bool
 	debug: bool
 	yes: bool
+	jobs: int = DEFAULT_PLAN_JOBS
+	force: bool = False
 
 
 def _now_iso() -> str:
@@ -63,11 +71,16 @@ def _save_state(ws: Path, state: dict) -> None:
 	path.write_text(json.dumps(state, indent=2), encoding="utf-8")
 
 
-def _state_update(state: dict, cid: str, result: str, err: str | None) -> None:
+def _recorded_inputs(state: dict, cid: str) -> dict | None:
+	return (state.get(cid) or {}).get("inputs")
+
+
+def _state_update(state: dict, cid: str, result: str, err: str | None, inputs: dict | None = None) -> None:
 	state[cid] = {
 		"last_run": _now_iso(),
 		"last_result": result,
 		"last_error": err,
+		"inputs": inputs,
 	}
 
 
@@ -75,66 +88,99 @@ def _cmd_exists(cmd: str) -> bool:
 	return shutil.which(cmd) is not None
 
 
-def _ollama_show(ctx: CreateContext, model: str) -> subprocess.CompletedProcess:
-	if not _cmd_exists("ollama"):
-		raise RuntimeError("ollama not installed. Run: continuum install ollama")
-	return _run(["ollama", "show", model], ctx, mutate=False)
+def _model_exists(ctx: CreateContext, model: str) -> bool:
+	return get_inventory().show(model)
 
 
-def _find_agent_modelfile(base: Path) -> Path | None:
-	if not base.exists() or not base.is_dir():
-		return None
-	for p in base.rglob("*"):
-		if not p.is_file():
-			continue
-		name = p.name
-		if name == "Modelfile" or "modelfile" in name.lower():
-			return p
+def _ollama_create(ctx: CreateContext, model: str, path: Path) -> None:
+	res = _run(["ollama", "create", model, "-f", str(path)], ctx, mutate=True)
+	if not ctx.dry_run:
+		invalidate_inventory()
+	if res.returncode != 0 and not ctx.dry_run:
+		err = res.stderr.strip() if isinstance(res.stderr, str) else ""
+		msg = err or "ollama create failed"
+		msg = f"{msg}\nIf a base model is missing, run: continuum pull data_models"
+		raise RuntimeError(msg)
+
+
+def _modelfile_base(text: str) -> str | None:
+	for line in text.splitlines():
+		parts = line.strip().split(None, 1)
+		if len(parts) == 2 and parts[0].upper() == "FROM":
+			return parts[1].strip().strip('"')
 	return None
 
 
+def _base_digest(base: str, modelfile: Path) -> str | None:
+	local = (modelfile.parent / base).expanduser()
+	if base.startswith((".", "/", "~")) or local.is_file():
+		try:
+			st = local.stat()
+		except OSError:
+			return None
+		return f"file:{st.st_size}:{st.st_mtime_ns}"
+	return model_digest(base)
+
+
+def _create_inputs(c: Creator, ctx: CreateContext) -> dict | None:
+	if c.modelfile is None:
+		return None
+	path = c.modelfile(ctx)
+	if path is None:
+		return None
+	try:
+		data = path.read_bytes()
+	except OSError:
+		return None
+	base = _modelfile_base(data.decode("utf-8", errors="replace"))
+	digest = _base_digest(base, path) if base else None
+	if base and digest is None:
+		return None
+	return {
+		"modelfile": str(path),
+		"modelfile_sha256": hashlib.sha256(data).hexdigest(),
+		"base_model": base,
+		"base_digest": digest,
+	}
+
+
+def _json_modelfile(ctx: CreateContext) -> Path | None:
+	path = ctx.workspace / "external" / "model_data_1o" / "models" / "phi3-mini-json" / "phi3-json-modelfile"
+	return path if path.is_file() else None
+
+
+def _agent_modelfile(ctx: CreateContext) -> Path | None:
+	return locate_modelfile(ctx.workspace, ctx.workspace / "external" / "model_data_1o" / "models" / "phi3-mini-agent")
+
+
 def get_creators() -> dict[str, Creator]:
 	def phi3_json_check(ctx: CreateContext) -> bool:
-		res = _ollama_show(ctx, "phi3-mini-json:latest")
-		return res.returncode == 0
+		return _model_exists(ctx, "phi3-mini-json:latest")
 
 	def phi3_json_create(ctx: CreateContext) -> None:
-		path = ctx.workspace / "external" / "model_data_1o" / "models" / "phi3-mini-json" / "phi3-json-modelfile"
-		if not path.exists():
+		path = _json_modelfile(ctx)
+		if path is None:
 			raise RuntimeError("Modelfile not found")
-		res = _run(["ollama", "create", "phi3-mini-json:latest", "-f", str(path)], ctx, mutate=True)
-		if res.returncode != 0 and not ctx.dry_run:
-			err = res.stderr.strip() if isinstance(res.stderr, str) else ""
-			msg = err or "ollama create failed"
-			msg = f"{msg}\nIf a base model is missing, run: continuum pull data_models"
-			raise RuntimeError(msg)
+		_ollama_create(ctx, "phi3-mini-json:latest", path)
 
 	def phi3_json_verify(ctx: CreateContext) -> None:
-		res = _ollama_show(ctx, "phi3-mini-json:latest")
-		if res.returncode != 0:
+		if not _model_exists(ctx, "phi3-mini-json:latest"):
 			raise RuntimeError("ollama show failed")
 
 	def phi3_agent_check(ctx: CreateContext) -> bool:
-		res = _ollama_show(ctx, "phi3-mini-agent:latest")
-		return res.returncode == 0
+		return _model_exists(ctx, "phi3-mini-agent:latest")
 
 	def phi3_agent_create(ctx: CreateContext) -> None:
 		base = ctx.workspace / "external" / "model_data_1o" / "models" / "phi3-mini-agent"
-		path = _find_agent_modelfile(base)
+		path = _agent_modelfile(ctx)
 		if path is None or not path.is_file():
 			raise RuntimeError(
 				f"Modelfile not found under: {base}. Expected a file containing 'modelfile' or named 'Modelfile'."
 			)
-		res = _run(["ollama", "create", "phi3-mini-agent:latest", "-f", str(path)], ctx, mutate=True)
-		if res.returncode != 0 and not ctx.dry_run:
-			err = res.stderr.strip() if isinstance(res.stderr, str) else ""
-			msg = err or "ollama create failed"
-			msg = f"{msg}\nIf a base model is missing, run: continuum pull data_models"
-			raise RuntimeError(msg)
+		_ollama_create(ctx, "phi3-mini-agent:latest", path)
 
 	def phi3_agent_verify(ctx: CreateContext) -> None:
-		res = _ollama_show(ctx, "phi3-mini-agent:latest")
-		if res.returncode != 0:
+		if not _model_exists(ctx, "phi3-mini-agent:latest"):
 			raise RuntimeError("ollama show failed")
 
 	return {
@@ -145,6 +191,8 @@ def get_creators() -> dict[str, Creator]:
 			check=phi3_json_check,
 			create=phi3_json_create,
 			verify=phi3_json_verify,
+			resources=["ollama"],
+			modelfile=_json_modelfile,
 		),
 		"phi3_mini_agent": Creator(
 			id="phi3_mini_agent",
@@ -153,6 +201,8 @@ def get_creators() -> dict[str, Creator]:
 			check=phi3_agent_check,
 			create=phi3_agent_create,
 			verify=phi3_agent_verify,
+			resources=["ollama"],
+			modelfile=_agent_modelfile,
 		),
 	}
 
@@ -174,38 +224,10 @@ def list_targets() -> None:
 		print(f"  {bid}: {', '.join(items)}")
 
 
-def _resolve_targets(targets: list[str], creators: dict[str, Creator], bundles: dict[str, list[str]]) -> list[str]:
-	resolved: list[str] = []
-	visiting: set[str] = set()
-	visited: set[str] = set()
-
-	def visit(t: str) -> None:
-		if t in visited:
-			return
-		if t in visiting:
-			raise RuntimeError(f"Cycle detected in create targets: {t}")
-		visiting.add(t)
-		if t in bundles:
-			for sub in bundles[t]:
-				visit(sub)
-		elif t in creators:
-			for dep in creators[t].dependencies:
-				visit(dep)
-			resolved.append(t)
-		else:
-			raise RuntimeError(f"Unknown create target: {t}")
-		visiting.remove(t)
-		visited.add(t)
-
-	for t in targets:
-		visit(t)
-	return resolved
-
-
 def create_target(target: str, ctx: CreateContext) -> int:
 	creators = get_creators()
 	bundles = get_bundles()
-	to_create = _resolve_targets([target], creators, bundles)
+	to_create = resolve_plan([target], {cid: c.dependencies for cid, c in creators.items()}, bundles, kind="create")
 	print(f"Will create: {', '.join(to_create)}")
 	if not ctx.yes and not ctx.dry_run:
 		resp = input(f"Proceed with create of {', '.join(to_create)}? [y/N]: ").strip().lower()
@@ -213,29 +235,61 @@ def create_target(target: str, ctx: CreateContext) -> int:
 			print("Aborted.")
 			return 1
 	state = _load_state(ctx.workspace)
+	nodes: list[PlanNode] = []
+	inputs: dict[str, dict | None] = {}
 	for cid in to_create:
 		c = creators[cid]
-		try:
-			if c.check(ctx):
+		inputs[cid] = _create_inputs(c, ctx)
+		recorded = _recorded_inputs(state, cid)
+		if not ctx.force and inputs[cid] is not None and inputs[cid] == recorded:
+			# Same Modelfile bytes and base-model digest as the last successful create: nothing to do.
+			print(f"[ok] {cid} up to date")
+			_state_update(state, cid, "up_to_date", None, inputs[cid])
+			continue
+		if not ctx.force and (inputs[cid] is None or recorded is None):
+			try:
+				present = c.check(ctx)
+			except Exception as e:
+				report_failure(cid, NodeResult("failed", error=str(e), exc=e), ctx.debug)
+				_state_update(state, cid, "failed", str(e), recorded)
+				if not ctx.dry_run:
+					_save_state(ctx.workspace, state)
+				return 1
+			if present:
+				# The existing model may predate the current Modelfile/base digest, so nothing is
+				# recorded here; inputs are only stamped after an `ollama create` succeeds.
 				print(f"[ok] {cid} already created")
-				_state_update(state, cid, "already_created", None)
-			else:
-				print(f"[run] creating {cid}...")
-				c.create(ctx)
-				c.verify(ctx)
-				print(f"[ok] created {cid}")
-				_state_update(state, cid, "success", None)
-		except Exception as e:
-			print(f"[err] {cid}: {e}")
-			if ctx.debug:
-				print(traceback.format_exc())
-			_state_update(state, cid, "failed", str(e))
-			if not ctx.dry_run:
-				_save_state(ctx.workspace, state)
-			return 1
+				_state_update(state, cid, "already_created", None, recorded)
+				continue
+		elif not ctx.force:
+			print(f"[run] {cid}: Modelfile or base model changed; rebuilding")
+		nodes.append(PlanNode(id=cid, run=lambda c=c: _create_one(c, ctx), dependencies=c.dependencies, resources=c.resources))
+
+	def on_status(event: str, cid: str, result: NodeResult | None) -> None:
+		if event == "start":
+			print(f"[run] creating {cid}...")
+		elif event == "ok":
+			print(f"[ok] created {cid}")
+		elif event == "failed":
+			report_failure(cid, result, ctx.debug)
+		elif event == "skipped":
+			print(f"[warn] {cid} skipped: {result.error}")
+
+	results = execute_plan(nodes, jobs=ctx.jobs, on_status=on_status)
+	for cid, res in results.items():
+		if res.status == "ok":
+			_state_update(state, cid, "success", None, inputs.get(cid))
+		elif res.status == "failed":
+			# Keep the inputs of the last successful create so the next run still sees a change.
+			_state_update(state, cid, "failed", res.error, _recorded_inputs(state, cid))
 	if not ctx.dry_run:
 		_save_state(ctx.workspace, state)
-	return 0
+	return 0 if all(r.status == "ok" for r in results.values()) else 1
+
+
+def _create_one(c: Creator, ctx: CreateContext) -> None:
+	c.create(ctx)
+	c.verify(ctx)
 
 
 def run_doctor(ctx: CreateContext, json_output: bool = False) -> int:
@@ -0,0 +1,17 @@
+from __future__ import annotations
+
+from continuum_engine.daemon.client import (
+	DaemonUnavailable,
+	daemon_pid,
+	daemon_query,
+	start_daemon,
+	stop_daemon,
+)
+
+__all__ = [
+	"DaemonUnavailable",
+	"daemon_pid",
+	"daemon_query",
+	"start_daemon",
+	"stop_daemon",
+]
@@ -0,0 +1,107 @@
+from __future__ import annotations
+
+import json
+import os
+import signal
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+from continuum_engine.utils.ipc import request, socket_path
+
+SOCKET_NAME = "daemon"
+QUERY_TIMEOUT = 2.0
+START_TIMEOUT = 10.0
+
+
+def pid_path(ws: Path) -> Path:
+	return ws / ".continuum" / "daemon.pid"
+
+
+class DaemonUnavailable(Exception):
+	pass
+
+
+def daemon_query(ws: Path, op: str, **params):
+	if os.environ.get("CONTINUUM_NO_DAEMON"):
+		raise DaemonUnavailable("disabled by CONTINUUM_NO_DAEMON")
+	sock = socket_path(ws, SOCKET_NAME)
+	if not sock.exists():
+		raise DaemonUnavailable("daemon not running")
+	try:
+		reply = request(sock, {"op": op, **params}, timeout=QUERY_TIMEOUT)
+	except (OSError, ValueError) as e:
+		raise DaemonUnavailable(str(e))
+	if not isinstance(reply, dict) or not reply.get("ok"):
+		raise DaemonUnavailable((reply or {}).get("error") or "bad reply")
+	return reply.get("result")
+
+
+def daemon_pid(ws: Path) -> int | None:
+	try:
+		return int(json.loads(pid_path(ws).read_text(encoding="utf-8"))["pid"])
+	except Exception:
+		return None
+
+
+def _is_daemon_process(pid: int, ws: Path) -> bool:
+	# A pidfile left behind by a crash may name a recycled pid; only signal it if it is still our daemon.
+	try:
+		args = Path(f"/proc/{pid}/cmdline").read_bytes().decode("utf-8", "replace").split("\0")
+	except FileNotFoundError:
+		return False
+	except OSError:
+		result = subprocess.run(["ps", "-o", "command=", "-p", str(pid)], stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True)
+		if result.returncode != 0:
+			return False
+		args = result.stdout.split()
+	return "continuum_engine.cli" in args and "daemon" in args and "run" in args and str(ws) in args
+
+
+def start_daemon(ws: Path) -> dict:
+	try:
+		return daemon_query(ws, "ping")
+	except DaemonUnavailable:
+		pass
+	log_dir = ws / ".continuum" / "logs"
+	log_dir.mkdir(parents=True, exist_ok=True)
+	with open(log_dir / "daemon.log", "ab") as log:
+		subprocess.Popen(
+			[sys.executable, "-m", "continuum_engine.cli", "daemon", "run", "--workspace", str(ws)],
+			stdin=subprocess.DEVNULL,
+			stdout=log,
+			stderr=subprocess.STDOUT,
+			start_new_session=True,
+			close_fds=True,
+		)
+	deadline = time.monotonic() + START_TIMEOUT
+	while time.monotonic() < deadline:
+		try:
+			return daemon_query(ws, "ping")
+		except DaemonUnavailable:
+			time.sleep(0.05)
+	raise RuntimeError(f"daemon did not come up within {START_TIMEOUT:.0f}s; see {log_dir / 'daemon.log'}")
+
+
+def stop_daemon(ws: Path) -> bool:
+	try:
+		daemon_query(ws, "shutdown")
+	except DaemonUnavailable:
+		pid = daemon_pid(ws)
+		if pid is None:
+			return False
+		if not _is_daemon_process(pid, ws):
+			pid_path(ws).unlink(missing_ok=True)
+			socket_path(ws, SOCKET_NAME).unlink(missing_ok=True)
+			return False
+		try:
+			os.kill(pid, signal.SIGTERM)
+		except OSError:
+			pid_path(ws).unlink(missing_ok=True)
+			return False
+	sock = socket_path(ws, SOCKET_NAME)
+	deadline = time.monotonic() + START_TIMEOUT
+	while sock.exists() and time.monotonic() < deadline:
+		time.sleep(0.05)
+	return True
@@ -0,0 +1,247 @@
+from __future__ import annotations
+
+import json
+import os
+import signal
+import socketserver
+import threading
+import time
+from pathlib import Path
+
+from continuum_engine.checkpoints import list_checkpoints
+from continuum_engine.daemon.client import SOCKET_NAME, pid_path
+from continuum_engine.runs.index import normalize_since
+from continuum_engine.runs.manager import query_runs
+from continuum_engine.utils import inotify
+from continuum_engine.utils.ipc import decode, encode, prepare_listen, private_umask, socket_path
+
+SOURCES = ["runs", "scan"]
+
+
+class WorkspaceState:
+	def __init__(self, ws: Path):
+		self.ws = ws
+		state_dir = ws / ".continuum" / "state"
+		self.paths = {
+			"runs": [ws / ".continuum" / "runs", state_dir / "runs.db", state_dir / "runs.db-wal"],
+			"scan": [state_dir / "scan.json"],
+		}
+		self.watch_dirs = {
+			"runs": ws / ".continuum" / "runs",
+			"state": state_dir,
+		}
+		# Which watched directories must be live for a source to skip the stat fallback.
+		self.source_watches = {"runs": ("runs", "state"), "scan": ("state",)}
+		# sqlite readers create and unlink runs.db-wal on every open/close, so only real writes count.
+		self.state_files = {
+			"runs.db": ("runs", inotify.IN_MODIFY | inotify.IN_DELETE | inotify.IN_MOVED_TO),
+			"runs.db-wal": ("runs", inotify.IN_MODIFY),
+			"scan.json": ("scan", inotify.IN_MODIFY | inotify.IN_CLOSE_WRITE | inotify.IN_MOVED_TO | inotify.IN_DELETE),
+		}
+		self._lock = threading.Lock()
+		self._values: dict[str, object] = {}
+		self._dirty = set(SOURCES)
+		self._stamps: dict[str, tuple] = {}
+		self._inotify: inotify.Inotify | None = None
+		self._wd_dir: dict[int, str] = {}
+		self.watch_mode = "poll"
+
+	def start_watching(self, stop: threading.Event) -> None:
+		if not inotify.inotify_available():
+			return
+		try:
+			self._inotify = inotify.Inotify()
+		except OSError:
+			return
+		self.watch_mode = "inotify"
+		with self._lock:
+			self._add_watches()
+		threading.Thread(target=self._watch_loop, args=(stop,), name="continuum-daemon-watch", daemon=True).start()
+
+	def _add_watches(self) -> None:
+		live = set(self._wd_dir.values())
+		for key, path in self.watch_dirs.items():
+			if key in live:
+				continue
+			try:
+				wd = self._inotify.add_watch(str(path))
+			except OSError:
+				continue
+			self._wd_dir[wd] = key
+			# Changes made before the watch existed were not seen; reload once.
+			self._dirty.update(src for src, keys in self.source_watches.items() if key in keys)
+
+	def _watched(self, source: str) -> bool:
+		live = set(self._wd_dir.values())
+		return all(k in live for k in self.source_watches[source])
+
+	def _watch_loop(self, stop: threading.Event) -> None:
+		while not stop.is_set():
+			try:
+				events = self._inotify.read(timeout=1.0)
+			except OSError:
+				break
+			if not events:
+				continue
+			with self._lock:
+				for ev in events:
+					if ev.mask & inotify.IN_Q_OVERFLOW:
+						self._dirty.update(SOURCES)
+						continue
+					key = self._wd_dir.get(ev.wd)
+					if key is None:
+						continue
+					if ev.mask & (inotify.IN_IGNORED | inotify.IN_DELETE_SELF | inotify.IN_MOVE_SELF):
+						self._wd_dir.pop(ev.wd, None)
+						self._dirty.update(SOURCES)
+					elif key == "state":
+						source, mask = self.state_files.get(ev.name, (None, 0))
+						if ev.mask & mask:
+							self._dirty.add(source)
+					else:
+						self._dirty.add(key)
+		self._inotify.close()
+
+	def _stamp(self, source: str) -> tuple:
+		out = []
+		for p in self.paths[source]:
+			try:
+				st = os.stat(p)
+				out.append((st.st_mtime_ns, st.st_size))
+			except OSError:
+				out.append(None)
+		return tuple(out)
+
+	def _load(self, source: str):
+		if source == "runs":
+			return query_runs(self.ws)
+		try:
+			return json.loads(self.paths["scan"][0].read_text(encoding="utf-8"))
+		except Exception:
+			return None
+
+	def checkpoints(self):
+		# Writes inside an existing checkpoint never touch the root directory, so a watch on it can't
+		# tell when a cached answer goes stale. list_checkpoints stat-validates every entry against the
+		# manifest on each call, so the daemon answers exactly what the direct path would.
+		with self._lock:
+			return list_checkpoints(self.ws)
+
+	def get(self, source: str):
+		with self._lock:
+			if self._inotify is not None and len(self._wd_dir) < len(self.watch_dirs):
+				self._add_watches()
+			# Sources without a live inotify watch (missing dir, no inotify) fall back to a stat check.
+			if self._inotify is None or not self._watched(source):
+				stamp = self._stamp(source)
+				if stamp != self._stamps.get(source):
+					self._stamps[source] = stamp
+					self._dirty.add(source)
+			if source in self._dirty or source not in self._values:
+				self._dirty.discard(source)
+				self._values[source] = self._load(source)
+			return self._values[source]
+
+
+class Daemon:
+	def __init__(self, ws: Path):
+		self.ws = ws
+		self.state = WorkspaceState(ws)
+		self.started = time.time()
+		self.served = 0
+		self.stop = threading.Event()
+		self.server: socketserver.UnixStreamServer | None = None
+
+	def handle(self, msg: dict) -> dict:
+		op = msg.get("op")
+		self.served += 1
+		if op == "ping":
+			return {
+				"pid": os.getpid(),
+				"workspace": str(self.ws),
+				"uptime": round(time.time() - self.started, 1),
+				"served": self.served,
+				"watch": self.state.watch_mode,
+			}
+		if op == "runs":
+			runs = self.state.get("runs")
+			if msg.get("status"):
+				runs = [r for r in runs if r.get("status") == msg["status"]]
+			if msg.get("since"):
+				since = normalize_since(msg["since"])
+				runs = [r for r in runs if (r.get("started_at") or "") >= since]
+			if msg.get("limit") is not None:
+				runs = runs[:max(int(msg["limit"]), 0)]
+			return runs
+		if op == "status":
+			runs = self.state.get("runs")
+			latest = runs[0] if runs else None
+			return {
+				"workspace": str(self.ws),
+				"initialized": True,
+				"run_count": len(runs),
+				"latest_run": {
+					"run_id": latest.get("run_id"),
+					"status": latest.get("status"),
+					"command": latest.get("command"),
+					"started_at": latest.get("started_at"),
+				} if latest else None,
+			}
+		if op == "checkpoints":
+			return self.state.checkpoints()
+		if op == "checkpoints_latest":
+			entries = self.state.checkpoints()
+			return max(entries, key=lambda e: e.get("mtime", 0)) if entries else None
+		if op == "scan":
+			return self.state.get("scan")
+		if op == "shutdown":
+			threading.Thread(target=self.shutdown, daemon=True).start()
+			return {"stopping": True}
+		raise ValueError(f"unknown op: {op}")
+
+	def shutdown(self) -> None:
+		self.stop.set()
+		if self.server is not None:
+			self.server.shutdown()
+
+	def serve(self) -> int:
+		sock = socket_path(self.ws, SOCKET_NAME)
+		try:
+			prepare_listen(sock)
+		except RuntimeError as e:
+			print(f"[err] {e}", flush=True)
+			return 1
+		daemon = self
+
+		class Handler(socketserver.StreamRequestHandler):
+			def handle(self) -> None:
+				for line in self.rfile:
+					if not line.strip():
+						continue
+					try:
+						reply = {"ok": True, "result": daemon.handle(decode(line))}
+					except Exception as e:
+						reply = {"ok": False, "error": str(e)}
+					self.wfile.write(encode(reply))
+					self.wfile.flush()
+
+		class Server(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+			daemon_threads = True
+
+		with private_umask():
+			self.server = Server(str(sock), Handler)
+		pid_path(self.ws).write_text(json.dumps({"pid": os.getpid(), "socket": str(sock)}), encoding="utf-8")
+		self.state.start_watching(self.stop)
+		signal.signal(signal.SIGTERM, lambda *_: threading.Thread(target=self.shutdown, daemon=True).start())
+		print(f"[ok] continuum daemon listening on {sock} (pid {os.getpid()}, watch: {self.state.watch_mode})", flush=True)
+		try:
+			self.server.serve_forever(poll_interval=0.5)
+		finally:
+			self.stop.set()
+			self.server.server_close()
+			for p in (sock, pid_path(self.ws)):
+				try:
+					p.unlink()
+				except OSError:
+					pass
+		return 0
@@ -0,0 +1,17 @@
+from __future__ import annotations
+
+from continuum_engine.engine.manager import (
+	find_run_all,
+	output_collisions,
+	plan_shards,
+	run_sharded,
+	shardable,
+)
+
+__all__ = [
+	"find_run_all",
+	"output_collisions",
+	"plan_shards",
+	"run_sharded",
+	"shardable",
+]
@@ -0,0 +1,239 @@
+from __future__ import annotations
+
+import json
+import os
+import shutil
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+
+from continuum_engine.runs.launch import LogOptions, launch
+from continuum_engine.utils.walk import walk
+from continuum_engine.workspace.config import load_config, stage_dirs
+
+OUTPUT_STAGES = ["stage2_curated_dir", "stage3_annotated_dir"]
+
+
+@dataclass
+class Shard:
+	index: int
+	files: list[str] = field(default_factory=list)
+	bytes: int = 0
+	attempts: int = 0
+	returncode: int | None = None
+
+
+def _now_iso() -> str:
+	return datetime.now(timezone.utc).replace(microsecond=0).isoformat()
+
+
+def find_run_all(ws: Path) -> Path | None:
+	run_all_a = ws / "external" / "Model_Data-1O" / "app" / "run_all.py"
+	run_all_b = ws / "external" / "model_data_1o" / "app" / "run_all.py"
+	return run_all_a if run_all_a.exists() else run_all_b if run_all_b.exists() else None
+
+
+def shardable(ws: Path) -> bool:
+	# Sharding only works if run_all.py reads its stage dirs from the shard contract
+	# (CONTINUUM_STAGE*_DIR env vars or ./continuum.yaml in its cwd); the workspace has to say so.
+	engine = load_config(ws).get("engine")
+	value = engine.get("shardable") if isinstance(engine, dict) else None
+	return value is True or str(value).lower() in ("true", "yes", "1")
+
+
+def _input_files(raw_dir: Path) -> list[tuple[str, int]]:
+	files: list[tuple[str, int]] = []
+	if not raw_dir.is_dir():
+		return files
+	for rel, entries in walk(raw_dir):
+		for name, st in entries:
+			files.append((os.path.join(rel, name) if rel else name, st.st_size))
+	return files
+
+
+def plan_shards(files: list[tuple[str, int]], count: int) -> list[Shard]:
+	shards = [Shard(index=i) for i in range(max(count, 1))]
+	# Largest-first onto the lightest shard keeps shard sizes balanced.
+	for rel, size in sorted(files, key=lambda f: (-f[1], f[0])):
+		target = min(shards, key=lambda s: (s.bytes, len(s.files), s.index))
+		target.files.append(rel)
+		target.bytes += size
+	for s in shards:
+		s.files.sort()
+	return [s for s in shards if s.files]
+
+
+def _link_or_copy(src: Path, dst: Path) -> None:
+	dst.parent.mkdir(parents=True, exist_ok=True)
+	try:
+		os.link(src, dst)
+	except OSError:
+		try:
+			os.symlink(src, dst)
+		except OSError:
+			shutil.copy2(src, dst)
+
+
+def _shard_stage_dirs(shard_dir: Path) -> dict[str, Path]:
+	return {
+		"stage1_raw_dir": shard_dir / "datasets" / "stage1_raw",
+		"stage2_curated_dir": shard_dir / "datasets" / "stage2_curated",
+		"stage3_annotated_dir": shard_dir / "datasets" / "stage3_annotated",
+	}
+
+
+def _prepare_shard(shard_dir: Path, shard: Shard, raw_dir: Path) -> dict[str, Path]:
+	if shard_dir.exists():
+		shutil.rmtree(shard_dir)
+	dirs = _shard_stage_dirs(shard_dir)
+	for d in dirs.values():
+		d.mkdir(parents=True, exist_ok=True)
+	for rel in shard.files:
+		_link_or_copy(raw_dir / rel, dirs["stage1_raw_dir"] / rel)
+	lines = ['workspace_name: "continuum-engine-shard"', "", "stages:"]
+	for key, d in dirs.items():
+		lines.append(f'  {key}: "{d}"')
+	(shard_dir / "continuum.yaml").write_text("\n".join(lines) + "\n", encoding="utf-8")
+	return dirs
+
+
+def _reset_outputs(dirs: dict[str, Path]) -> None:
+	for key in OUTPUT_STAGES:
+		shutil.rmtree(dirs[key], ignore_errors=True)
+		dirs[key].mkdir(parents=True, exist_ok=True)
+
+
+def _shard_outputs(dirs: dict[str, Path]) -> list[tuple[str, str]]:
+	outputs = []
+	for key in OUTPUT_STAGES:
+		src_root = dirs[key]
+		if not src_root.is_dir():
+			continue
+		for rel, entries in walk(src_root):
+			for name, _ in entries:
+				outputs.append((key, os.path.join(rel, name) if rel else name))
+	return outputs
+
+
+def output_collisions(outputs: dict[int, list[tuple[str, str]]]) -> dict[tuple[str, str], list[int]]:
+	owners: dict[tuple[str, str], list[int]] = {}
+	for index, items in outputs.items():
+		for item in items:
+			owners.setdefault(item, []).append(index)
+	return {item: shards for item, shards in owners.items() if len(shards) > 1}
+
+
+def _merge_outputs(dirs: dict[str, Path], targets: dict[str, Path], outputs: list[tuple[str, str]]) -> int:
+	moved = 0
+	for key, rel in outputs:
+		src = dirs[key] / rel
+		dst = targets[key] / rel
+		dst.parent.mkdir(parents=True, exist_ok=True)
+		try:
+			os.replace(src, dst)
+		except OSError:
+			shutil.move(str(src), str(dst))
+		moved += 1
+	return moved
+
+
+def _save_state(ws: Path, state: dict) -> None:
+	state_dir = ws / ".continuum" / "state"
+	state_dir.mkdir(parents=True, exist_ok=True)
+	(state_dir / "engine.json").write_text(json.dumps(state, indent=2), encoding="utf-8")
+
+
+def run_sharded(
+	ws: Path,
+	run_all: Path,
+	passthrough: list[str],
+	shards: int,
+	jobs: int,
+	retries: int = 1,
+	log_opts: LogOptions | None = None,
+	debug: bool = False,
+) -> int:
+	targets = stage_dirs(ws)
+	raw_dir = targets["stage1_raw_dir"]
+	plan = plan_shards(_input_files(raw_dir), shards)
+	if not plan:
+		print(f"[err] No input files under {raw_dir}")
+		return 1
+	batch_id = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%S")
+	batch_root = ws / ".continuum" / "cache" / "engine_shards" / batch_id
+	jobs = max(1, min(jobs, len(plan)))
+	print(f"Sharding {sum(len(s.files) for s in plan)} files into {len(plan)} shards, {jobs} workers")
+
+	shard_dirs: dict[int, dict[str, Path]] = {}
+	for shard in plan:
+		shard_dirs[shard.index] = _prepare_shard(batch_root / f"shard_{shard.index:03d}", shard, raw_dir)
+
+	def run_one(shard: Shard) -> int:
+		dirs = shard_dirs[shard.index]
+		shard_dir = dirs["stage1_raw_dir"].parents[1]
+		_reset_outputs(dirs)
+		env = dict(os.environ)
+		env.update({
+			"CONTINUUM_WORKSPACE": str(shard_dir),
+			"CONTINUUM_SHARD_INDEX": str(shard.index),
+			"CONTINUUM_SHARD_COUNT": str(len(plan)),
+			"CONTINUUM_STAGE1_RAW_DIR": str(dirs["stage1_raw_dir"]),
+			"CONTINUUM_STAGE2_CURATED_DIR": str(dirs["stage2_curated_dir"]),
+			"CONTINUUM_STAGE3_ANNOTATED_DIR": str(dirs["stage3_annotated_dir"]),
+		})
+		cmd = ["python3", str(run_all)] + passthrough
+		shard.attempts += 1
+		rc = launch(ws, f"engine:shard_{shard.index:03d}", cmd, log_opts=log_opts, env=env, cwd=shard_dir, debug=debug, echo=False)
+		shard.returncode = rc
+		status = "ok" if rc == 0 else f"failed (exit {rc})"
+		print(f"[shard {shard.index:03d}] attempt {shard.attempts}: {status}")
+		return rc
+
+	pending = list(plan)
+	for attempt in range(max(retries, 0) + 1):
+		if not pending:
+			break
+		if attempt:
+			print(f"[run] retrying {len(pending)} failed shard(s)")
+		with ThreadPoolExecutor(max_workers=min(jobs, len(pending))) as pool:
+			results = list(pool.map(run_one, pending))
+		pending = [s for s, rc in zip(pending, results) if rc != 0]
+
+	moved = 0
+	outputs = {s.index: _shard_outputs(shard_dirs[s.index]) for s in plan if s.returncode == 0}
+	# Two shards writing the same relative path (a summary, a fixed-name stage file) can't be merged
+	# by moving files; refuse rather than let the last shard silently win.
+	collisions = output_collisions(outputs)
+	if collisions:
+		for (key, rel), owners in sorted(collisions.items())[:10]:
+			print(f"[err] {key}/{rel} written by shards {', '.join(f'{i:03d}' for i in owners)}")
+		if len(collisions) > 10:
+			print(f"[err] ... and {len(collisions) - 10} more colliding output(s)")
+	else:
+		for shard in plan:
+			if shard.returncode == 0:
+				moved += _merge_outputs(shard_dirs[shard.index], targets, outputs[shard.index])
+				shutil.rmtree(batch_root / f"shard_{shard.index:03d}", ignore_errors=True)
+	failed = [s.index for s in plan if s.returncode != 0]
+	_save_state(ws, {
+		"last_batch": batch_id,
+		"finished_at": _now_iso(),
+		"shards": [
+			{"index": s.index, "files": len(s.files), "bytes": s.bytes, "attempts": s.attempts, "returncode": s.returncode}
+			for s in plan
+		],
+		"merged_files": moved,
+		"failed_shards": failed,
+		"colliding_outputs": len(collisions),
+		"batch_dir": str(batch_root) if failed or collisions else None,
+	})
+	if collisions:
+		print(f"[err] {len(collisions)} output path(s) collide across shards; nothing merged, shard outputs kept under {batch_root}")
+		return 1
+	if not failed:
+		shutil.rmtree(batch_root, ignore_errors=True)
+		print(f"[ok] {len(plan)} shards succeeded, merged {moved} output files")
+		return 0
+	print(f"[err] {len(failed)} shard(s) failed: {', '.join(f'{i:03d}' for i in failed)}; inputs kept under {batch_root}")
+	return 1
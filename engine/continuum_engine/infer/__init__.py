@@ -0,0 +1,15 @@
+from __future__ import annotations
+
+from continuum_engine.infer.client import (
+	InferUnavailable,
+	server_status,
+	stop_server,
+	submit,
+)
+
+__all__ = [
+	"InferUnavailable",
+	"server_status",
+	"stop_server",
+	"submit",
+]
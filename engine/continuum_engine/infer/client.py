@@ -0,0 +1,61 @@
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Iterable, Iterator
+
+from continuum_engine.utils.ipc import Connection, request, socket_path
+
+SOCKET_NAME = "infer"
+# Inputs per request; the server re-batches them, this only bounds message size.
+SUBMIT_CHUNK = 256
+
+
+class InferUnavailable(Exception):
+	pass
+
+
+def _socket(ws: Path) -> Path:
+	sock = socket_path(ws, SOCKET_NAME)
+	if not sock.exists():
+		raise InferUnavailable("no inference server for this workspace; start one with: continuum infer --serve --script <script>")
+	return sock
+
+
+def _result(reply):
+	if not isinstance(reply, dict):
+		raise RuntimeError("bad reply from inference server")
+	if not reply.get("ok"):
+		raise RuntimeError(reply.get("error") or "inference server error")
+	return reply.get("result")
+
+
+def submit(ws: Path, inputs: Iterable, chunk: int = SUBMIT_CHUNK, timeout: float | None = None) -> Iterator:
+	sock = _socket(ws)
+	try:
+		conn = Connection(sock, timeout=timeout)
+	except OSError as e:
+		raise InferUnavailable(f"inference server not answering: {e}")
+	with conn:
+		batch: list = []
+		for value in inputs:
+			batch.append(value)
+			if len(batch) >= chunk:
+				yield from _result(conn.request({"op": "predict", "inputs": batch}))["outputs"]
+				batch = []
+		if batch:
+			yield from _result(conn.request({"op": "predict", "inputs": batch}))["outputs"]
+
+
+def server_status(ws: Path) -> dict:
+	try:
+		return _result(request(_socket(ws), {"op": "ping"}, timeout=2.0))
+	except OSError as e:
+		raise InferUnavailable(f"inference server not answering: {e}")
+
+
+def stop_server(ws: Path) -> bool:
+	try:
+		_result(request(_socket(ws), {"op": "shutdown"}, timeout=2.0))
+	except (InferUnavailable, OSError):
+		return False
+	return True
@@ -0,0 +1,249 @@
+from __future__ import annotations
+
+import argparse
+import importlib.util
+import json
+import os
+import queue
+import signal
+import socketserver
+import sys
+import threading
+import time
+from pathlib import Path
+
+from continuum_engine.infer.client import SOCKET_NAME
+from continuum_engine.utils.ipc import decode, encode, prepare_listen, private_umask, socket_path
+
+DEFAULT_MAX_BATCH_SIZE = 16
+DEFAULT_MAX_WAIT_MS = 10.0
+
+
+def pid_path(ws: Path) -> Path:
+	return ws / ".continuum" / "infer.pid"
+
+
+def load_script(path: Path):
+	# The script's own directory goes first on sys.path, as it would for `python script.py`.
+	sys.path.insert(0, str(path.parent))
+	spec = importlib.util.spec_from_file_location("continuum_infer_script", path)
+	if spec is None or spec.loader is None:
+		raise RuntimeError(f"cannot load script: {path}")
+	module = importlib.util.module_from_spec(spec)
+	spec.loader.exec_module(module)
+	for name in ("load", "predict"):
+		if not callable(getattr(module, name, None)):
+			raise RuntimeError(f"{path.name} must define {name}() to be served (load() -> model, predict(model, inputs) -> outputs)")
+	return module
+
+
+class _Slot:
+	__slots__ = ("input", "output", "error", "done")
+
+	def __init__(self, value):
+		self.input = value
+		self.output = None
+		self.error: str | None = None
+		self.done = threading.Event()
+
+
+class MicroBatcher:
+	def __init__(self, predict, model, max_batch_size: int = DEFAULT_MAX_BATCH_SIZE, max_wait_ms: float = DEFAULT_MAX_WAIT_MS):
+		self.predict = predict
+		self.model = model
+		self.max_batch_size = max(1, int(max_batch_size))
+		self.max_wait = max(0.0, float(max_wait_ms)) / 1000.0
+		self.queue: queue.Queue[_Slot | None] = queue.Queue()
+		self.stats = {"requests": 0, "items": 0, "batches": 0, "max_batch": 0, "errors": 0, "predict_seconds": 0.0}
+		self._thread = threading.Thread(target=self._loop, name="continuum-infer-batcher", daemon=True)
+
+	def start(self) -> None:
+		self._thread.start()
+
+	def stop(self) -> None:
+		self.queue.put(None)
+		self._thread.join(timeout=5)
+
+	def submit(self, inputs: list) -> list[_Slot]:
+		slots = [_Slot(v) for v in inputs]
+		self.stats["requests"] += 1
+		for slot in slots:
+			self.queue.put(slot)
+		return slots
+
+	def _collect(self, first: _Slot) -> tuple[list[_Slot], bool]:
+		batch = [first]
+		deadline = time.monotonic() + self.max_wait
+		while len(batch) < self.max_batch_size:
+			remaining = deadline - time.monotonic()
+			try:
+				slot = self.queue.get(timeout=remaining) if remaining > 0 else self.queue.get_nowait()
+			except queue.Empty:
+				break
+			if slot is None:
+				return batch, True
+			batch.append(slot)
+		return batch, False
+
+	def _predict(self, batch: list[_Slot]) -> None:
+		outputs = list(self.predict(self.model, [s.input for s in batch]))
+		if len(outputs) != len(batch):
+			raise RuntimeError(f"predict() returned {len(outputs)} outputs for {len(batch)} inputs")
+		for slot, out in zip(batch, outputs):
+			slot.output = out
+
+	def _fail(self, slot: _Slot, e: Exception) -> None:
+		self.stats["errors"] += 1
+		slot.error = f"{type(e).__name__}: {e}"
+
+	def _loop(self) -> None:
+		stopping = False
+		while not stopping:
+			first = self.queue.get()
+			if first is None:
+				break
+			batch, stopping = self._collect(first)
+			started = time.perf_counter()
+			try:
+				self._predict(batch)
+			except Exception as e:
+				if len(batch) == 1:
+					self._fail(batch[0], e)
+				else:
+					# A batch may merge several clients' requests; retry item by item so one bad input
+					# fails only its own request.
+					for slot in batch:
+						try:
+							self._predict([slot])
+						except Exception as item_error:
+							self._fail(slot, item_error)
+			self.stats["predict_seconds"] += time.perf_counter() - started
+			self.stats["batches"] += 1
+			self.stats["items"] += len(batch)
+			self.stats["max_batch"] = max(self.stats["max_batch"], len(batch))
+			for slot in batch:
+				slot.done.set()
+
+
+class InferServer:
+	def __init__(self, ws: Path, script: Path, max_batch_size: int = DEFAULT_MAX_BATCH_SIZE, max_wait_ms: float = DEFAULT_MAX_WAIT_MS):
+		self.ws = ws
+		self.script = script
+		self.max_batch_size = max_batch_size
+		self.max_wait_ms = max_wait_ms
+		self.batcher: MicroBatcher | None = None
+		self.server: socketserver.UnixStreamServer | None = None
+		self.started = time.time()
+		self.load_seconds = 0.0
+		self.stopping = False
+
+	def handle(self, msg: dict):
+		op = msg.get("op")
+		if op == "predict":
+			inputs = msg.get("inputs")
+			if not isinstance(inputs, list):
+				raise ValueError("inputs must be a list")
+			slots = self.batcher.submit(inputs)
+			for slot in slots:
+				slot.done.wait()
+			errors = [s.error for s in slots if s.error is not None]
+			if errors:
+				raise RuntimeError(errors[0])
+			return {"outputs": [s.output for s in slots]}
+		if op == "ping":
+			stats = dict(self.batcher.stats)
+			stats["avg_batch"] = round(stats["items"] / stats["batches"], 2) if stats["batches"] else 0.0
+			stats["predict_seconds"] = round(stats["predict_seconds"], 3)
+			return {
+				"pid": os.getpid(),
+				"script": str(self.script),
+				"uptime": round(time.time() - self.started, 1),
+				"load_seconds": round(self.load_seconds, 3),
+				"max_batch_size": self.batcher.max_batch_size,
+				"max_wait_ms": self.max_wait_ms,
+				**stats,
+			}
+		if op == "shutdown":
+			# The handler stops the server once this reply is written; stopping first could let the
+			# process exit before the client hears back.
+			self.stopping = True
+			return {"stopping": True}
+		raise ValueError(f"unknown op: {op}")
+
+	def shutdown(self) -> None:
+		if self.server is not None:
+			self.server.shutdown()
+
+	def serve(self) -> int:
+		sock = socket_path(self.ws, SOCKET_NAME)
+		try:
+			# Checked before the (possibly slow) model load, so a second server fails fast.
+			prepare_listen(sock)
+		except RuntimeError as e:
+			print(f"[err] {e}", flush=True)
+			return 1
+		started = time.perf_counter()
+		module = load_script(self.script)
+		model = module.load()
+		self.load_seconds = time.perf_counter() - started
+		self.batcher = MicroBatcher(module.predict, model, self.max_batch_size, self.max_wait_ms)
+		self.batcher.start()
+		# Bind only once the model is warm, so a live socket always means a ready server.
+		server = self
+
+		class Handler(socketserver.StreamRequestHandler):
+			def handle(self) -> None:
+				for line in self.rfile:
+					if not line.strip():
+						continue
+					try:
+						reply = {"ok": True, "result": server.handle(decode(line))}
+					except Exception as e:
+						reply = {"ok": False, "error": str(e)}
+					self.wfile.write(encode(reply))
+					self.wfile.flush()
+					if server.stopping:
+						server.shutdown()
+						return
+
+		class Server(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+			daemon_threads = True
+
+		with private_umask():
+			self.server = Server(str(sock), Handler)
+		pid_path(self.ws).write_text(json.dumps({"pid": os.getpid(), "socket": str(sock), "script": str(self.script)}), encoding="utf-8")
+		signal.signal(signal.SIGTERM, lambda *_: threading.Thread(target=self.shutdown, daemon=True).start())
+		print(
+			f"[ok] serving {self.script.name} on {sock} (pid {os.getpid()}, load {self.load_seconds:.2f}s, "
+			f"max batch {self.batcher.max_batch_size}, max wait {self.max_wait_ms:g}ms)",
+			flush=True,
+		)
+		try:
+			self.server.serve_forever(poll_interval=0.5)
+		except KeyboardInterrupt:
+			pass
+		finally:
+			self.server.server_close()
+			self.batcher.stop()
+			for p in (sock, pid_path(self.ws)):
+				try:
+					p.unlink()
+				except OSError:
+					pass
+		stats = self.batcher.stats
+		print(f"[ok] stopped; {stats['items']} items in {stats['batches']} batches", flush=True)
+		return 0
+
+
+def main(argv: list[str] | None = None) -> int:
+	parser = argparse.ArgumentParser(prog="continuum-infer-server")
+	parser.add_argument("--workspace", required=True)
+	parser.add_argument("--script", required=True)
+	parser.add_argument("--max-batch-size", type=int, default=DEFAULT_MAX_BATCH_SIZE)
+	parser.add_argument("--max-wait-ms", type=float, default=DEFAULT_MAX_WAIT_MS)
+	args = parser.parse_args(argv)
+	return InferServer(Path(args.workspace), Path(args.script), args.max_batch_size, args.max_wait_ms).serve()
+
+
+if __name__ == "__main__":
+	raise SystemExit(main())
@@ -0,0 +1,79 @@
+from __future__ import annotations
+
+import argparse
+import json
+import shutil
+import subprocess
+import tempfile
+import time
+from pathlib import Path
+
+from continuum_engine.install.dpkg import DpkgSnapshot
+from continuum_engine.install.manager import get_installers
+
+
+def make_status(path: Path, extra: int = 2000) -> None:
+	# Every APT package the installers check, plus `extra` filler stanzas so parsing has realistic work.
+	names = sorted({p for inst in get_installers().values() for p in inst.apt_packages})
+	stanzas = []
+	for i, name in enumerate(names):
+		status = "hold ok installed" if i % 3 == 0 else "install ok installed"
+		stanzas.append(f"Package: {name}\nStatus: {status}\nArchitecture: amd64\nVersion: 1.0-{i}\nDescription: fixture\n long description\n")
+	for i in range(extra):
+		stanzas.append(f"Package: filler-{i:05d}\nStatus: install ok installed\nArchitecture: all\nVersion: 1.0\nDescription: filler\n")
+	path.write_text("\n".join(stanzas), encoding="utf-8")
+
+
+def per_package(admindir: Path, packages: list[str]) -> tuple[float, int]:
+	# What the install checks did before the snapshot: one `dpkg -s` fork per package.
+	started = time.perf_counter()
+	found = 0
+	for pkg in packages:
+		result = subprocess.run(["dpkg", f"--admindir={admindir}", "-s", pkg], stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True)
+		if result.returncode == 0 and "Status: install ok installed" in result.stdout:
+			found += 1
+	return time.perf_counter() - started, found
+
+
+def snapshot(status: Path, packages: list[str]) -> tuple[float, int]:
+	started = time.perf_counter()
+	snap = DpkgSnapshot(status)
+	found = sum(1 for pkg in packages if snap.installed(pkg))
+	return time.perf_counter() - started, found
+
+
+def main(argv: list[str] | None = None) -> int:
+	parser = argparse.ArgumentParser(prog="python -m continuum_engine.install.bench", description="Compare per-package dpkg -s with one dpkg status snapshot on a fixture status file")
+	parser.add_argument("--extra", type=int, default=2000, help="Filler packages in the fixture status file (default: 2000)")
+	parser.add_argument("--repeat", type=int, default=5, help="Runs per method; the best is reported (default: 5)")
+	parser.add_argument("--json", action="store_true", help="Output JSON")
+	args = parser.parse_args(argv)
+
+	packages = sorted({p for inst in get_installers().values() for p in inst.apt_packages})
+	with tempfile.TemporaryDirectory(prefix="continuum-dpkg-bench-") as tmp:
+		admindir = Path(tmp)
+		status = admindir / "status"
+		make_status(status, args.extra)
+		rows = []
+		if shutil.which("dpkg") is not None:
+			runs = [per_package(admindir, packages) for _ in range(max(1, args.repeat))]
+			rows.append({"method": "dpkg -s per package", "seconds": round(min(r[0] for r in runs), 4), "installed": runs[0][1]})
+		runs = [snapshot(status, packages) for _ in range(max(1, args.repeat))]
+		rows.append({"method": "status snapshot", "seconds": round(min(r[0] for r in runs), 4), "installed": runs[0][1]})
+	base = rows[0]["seconds"]
+	for r in rows:
+		r["speedup"] = round(base / r["seconds"], 1) if r["seconds"] else None
+	if args.json:
+		print(json.dumps({"packages": len(packages), "rows": rows}, indent=2))
+		return 0
+	if shutil.which("dpkg") is None:
+		print("[warn] dpkg not found; only the snapshot was timed")
+	print(f"{len(packages)} packages checked against a status file with {len(packages) + args.extra} stanzas")
+	print("METHOD\tSECONDS\tINSTALLED\tSPEEDUP")
+	for r in rows:
+		print(f"{r['method']}\t{r['seconds']}\t{r['installed']}\t{r['speedup']}")
+	return 0
+
+
+if __name__ == "__main__":
+	raise SystemExit(main())
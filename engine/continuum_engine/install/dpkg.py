@@ -0,0 +1,108 @@
+from __future__ import annotations
+
+import os
+import shutil
+import subprocess
+import threading
+from pathlib import Path
+
+DPKG_STATUS = Path(os.environ.get("CONTINUUM_DPKG_STATUS", "/var/lib/dpkg/status"))
+
+
+def is_installed(status: str | None) -> bool:
+	# Status is "<want> <flag> <state>"; held packages read "hold ok installed", so only the state counts.
+	parts = (status or "").split()
+	return len(parts) == 3 and parts[2] == "installed"
+
+
+def _record(packages: dict[str, str], name: str, arch: str | None, status: str) -> None:
+	if arch and arch != "all":
+		packages[f"{name}:{arch}"] = status
+	# Multi-Arch packages have one stanza per architecture; the bare name is installed if any arch is.
+	if not is_installed(packages.get(name)):
+		packages[name] = status
+
+
+def parse_status(text: str) -> dict[str, str]:
+	packages: dict[str, str] = {}
+	name = arch = status = None
+	for line in text.splitlines() + [""]:
+		if not line:
+			if name and status:
+				_record(packages, name, arch, status)
+			name = arch = status = None
+			continue
+		if line[0] in " \t":
+			continue
+		if line.startswith("Package:"):
+			name = line[8:].strip()
+		elif line.startswith("Status:"):
+			status = line[7:].strip()
+		elif line.startswith("Architecture:"):
+			arch = line[13:].strip()
+	return packages
+
+
+def _query_dpkg() -> dict[str, str]:
+	if shutil.which("dpkg-query") is None:
+		return {}
+	result = subprocess.run(
+		["dpkg-query", "-W", "-f", "${Package}\t${Architecture}\t${Status}\n"],
+		stdout=subprocess.PIPE,
+		stderr=subprocess.DEVNULL,
+		text=True,
+	)
+	packages: dict[str, str] = {}
+	for line in (result.stdout or "").splitlines():
+		parts = line.split("\t")
+		if len(parts) != 3:
+			continue
+		name, arch, status = parts
+		_record(packages, name, arch, status)
+	return packages
+
+
+class DpkgSnapshot:
+	def __init__(self, status_path: Path = DPKG_STATUS):
+		self.status_path = Path(status_path)
+		self._lock = threading.Lock()
+		self._packages: dict[str, str] | None = None
+		self._stamp: tuple[int, int] | None = None
+
+	def _current_stamp(self) -> tuple[int, int] | None:
+		try:
+			st = os.stat(self.status_path)
+		except OSError:
+			return None
+		return st.st_mtime_ns, st.st_size
+
+	def packages(self) -> dict[str, str]:
+		with self._lock:
+			stamp = self._current_stamp()
+			# dpkg rewrites the status file on every transaction, so a changed stamp means stale data.
+			if self._packages is not None and stamp == self._stamp:
+				return self._packages
+			if stamp is not None:
+				try:
+					self._packages = parse_status(self.status_path.read_text(encoding="utf-8", errors="replace"))
+				except OSError:
+					self._packages = _query_dpkg()
+			else:
+				self._packages = _query_dpkg()
+			self._stamp = stamp
+			return self._packages
+
+	def installed(self, pkg: str) -> bool:
+		return is_installed(self.packages().get(pkg))
+
+	def invalidate(self) -> None:
+		with self._lock:
+			self._packages = None
+			self._stamp = None
+
+
+_snapshot = DpkgSnapshot()
+
+
+def dpkg_snapshot() -> DpkgSnapshot:
+	return _snapshot
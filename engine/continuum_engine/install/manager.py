@@ -4,12 +4,19 @@ import json
 import os
 import shutil
 import subprocess
-import traceback
-from dataclasses import dataclass
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
 from datetime import datetime, timezone
 from pathlib import Path
 from typing import Callable
 
+from continuum_engine.install.dpkg import dpkg_snapshot
+from continuum_engine.ollama import get_inventory
+from continuum_engine.plan import DEFAULT_PLAN_JOBS, NodeResult, PlanNode, execute_plan, report_failure, resolve_plan
+
+DOCTOR_JOBS = 8
+APT_BATCH = "apt-get"
+
 
 @dataclass
 class Installer:
@@ -19,6 +26,8 @@ class Installer:
 	check: Callable[[], bool]
 	install: Callable[["InstallContext"], None]
 	verify: Callable[["InstallContext"], None]
+	apt_packages: list[str] = field(default_factory=list)
+	resources: list[str] = field(default_factory=list)
 
 
 @dataclass
@@ -28,6 +37,7 @@ class InstallContext:
 	debug: bool
 	yes: bool
 	apt_updated: bool = False
+	jobs: int = DEFAULT_PLAN_JOBS
 
 
 def _now_iso() -> str:
@@ -121,11 +131,11 @@ def _apt_install(pkgs: list[str], ctx: InstallContext) -> None:
 		if ctx.debug and err:
 			msg = f"{msg}\n{err}"
 		raise RuntimeError(msg)
+	dpkg_snapshot().invalidate()
 
 
 def _dpkg_installed(pkg: str) -> bool:
-	result = subprocess.run(["dpkg", "-s", pkg], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
-	return result.returncode == 0
+	return dpkg_snapshot().installed(pkg)
 
 
 def _cmd_exists(cmd: str) -> bool:
@@ -182,6 +192,8 @@ def get_installers() -> dict[str, Installer]:
 			check=lambda p=pkg: _dpkg_installed(p),
 			install=lambda ctx, p=pkg: _apt_install([p], ctx),
 			verify=(lambda ctx, cmd=verify_cmd: _verify_cmd(cmd, ctx)) if verify_cmd else (lambda ctx: None),
+			apt_packages=[pkg],
+			resources=["apt"],
 		)
 
 	installers["curl"] = apt_installer("curl", "Command-line HTTP client", ["curl", "--version"])
@@ -210,6 +222,8 @@ def get_installers() -> dict[str, Installer]:
 		check=node_check,
 		install=node_install,
 		verify=node_verify,
+		apt_packages=["nodejs"],
+		resources=["apt"],
 	)
 
 	def ollama_check() -> bool:
@@ -234,6 +248,7 @@ def get_installers() -> dict[str, Installer]:
 		check=ollama_check,
 		install=ollama_install,
 		verify=ollama_verify,
+		resources=["apt"],
 	)
 
 	return installers
@@ -259,38 +274,10 @@ def list_targets() -> None:
 		print(f"  {bid}: {', '.join(items)}")
 
 
-def _resolve_targets(targets: list[str], installers: dict[str, Installer], bundles: dict[str, list[str]]) -> list[str]:
-	resolved: list[str] = []
-	visiting: set[str] = set()
-	visited: set[str] = set()
-
-	def visit(t: str) -> None:
-		if t in visited:
-			return
-		if t in visiting:
-			raise RuntimeError(f"Cycle detected in install targets: {t}")
-		visiting.add(t)
-		if t in bundles:
-			for sub in bundles[t]:
-				visit(sub)
-		elif t in installers:
-			for dep in installers[t].dependencies:
-				visit(dep)
-			resolved.append(t)
-		else:
-			raise RuntimeError(f"Unknown install target: {t}")
-		visiting.remove(t)
-		visited.add(t)
-
-	for t in targets:
-		visit(t)
-	return resolved
-
-
 def install_target(target: str, ctx: InstallContext) -> int:
 	installers = get_installers()
 	bundles = get_bundles()
-	to_install = _resolve_targets([target], installers, bundles)
+	to_install = resolve_plan([target], {iid: inst.dependencies for iid, inst in installers.items()}, bundles, kind="install")
 	print(f"Will install: {', '.join(to_install)}")
 	if not ctx.yes and not ctx.dry_run:
 		resp = input(f"Proceed with install of {', '.join(to_install)}? [y/N]: ").strip().lower()
@@ -298,31 +285,79 @@ def install_target(target: str, ctx: InstallContext) -> int:
 			print("Aborted.")
 			return 1
 	state = _load_state(ctx.workspace)
+	pending: list[str] = []
 	for iid in to_install:
+		if installers[iid].check():
+			print(f"[ok] {iid} already installed")
+			_installer_state_update(state, iid, "already_installed", None)
+		else:
+			pending.append(iid)
+	batch = _apt_batch(to_install, set(pending), installers)
+	nodes: list[PlanNode] = []
+	if batch:
+		pkgs = list(dict.fromkeys(p for iid in batch for p in installers[iid].apt_packages))
+		nodes.append(PlanNode(id=APT_BATCH, run=lambda: _apt_install(pkgs, ctx), resources=["apt"]))
+	for iid in pending:
 		inst = installers[iid]
-		try:
-			if inst.check():
-				print(f"[ok] {iid} already installed")
-				_installer_state_update(state, iid, "already_installed", None)
-			else:
-				print(f"[run] installing {iid}...")
-				inst.install(ctx)
-				inst.verify(ctx)
-				print(f"[ok] installed {iid}")
-				_installer_state_update(state, iid, "success", None)
-		except Exception as e:
-			print(f"[err] {iid}: {e}")
-			if ctx.debug:
-				print(traceback.format_exc())
-			_installer_state_update(state, iid, "failed", str(e))
-			if not ctx.debug:
-				pass
-			if not ctx.dry_run:
-				_save_state(ctx.workspace, state)
-			return 1
+		if iid in batch:
+			nodes.append(PlanNode(id=iid, run=lambda inst=inst: inst.verify(ctx), dependencies=[APT_BATCH] + inst.dependencies))
+		else:
+			nodes.append(PlanNode(
+				id=iid,
+				run=lambda inst=inst: _install_one(inst, ctx),
+				dependencies=inst.dependencies,
+				resources=inst.resources,
+			))
+
+	def on_status(event: str, nid: str, result: NodeResult | None) -> None:
+		if nid == APT_BATCH:
+			if event == "start":
+				print(f"[run] installing {', '.join(batch)} in one apt transaction...")
+			elif event == "failed":
+				report_failure("apt transaction", result, ctx.debug)
+			return
+		if event == "start" and nid not in batch:
+			print(f"[run] installing {nid}...")
+		elif event == "ok":
+			print(f"[ok] installed {nid}")
+		elif event == "failed":
+			report_failure(nid, result, ctx.debug)
+		elif event == "skipped":
+			print(f"[warn] {nid} skipped: {result.error}")
+
+	results = execute_plan(nodes, jobs=ctx.jobs, on_status=on_status)
+	batch_result = results.pop(APT_BATCH, None)
+	for iid, res in results.items():
+		if res.status == "ok":
+			_installer_state_update(state, iid, "success", None)
+		elif res.status == "failed":
+			_installer_state_update(state, iid, "failed", res.error)
+		elif iid in batch and batch_result is not None and batch_result.status == "failed":
+			_installer_state_update(state, iid, "failed", batch_result.error)
 	if not ctx.dry_run:
 		_save_state(ctx.workspace, state)
-	return 0
+	outcomes = list(results.values()) + ([batch_result] if batch_result is not None else [])
+	return 0 if all(r.status == "ok" for r in outcomes) else 1
+
+
+def _install_one(inst: Installer, ctx: InstallContext) -> None:
+	inst.install(ctx)
+	inst.verify(ctx)
+
+
+def _apt_batch(plan: list[str], pending: set[str], installers: dict[str, Installer]) -> list[str]:
+	# APT installers are hoisted into one transaction unless they sit behind a pending non-APT installer.
+	blocked: set[str] = set()
+	batch: list[str] = []
+	for iid in plan:
+		inst = installers[iid]
+		if any(dep in blocked for dep in inst.dependencies):
+			blocked.add(iid)
+		elif iid in pending and not inst.apt_packages:
+			blocked.add(iid)
+		elif iid in pending:
+			batch.append(iid)
+	return batch
 
 
 def run_doctor(ctx: InstallContext, json_output: bool = False) -> int:
@@ -336,21 +371,31 @@ def run_doctor(ctx: InstallContext, json_output: bool = False) -> int:
 	report = {"installers": {}, "ollama": {}}
 	if not json_output:
 		print("Installers:")
-	for iid in default_targets:
-		inst = installers.get(iid)
-		if not inst:
-			continue
-		if not inst.check():
+	targets = [iid for iid in default_targets if iid in installers]
+	present = {iid: installers[iid].check() for iid in targets}
+
+	def verify(iid: str) -> bool:
+		try:
+			installers[iid].verify(ctx)
+			return True
+		except Exception:
+			return False
+
+	# Verify commands are independent forks; run them together unless --debug wants readable output.
+	to_verify = [iid for iid in targets if present[iid]]
+	with ThreadPoolExecutor(max_workers=1 if ctx.debug else DOCTOR_JOBS) as pool:
+		verified = dict(zip(to_verify, pool.map(verify, to_verify)))
+	for iid in targets:
+		if not present[iid]:
 			if not json_output:
 				print(f"  {iid}: missing")
 			report["installers"][iid] = {"status": "missing", "reason": None}
 			continue
-		try:
-			inst.verify(ctx)
+		if verified[iid]:
 			if not json_output:
 				print(f"  {iid}: installed (ok)")
 			report["installers"][iid] = {"status": "installed (ok)", "reason": None}
-		except Exception:
+		else:
 			if not json_output:
 				print(f"  {iid}: installed (broken)")
 			report["installers"][iid] = {"status": "installed (broken)", "reason": None}
@@ -363,19 +408,21 @@ def run_doctor(ctx: InstallContext, json_output: bool = False) -> int:
 			"node": ["node", "--version"],
 			"ollama": ["ollama", "--version"],
 		}
-		for name, cmd in cmd_checks.items():
+
+		def probe(cmd: list[str]) -> str:
 			if not _cmd_exists(cmd[0]):
-				print(f"  {name}: missing command")
-				continue
+				return "missing command"
 			result = subprocess.run(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
-			if result.returncode == 0:
-				print(f"  {name}: ok")
-			else:
-				print(f"  {name}: error")
+			return "ok" if result.returncode == 0 else "error"
+
+		with ThreadPoolExecutor(max_workers=DOCTOR_JOBS) as pool:
+			probes = list(pool.map(probe, cmd_checks.values()))
+		for name, outcome in zip(cmd_checks, probes):
+			print(f"  {name}: {outcome}")
 	if _cmd_exists("ollama"):
 		ollama_reason = None
-		result = subprocess.run(["ollama", "list"], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
-		if result.returncode != 0:
+		ok, _, _ = get_inventory().list_models()
+		if not ok:
 			ollama_reason = "ollama list failed"
 		if shutil.which("systemctl"):
 			active = subprocess.run(["systemctl", "is-active", "ollama"], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
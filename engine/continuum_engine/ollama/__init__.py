@@ -0,0 +1,37 @@
+from __future__ import annotations
+
+from continuum_engine.ollama.cache import (
+	ResponseCache,
+	cache_path,
+	cache_stats,
+	open_cache,
+)
+from continuum_engine.ollama.inventory import (
+	ModelInventory,
+	OllamaHTTP,
+	get_inventory,
+	invalidate_inventory,
+	model_key,
+	ollama_address,
+)
+from continuum_engine.ollama.manifests import (
+	manifest_digest,
+	model_digest,
+	models_dirs,
+)
+
+__all__ = [
+	"ModelInventory",
+	"OllamaHTTP",
+	"ResponseCache",
+	"cache_path",
+	"cache_stats",
+	"get_inventory",
+	"invalidate_inventory",
+	"manifest_digest",
+	"model_digest",
+	"model_key",
+	"models_dirs",
+	"ollama_address",
+	"open_cache",
+]
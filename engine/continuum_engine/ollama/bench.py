@@ -0,0 +1,182 @@
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import statistics
+import time
+from pathlib import Path
+
+from continuum_engine.ollama.cache import ResponseCache, open_cache
+from continuum_engine.ollama.client import AsyncOllamaClient, OllamaError
+
+
+class StubOllama:
+	# Minimal /api/generate stand-in: streams `tokens` NDJSON chunks, `token_ms` apart, `parallel` requests at a time.
+	def __init__(self, tokens: int = 32, token_ms: float = 2.0, parallel: int = 4):
+		self.tokens = tokens
+		self.token_delay = token_ms / 1000.0
+		self.parallel = asyncio.Semaphore(max(1, parallel))
+		self.server: asyncio.AbstractServer | None = None
+		self.port = 0
+		self._tasks: set[asyncio.Task] = set()
+
+	async def start(self) -> int:
+		self.server = await asyncio.start_server(self._handle, "127.0.0.1", 0)
+		self.port = self.server.sockets[0].getsockname()[1]
+		return self.port
+
+	async def close(self) -> None:
+		if self.server is not None:
+			self.server.close()
+		for task in self._tasks:
+			task.cancel()
+		await asyncio.gather(*self._tasks, return_exceptions=True)
+
+	async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+		task = asyncio.current_task()
+		self._tasks.add(task)
+		try:
+			while True:
+				line = await reader.readline()
+				if not line:
+					return
+				length = 0
+				while True:
+					header = await reader.readline()
+					if header in (b"\r\n", b"\n", b""):
+						break
+					key, _, value = header.decode("latin-1").partition(":")
+					if key.strip().lower() == "content-length":
+						length = int(value.strip())
+				body = json.loads(await reader.readexactly(length)) if length else {}
+				writer.write(b"HTTP/1.1 200 OK\r\nContent-Type: application/x-ndjson\r\nTransfer-Encoding: chunked\r\n\r\n")
+				async with self.parallel:
+					for i in range(self.tokens):
+						await asyncio.sleep(self.token_delay)
+						self._chunk(writer, {"model": body.get("model"), "response": f"t{i} ", "done": False})
+						await writer.drain()
+					self._chunk(writer, {"model": body.get("model"), "response": "", "done": True, "eval_count": self.tokens})
+				writer.write(b"0\r\n\r\n")
+				await writer.drain()
+		except (ConnectionError, asyncio.IncompleteReadError, asyncio.CancelledError):
+			pass
+		finally:
+			self._tasks.discard(task)
+			writer.close()
+
+	@staticmethod
+	def _chunk(writer: asyncio.StreamWriter, record: dict) -> None:
+		data = json.dumps(record).encode("utf-8") + b"\n"
+		writer.write(f"{len(data):x}\r\n".encode("ascii") + data + b"\r\n")
+
+
+def _percentile(values: list[float], pct: float) -> float:
+	if not values:
+		return 0.0
+	ordered = sorted(values)
+	return ordered[min(len(ordered) - 1, int(round(pct / 100.0 * (len(ordered) - 1))))]
+
+
+async def run_benchmark(
+	model: str,
+	requests: int,
+	concurrency: int,
+	host: str | None = None,
+	port: int | None = None,
+	prompt: str = "Return {\"ok\": true} as JSON.",
+	options: dict | None = None,
+	cache: ResponseCache | None = None,
+) -> dict:
+	latencies: list[float] = []
+	waits: list[float] = []
+	tokens = 0
+	errors = 0
+	# Requests are queued here rather than inside the client, so latency is timed from the moment a
+	# request holds one of the `concurrency` slots: service time, reported apart from queue wait.
+	slots = asyncio.Semaphore(max(1, concurrency))
+	async with AsyncOllamaClient(host=host, port=port, max_connections=concurrency, max_in_flight=concurrency, cache=cache) as client:
+
+		async def one(i: int) -> None:
+			nonlocal tokens, errors
+			queued = time.perf_counter()
+			async with slots:
+				started = time.perf_counter()
+				waits.append(started - queued)
+				try:
+					result = await client.generate(model, f"{prompt} #{i}", options)
+				except OllamaError:
+					errors += 1
+					return
+				latencies.append(time.perf_counter() - started)
+			tokens += int(result.get("eval_count") or 0)
+
+		started = time.perf_counter()
+		await asyncio.gather(*(one(i) for i in range(requests)))
+		elapsed = time.perf_counter() - started
+		stats = dict(client.stats)
+	return {
+		"model": model,
+		"concurrency": concurrency,
+		"requests": requests,
+		"errors": errors,
+		"seconds": round(elapsed, 3),
+		"requests_per_s": round(len(latencies) / elapsed, 2) if elapsed else 0.0,
+		"tokens_per_s": round(tokens / elapsed, 1) if elapsed else 0.0,
+		"p50_ms": round(_percentile(latencies, 50) * 1000, 1),
+		"p95_ms": round(_percentile(latencies, 95) * 1000, 1),
+		"mean_ms": round(statistics.fmean(latencies) * 1000, 1) if latencies else 0.0,
+		"wait_p50_ms": round(_percentile(waits, 50) * 1000, 1),
+		"wait_p95_ms": round(_percentile(waits, 95) * 1000, 1),
+		"connections_opened": stats["connections_opened"],
+		"retries": stats["retries"],
+		"cache_hits": stats["cache_hits"],
+	}
+
+
+async def _main(args: argparse.Namespace) -> int:
+	stub = None
+	host, port = None, None
+	if args.stub:
+		stub = StubOllama(tokens=args.stub_tokens, token_ms=args.stub_token_ms, parallel=args.stub_parallel)
+		host, port = "127.0.0.1", await stub.start()
+	options = {"temperature": args.temperature} if args.temperature is not None else None
+	cache = open_cache(Path(args.workspace).expanduser().resolve()) if args.workspace else None
+	try:
+		rows = []
+		for c in [int(x) for x in args.concurrency.split(",") if x.strip()]:
+			rows.append(await run_benchmark(args.model, args.requests, c, host=host, port=port, options=options, cache=cache))
+	finally:
+		if stub is not None:
+			await stub.close()
+		if cache is not None:
+			cache.close()
+	if args.json:
+		print(json.dumps(rows, indent=2))
+		return 0
+	print("CONCURRENCY\tREQ/S\tTOK/S\tP50_MS\tP95_MS\tWAIT_P50_MS\tWAIT_P95_MS\tCONNS\tCACHE_HITS\tERRORS")
+	for r in rows:
+		print(
+			f"{r['concurrency']}\t{r['requests_per_s']}\t{r['tokens_per_s']}\t{r['p50_ms']}\t{r['p95_ms']}\t"
+			f"{r['wait_p50_ms']}\t{r['wait_p95_ms']}\t{r['connections_opened']}\t{r['cache_hits']}\t{r['errors']}"
+		)
+	return 0
+
+
+def main(argv: list[str] | None = None) -> int:
+	parser = argparse.ArgumentParser(prog="python -m continuum_engine.ollama.bench", description="Measure Ollama generate throughput per concurrency level")
+	parser.add_argument("--model", default="phi3-mini-json", help="Model to generate with (default: phi3-mini-json)")
+	parser.add_argument("--requests", type=int, default=64, help="Requests per concurrency level (default: 64)")
+	parser.add_argument("--concurrency", default="1,2,4,8", help="Comma-separated in-flight limits to try (default: 1,2,4,8)")
+	parser.add_argument("--temperature", type=float, help="options.temperature for each request")
+	parser.add_argument("--stub", action="store_true", help="Run against an in-process stub server instead of OLLAMA_HOST")
+	parser.add_argument("--stub-tokens", type=int, default=32, help="Tokens the stub streams per request (default: 32)")
+	parser.add_argument("--stub-token-ms", type=float, default=2.0, help="Delay between stub tokens in ms (default: 2)")
+	parser.add_argument("--stub-parallel", type=int, default=4, help="Requests the stub serves at once, like OLLAMA_NUM_PARALLEL (default: 4)")
+	parser.add_argument("--workspace", help="Put the workspace's Ollama response cache (.continuum/cache/ollama.db) in front of requests")
+	parser.add_argument("--json", action="store_true", help="Output JSON")
+	return asyncio.run(_main(parser.parse_args(argv)))
+
+
+if __name__ == "__main__":
+	raise SystemExit(main())
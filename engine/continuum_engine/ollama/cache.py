@@ -0,0 +1,162 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+DEFAULT_CACHE_MB = 512
+CACHE_VERSION = 1
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+	key TEXT PRIMARY KEY,
+	model TEXT,
+	size INTEGER NOT NULL,
+	created REAL NOT NULL,
+	last_used REAL NOT NULL,
+	hits INTEGER NOT NULL DEFAULT 0,
+	response BLOB NOT NULL
+);
+CREATE INDEX IF NOT EXISTS entries_last_used ON entries (last_used);
+CREATE TABLE IF NOT EXISTS meta (
+	name TEXT PRIMARY KEY,
+	value INTEGER NOT NULL
+);
+"""
+
+# Fields of a generate/chat payload that change the output; stream/keep_alive only change delivery.
+KEY_FIELDS = ("prompt", "messages", "system", "template", "context", "format", "options", "raw", "images", "tools", "suffix", "think")
+
+
+def cache_path(ws: Path) -> Path:
+	return ws / ".continuum" / "cache" / "ollama.db"
+
+
+def cache_budget_bytes() -> int:
+	raw = os.environ.get("CONTINUUM_OLLAMA_CACHE_MB")
+	try:
+		mb = float(raw) if raw else DEFAULT_CACHE_MB
+	except ValueError:
+		mb = DEFAULT_CACHE_MB
+	return int(mb * 1024 * 1024)
+
+
+def is_deterministic(payload: dict) -> bool:
+	# Sampled generations are meant to differ between calls; only pin temperature-0 or seeded requests.
+	options = payload.get("options") or {}
+	return options.get("temperature") == 0 or options.get("seed") is not None
+
+
+def cache_key(endpoint: str, digest: str, payload: dict) -> str:
+	material = {"v": CACHE_VERSION, "endpoint": endpoint, "digest": digest}
+	material.update({k: payload[k] for k in KEY_FIELDS if payload.get(k) is not None})
+	return hashlib.sha256(json.dumps(material, sort_keys=True, separators=(",", ":")).encode("utf-8")).hexdigest()
+
+
+class ResponseCache:
+	def __init__(self, path: Path, max_bytes: int | None = None):
+		self.path = path
+		self.max_bytes = cache_budget_bytes() if max_bytes is None else max_bytes
+		path.parent.mkdir(parents=True, exist_ok=True)
+		# One connection shared across threads (asyncio.to_thread callers), serialized by the lock.
+		self._conn = sqlite3.connect(str(path), timeout=30, check_same_thread=False)
+		self._conn.execute("PRAGMA journal_mode=WAL")
+		self._conn.execute("PRAGMA synchronous=NORMAL")
+		self._conn.executescript(_SCHEMA)
+		self._lock = threading.Lock()
+
+	def close(self) -> None:
+		with self._lock:
+			self._conn.close()
+
+	def _bump(self, name: str, delta: int) -> None:
+		self._conn.execute(
+			"INSERT INTO meta (name, value) VALUES (?, ?) ON CONFLICT(name) DO UPDATE SET value = value + excluded.value",
+			(name, delta),
+		)
+
+	def get(self, key: str) -> dict | None:
+		with self._lock, self._conn:
+			row = self._conn.execute("SELECT response FROM entries WHERE key = ?", (key,)).fetchone()
+			if row is None:
+				self._bump("misses", 1)
+				return None
+			self._conn.execute("UPDATE entries SET last_used = ?, hits = hits + 1 WHERE key = ?", (time.time(), key))
+			self._bump("hits", 1)
+		return json.loads(row[0])
+
+	def put(self, key: str, model: str, response: dict) -> None:
+		blob = json.dumps(response, separators=(",", ":")).encode("utf-8")
+		if len(blob) > self.max_bytes:
+			return
+		now = time.time()
+		with self._lock, self._conn:
+			old = self._conn.execute("SELECT size FROM entries WHERE key = ?", (key,)).fetchone()
+			self._conn.execute(
+				"INSERT OR REPLACE INTO entries (key, model, size, created, last_used, hits, response) VALUES (?, ?, ?, ?, ?, 0, ?)",
+				(key, model, len(blob), now, now, blob),
+			)
+			self._bump("bytes", len(blob) - (old[0] if old else 0))
+			self._evict_locked()
+
+	def _evict_locked(self) -> None:
+		total = self._meta("bytes")
+		freed = 0
+		evicted = 0
+		# Drop least-recently-used entries (via the last_used index) a page at a time until back under budget.
+		while total - freed > self.max_bytes:
+			rows = self._conn.execute("SELECT key, size FROM entries ORDER BY last_used ASC LIMIT 256").fetchall()
+			if not rows:
+				break
+			for key, size in rows:
+				if total - freed <= self.max_bytes:
+					break
+				self._conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+				freed += size
+				evicted += 1
+		if evicted:
+			self._bump("bytes", -freed)
+			self._bump("evictions", evicted)
+
+	def _meta(self, name: str) -> int:
+		row = self._conn.execute("SELECT value FROM meta WHERE name = ?", (name,)).fetchone()
+		return int(row[0]) if row else 0
+
+	def stats(self) -> dict:
+		with self._lock:
+			entries = int(self._conn.execute("SELECT COUNT(*) FROM entries").fetchone()[0])
+			hits, misses = self._meta("hits"), self._meta("misses")
+			return {
+				"path": str(self.path),
+				"entries": entries,
+				"bytes": self._meta("bytes"),
+				"max_bytes": self.max_bytes,
+				"hits": hits,
+				"misses": misses,
+				"evictions": self._meta("evictions"),
+				"hit_rate": round(hits / (hits + misses), 3) if hits + misses else None,
+			}
+
+	def clear(self) -> None:
+		with self._lock, self._conn:
+			self._conn.execute("DELETE FROM entries")
+			self._conn.execute("DELETE FROM meta")
+
+
+def open_cache(ws: Path, max_bytes: int | None = None) -> ResponseCache:
+	return ResponseCache(cache_path(ws), max_bytes=max_bytes)
+
+
+def cache_stats(ws: Path) -> dict | None:
+	# Reporting must not create the database in workspaces that never used it.
+	if not cache_path(ws).exists():
+		return None
+	cache = open_cache(ws)
+	try:
+		return cache.stats()
+	finally:
+		cache.close()
@@ -0,0 +1,319 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import random
+import time
+from pathlib import Path
+from typing import AsyncIterator
+
+from continuum_engine.ollama.cache import ResponseCache, cache_key, is_deterministic, open_cache
+from continuum_engine.ollama.inventory import INVENTORY_TTL, ollama_address
+from continuum_engine.ollama.manifests import model_digest
+
+DEFAULT_MAX_CONNECTIONS = 8
+DEFAULT_MAX_IN_FLIGHT = 8
+DEFAULT_RETRIES = 3
+RETRY_BASE_DELAY = 0.25
+RETRY_MAX_DELAY = 8.0
+CONNECT_TIMEOUT = 5.0
+# Generations can sit in the daemon queue for a long time; this bounds silence between chunks, not total time.
+READ_TIMEOUT = 300.0
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+
+class OllamaError(Exception):
+	def __init__(self, message: str, status: int | None = None):
+		super().__init__(message)
+		self.status = status
+
+
+class _Retryable(Exception):
+	pass
+
+
+class _Conn:
+	__slots__ = ("reader", "writer")
+
+	def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+		self.reader = reader
+		self.writer = writer
+
+	def close(self) -> None:
+		try:
+			self.writer.close()
+		except Exception:
+			pass
+
+	async def aclose(self) -> None:
+		self.close()
+		try:
+			await self.writer.wait_closed()
+		except Exception:
+			pass
+
+
+class AsyncOllamaClient:
+	def __init__(
+		self,
+		host: str | None = None,
+		port: int | None = None,
+		max_connections: int = DEFAULT_MAX_CONNECTIONS,
+		max_in_flight: int = DEFAULT_MAX_IN_FLIGHT,
+		retries: int = DEFAULT_RETRIES,
+		read_timeout: float = READ_TIMEOUT,
+		cache: ResponseCache | None = None,
+		cache_all: bool = False,
+		workspace: Path | None = None,
+	):
+		default_host, default_port = ollama_address()
+		self.host = host or default_host
+		self.port = port or default_port
+		self.max_connections = max(1, max_connections)
+		self.retries = max(0, retries)
+		self.read_timeout = read_timeout
+		self._in_flight = asyncio.Semaphore(max(1, max_in_flight))
+		self._slots = asyncio.Semaphore(self.max_connections)
+		self._idle: list[_Conn] = []
+		# Clients working for a workspace get its response cache unless one is passed in.
+		self._owns_cache = cache is None and workspace is not None
+		self.cache = open_cache(workspace) if self._owns_cache else cache
+		self.cache_all = cache_all
+		self._digests: dict[str, tuple[str | None, float]] = {}
+		self.stats = {"requests": 0, "retries": 0, "connections_opened": 0, "errors": 0, "cache_hits": 0, "cache_misses": 0}
+
+	async def __aenter__(self) -> "AsyncOllamaClient":
+		return self
+
+	async def __aexit__(self, *exc) -> None:
+		await self.aclose()
+
+	async def aclose(self) -> None:
+		while self._idle:
+			await self._idle.pop().aclose()
+		if self._owns_cache:
+			self.cache.close()
+			self._owns_cache = False
+
+	async def _acquire(self) -> _Conn:
+		await self._slots.acquire()
+		while self._idle:
+			conn = self._idle.pop()
+			# The daemon may have closed an idle keep-alive socket; drop those instead of failing a request on them.
+			if not conn.reader.at_eof() and not conn.writer.is_closing():
+				return conn
+			conn.close()
+		try:
+			reader, writer = await asyncio.wait_for(asyncio.open_connection(self.host, self.port), CONNECT_TIMEOUT)
+		except BaseException:
+			self._slots.release()
+			raise
+		self.stats["connections_opened"] += 1
+		return _Conn(reader, writer)
+
+	def _release(self, conn: _Conn, reusable: bool) -> None:
+		if reusable:
+			self._idle.append(conn)
+		else:
+			conn.close()
+		self._slots.release()
+
+	async def _readline(self, conn: _Conn) -> bytes:
+		line = await asyncio.wait_for(conn.reader.readline(), self.read_timeout)
+		if not line:
+			raise ConnectionError("connection closed by ollama")
+		return line
+
+	async def _read_head(self, conn: _Conn) -> tuple[int, dict[str, str]]:
+		status_line = await self._readline(conn)
+		parts = status_line.decode("latin-1").split(" ", 2)
+		if len(parts) < 2 or not parts[1].isdigit():
+			raise ConnectionError(f"bad status line: {status_line[:80]!r}")
+		headers: dict[str, str] = {}
+		while True:
+			line = await self._readline(conn)
+			if line in (b"\r\n", b"\n"):
+				break
+			key, _, value = line.decode("latin-1").partition(":")
+			headers[key.strip().lower()] = value.strip()
+		return int(parts[1]), headers
+
+	async def _body_chunks(self, conn: _Conn, headers: dict[str, str]) -> AsyncIterator[bytes]:
+		if "chunked" in headers.get("transfer-encoding", "").lower():
+			while True:
+				size_line = await self._readline(conn)
+				size = int(size_line.split(b";", 1)[0].strip(), 16)
+				if size == 0:
+					# Trailers (normally none) end with an empty line.
+					while (await self._readline(conn)) not in (b"\r\n", b"\n"):
+						pass
+					return
+				data = await asyncio.wait_for(conn.reader.readexactly(size), self.read_timeout)
+				await self._readline(conn)
+				yield data
+		elif "content-length" in headers:
+			remaining = int(headers["content-length"])
+			while remaining > 0:
+				data = await asyncio.wait_for(conn.reader.read(min(remaining, 64 * 1024)), self.read_timeout)
+				if not data:
+					raise ConnectionError("connection closed mid-body")
+				remaining -= len(data)
+				yield data
+		else:
+			while True:
+				data = await asyncio.wait_for(conn.reader.read(64 * 1024), self.read_timeout)
+				if not data:
+					return
+				yield data
+
+	async def _stream_once(self, method: str, path: str, payload: dict | None) -> AsyncIterator[dict]:
+		body = json.dumps(payload).encode("utf-8") if payload is not None else b""
+		request = (
+			f"{method} {path} HTTP/1.1\r\n"
+			f"Host: {self.host}:{self.port}\r\n"
+			"Connection: keep-alive\r\n"
+			"Accept: application/x-ndjson, application/json\r\n"
+			"Content-Type: application/json\r\n"
+			f"Content-Length: {len(body)}\r\n\r\n"
+		).encode("latin-1") + body
+		conn = await self._acquire()
+		reusable = False
+		try:
+			try:
+				conn.writer.write(request)
+				await conn.writer.drain()
+				status, headers = await self._read_head(conn)
+			except (OSError, asyncio.IncompleteReadError, asyncio.TimeoutError) as e:
+				raise _Retryable(str(e) or type(e).__name__)
+			if status != 200:
+				raw = b"".join([chunk async for chunk in self._body_chunks(conn, headers)])
+				try:
+					message = json.loads(raw).get("error") or raw.decode("utf-8", "replace")
+				except ValueError:
+					message = raw.decode("utf-8", "replace")
+				reusable = headers.get("connection", "").lower() != "close"
+				if status in RETRY_STATUSES:
+					raise _Retryable(f"HTTP {status}: {message}")
+				raise OllamaError(f"HTTP {status}: {message}", status)
+			# NDJSON records can straddle chunk boundaries; split on newlines across the running buffer.
+			buf = b""
+			async for chunk in self._body_chunks(conn, headers):
+				buf += chunk
+				*lines, buf = buf.split(b"\n")
+				for line in lines:
+					if line.strip():
+						record = json.loads(line)
+						if record.get("error"):
+							raise OllamaError(record["error"])
+						yield record
+			if buf.strip():
+				record = json.loads(buf)
+				if record.get("error"):
+					raise OllamaError(record["error"])
+				yield record
+			reusable = headers.get("connection", "").lower() != "close"
+		finally:
+			self._release(conn, reusable)
+
+	async def stream(self, method: str, path: str, payload: dict | None = None) -> AsyncIterator[dict]:
+		async with self._in_flight:
+			self.stats["requests"] += 1
+			attempt = 0
+			while True:
+				yielded = False
+				try:
+					async for record in self._stream_once(method, path, payload):
+						yielded = True
+						yield record
+					return
+				except (_Retryable, OSError, asyncio.IncompleteReadError, asyncio.TimeoutError) as e:
+					# Once records have been handed out a retry would duplicate them; only retry clean failures.
+					if yielded or attempt >= self.retries:
+						self.stats["errors"] += 1
+						raise OllamaError(f"{method} {path} failed after {attempt + 1} attempt(s): {e}") from None
+				except OllamaError:
+					self.stats["errors"] += 1
+					raise
+				attempt += 1
+				self.stats["retries"] += 1
+				# Full jitter keeps a burst of failed requests from retrying in lockstep.
+				await asyncio.sleep(random.uniform(0, min(RETRY_MAX_DELAY, RETRY_BASE_DELAY * 2 ** attempt)))
+
+	async def request(self, method: str, path: str, payload: dict | None = None) -> dict:
+		last: dict = {}
+		async for record in self.stream(method, path, payload):
+			last = record
+		return last
+
+	async def generate_stream(self, model: str, prompt: str, options: dict | None = None, **extra) -> AsyncIterator[dict]:
+		payload = {"model": model, "prompt": prompt, "stream": True, **extra}
+		if options:
+			payload["options"] = options
+		async for record in self.stream("POST", "/api/generate", payload):
+			yield record
+
+	async def _digest(self, model: str) -> str | None:
+		cached = self._digests.get(model)
+		if cached is not None and cached[1] > time.monotonic():
+			return cached[0]
+		# Manifest reads (or the inventory fallback) are blocking; keep them off the event loop.
+		digest = await asyncio.to_thread(model_digest, model)
+		self._digests[model] = (digest, time.monotonic() + INVENTORY_TTL)
+		return digest
+
+	async def _cached(self, endpoint: str, payload: dict, fold) -> dict:
+		key = None
+		if self.cache is not None and (self.cache_all or is_deterministic(payload)):
+			digest = await self._digest(payload["model"])
+			if digest is not None:
+				key = cache_key(endpoint, digest, payload)
+				hit = await asyncio.to_thread(self.cache.get, key)
+				if hit is not None:
+					self.stats["cache_hits"] += 1
+					return hit
+				self.stats["cache_misses"] += 1
+		result = await fold(self.stream("POST", endpoint, payload))
+		# Only complete generations are worth replaying.
+		if key is not None and result.get("done"):
+			await asyncio.to_thread(self.cache.put, key, payload["model"], result)
+		return result
+
+	async def generate(self, model: str, prompt: str, options: dict | None = None, **extra) -> dict:
+		payload = {"model": model, "prompt": prompt, "stream": True, **extra}
+		if options:
+			payload["options"] = options
+
+		# Streams under the hood so long generations keep the read timeout alive, then folds the pieces together.
+		async def fold(records: AsyncIterator[dict]) -> dict:
+			parts: list[str] = []
+			final: dict = {}
+			async for record in records:
+				parts.append(record.get("response", ""))
+				final = record
+			return {**final, "response": "".join(parts)}
+
+		return await self._cached("/api/generate", payload, fold)
+
+	async def chat(self, model: str, messages: list[dict], options: dict | None = None, **extra) -> dict:
+		payload = {"model": model, "messages": messages, "stream": True, **extra}
+		if options:
+			payload["options"] = options
+
+		async def fold(records: AsyncIterator[dict]) -> dict:
+			parts: list[str] = []
+			final: dict = {}
+			async for record in records:
+				parts.append((record.get("message") or {}).get("content", ""))
+				final = record
+			return {**final, "message": {**(final.get("message") or {"role": "assistant"}), "content": "".join(parts)}}
+
+		return await self._cached("/api/chat", payload, fold)
+
+	async def generate_many(self, model: str, prompts: list[str], options: dict | None = None, **extra) -> list[dict | OllamaError]:
+		async def one(prompt: str):
+			try:
+				return await self.generate(model, prompt, options, **extra)
+			except OllamaError as e:
+				return e
+
+		return await asyncio.gather(*(one(p) for p in prompts))
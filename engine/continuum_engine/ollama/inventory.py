@@ -0,0 +1,211 @@
+from __future__ import annotations
+
+import http.client
+import json
+import os
+import re
+import shutil
+import subprocess
+import threading
+import time
+from urllib.parse import urlsplit
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 11434
+INVENTORY_TTL = 10.0
+HTTP_TIMEOUT = 5.0
+DIGEST_RE = re.compile(r"[0-9a-f]{64}")
+
+
+def ollama_address() -> tuple[str, int]:
+	raw = (os.environ.get("OLLAMA_HOST") or "").strip()
+	if not raw:
+		return DEFAULT_HOST, DEFAULT_PORT
+	if "://" not in raw:
+		raw = "http://" + raw
+	parts = urlsplit(raw)
+	host = parts.hostname or DEFAULT_HOST
+	if host in {"0.0.0.0", "::"}:
+		host = DEFAULT_HOST
+	return host, parts.port or DEFAULT_PORT
+
+
+def model_key(name: str) -> str:
+	# `ollama list` reports untagged models as name:latest.
+	name = name.strip()
+	if ":" not in name.rsplit("/", 1)[-1]:
+		return f"{name}:latest"
+	return name
+
+
+class OllamaHTTP:
+	def __init__(self, host: str | None = None, port: int | None = None, timeout: float = HTTP_TIMEOUT):
+		default_host, default_port = ollama_address()
+		self.host = host or default_host
+		self.port = port or default_port
+		self.timeout = timeout
+		self._conn: http.client.HTTPConnection | None = None
+		self._lock = threading.Lock()
+
+	def request(self, method: str, path: str, payload: dict | None = None) -> tuple[int, bytes]:
+		body = json.dumps(payload).encode("utf-8") if payload is not None else None
+		headers = {"Content-Type": "application/json"} if body is not None else {}
+		with self._lock:
+			# One keep-alive connection is reused; a stale socket gets a single reconnect.
+			for attempt in range(2):
+				if self._conn is None:
+					self._conn = http.client.HTTPConnection(self.host, self.port, timeout=self.timeout)
+				try:
+					self._conn.request(method, path, body=body, headers=headers)
+					resp = self._conn.getresponse()
+					return resp.status, resp.read()
+				except (http.client.HTTPException, OSError):
+					self.close_locked()
+					if attempt:
+						raise
+		raise OSError("unreachable")
+
+	def close_locked(self) -> None:
+		if self._conn is not None:
+			try:
+				self._conn.close()
+			except Exception:
+				pass
+			self._conn = None
+
+	def close(self) -> None:
+		with self._lock:
+			self.close_locked()
+
+
+def full_digest(value: str | None) -> str | None:
+	# /api/tags reports the manifest's full sha256, `ollama list` only its first 12 hex digits. Keys built
+	# from a digest must not depend on which path answered, so anything short of the full form is unknown.
+	if not value:
+		return None
+	value = value.strip().lower()
+	value = value.removeprefix("sha256:")
+	return value if DIGEST_RE.fullmatch(value) else None
+
+
+class ModelInventory:
+	def __init__(self, ttl: float = INVENTORY_TTL, client: OllamaHTTP | None = None):
+		self.ttl = ttl
+		self.client = client or OllamaHTTP()
+		self._lock = threading.Lock()
+		self._tags: tuple[float, bool, dict[str, dict], str | None] | None = None
+		self._shown: dict[str, tuple[float, bool]] = {}
+		self.http_calls = 0
+		self.cli_calls = 0
+
+	def invalidate(self) -> None:
+		with self._lock:
+			self._tags = None
+			self._shown.clear()
+
+	def _fresh(self, stamp: float) -> bool:
+		return time.monotonic() - stamp < self.ttl
+
+	def _fetch_tags(self) -> tuple[bool, dict[str, dict], str | None]:
+		try:
+			self.http_calls += 1
+			status, body = self.client.request("GET", "/api/tags")
+			if status == 200:
+				data = json.loads(body.decode("utf-8") or "{}")
+				models = {}
+				for m in data.get("models") or []:
+					name = m.get("name") or m.get("model")
+					if name:
+						models[model_key(name)] = m
+				return True, models, None
+		except Exception:
+			pass
+		return self._fetch_tags_cli()
+
+	def _fetch_tags_cli(self) -> tuple[bool, dict[str, dict], str | None]:
+		if shutil.which("ollama") is None:
+			return False, {}, "ollama not installed. Run: continuum install ollama"
+		self.cli_calls += 1
+		result = subprocess.run(["ollama", "list"], stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
+		if result.returncode != 0:
+			return False, {}, (result.stderr or "").strip() or "ollama list failed"
+		models = {}
+		for line in (result.stdout or "").splitlines():
+			if not line.strip() or line.lower().startswith("name"):
+				continue
+			parts = line.split()
+			if parts:
+				models[model_key(parts[0])] = {"name": parts[0], "digest": parts[1] if len(parts) > 1 else None}
+		return True, models, None
+
+	def tags(self) -> tuple[bool, dict[str, dict], str | None]:
+		with self._lock:
+			if self._tags is not None and self._fresh(self._tags[0]):
+				_, ok, models, err = self._tags
+				return ok, models, err
+			ok, models, err = self._fetch_tags()
+			self._tags = (time.monotonic(), ok, models, err)
+			return ok, models, err
+
+	def list_models(self) -> tuple[bool, set[str], str | None]:
+		ok, models, err = self.tags()
+		return ok, set(models), err
+
+	def has(self, model: str) -> bool:
+		ok, models, _ = self.tags()
+		return ok and model_key(model) in models
+
+	def digest(self, model: str) -> str | None:
+		ok, models, _ = self.tags()
+		if not ok:
+			return None
+		entry = models.get(model_key(model)) or {}
+		return full_digest(entry.get("digest"))
+
+	def show(self, model: str) -> bool:
+		key = model_key(model)
+		with self._lock:
+			cached = self._shown.get(key)
+			if cached is not None and self._fresh(cached[0]):
+				return cached[1]
+		# A fresh tag list already answers "is it there" without a /api/show round trip.
+		with self._lock:
+			tags = self._tags
+		if tags is not None and self._fresh(tags[0]) and tags[1]:
+			found = key in tags[2]
+		else:
+			found = self._show_remote(model)
+		with self._lock:
+			self._shown[key] = (time.monotonic(), found)
+		return found
+
+	def _show_remote(self, model: str) -> bool:
+		try:
+			self.http_calls += 1
+			status, _ = self.client.request("POST", "/api/show", {"model": model})
+			if status in {200, 404}:
+				return status == 200
+		except Exception:
+			pass
+		if shutil.which("ollama") is None:
+			raise RuntimeError("ollama not installed. Run: continuum install ollama")
+		self.cli_calls += 1
+		result = subprocess.run(["ollama", "show", model], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+		return result.returncode == 0
+
+
+_inventory: ModelInventory | None = None
+_inventory_lock = threading.Lock()
+
+
+def get_inventory() -> ModelInventory:
+	global _inventory
+	with _inventory_lock:
+		if _inventory is None:
+			_inventory = ModelInventory()
+		return _inventory
+
+
+def invalidate_inventory() -> None:
+	if _inventory is not None:
+		_inventory.invalidate()
@@ -0,0 +1,46 @@
+from __future__ import annotations
+
+import hashlib
+import os
+from pathlib import Path
+
+from continuum_engine.ollama.inventory import get_inventory, model_key
+
+DEFAULT_REGISTRY = "registry.ollama.ai"
+
+
+def models_dirs() -> list[Path]:
+	dirs: list[Path] = []
+	env = os.environ.get("OLLAMA_MODELS")
+	if env:
+		dirs.append(Path(env).expanduser())
+	dirs.append(Path.home() / ".ollama" / "models")
+	dirs.append(Path("/usr/share/ollama/.ollama/models"))
+	return dirs
+
+
+def manifest_relpath(model: str) -> Path:
+	name, tag = model_key(model).rsplit(":", 1)
+	parts = name.split("/")
+	if len(parts) == 1:
+		parts = [DEFAULT_REGISTRY, "library"] + parts
+	elif len(parts) == 2:
+		parts = [DEFAULT_REGISTRY] + parts
+	return Path("manifests", *parts, tag)
+
+
+def manifest_digest(model: str) -> str | None:
+	# Ollama's model digest is the sha256 of its manifest, so reading it needs no daemon round trip.
+	rel = manifest_relpath(model)
+	for base in models_dirs():
+		try:
+			data = (base / rel).read_bytes()
+		except OSError:
+			continue
+		return hashlib.sha256(data).hexdigest()
+	return None
+
+
+def model_digest(model: str) -> str | None:
+	# Always the full sha256 hex: the manifest hash, or the inventory's /api/tags digest (same value).
+	return manifest_digest(model) or get_inventory().digest(model)
@@ -0,0 +1,21 @@
+from __future__ import annotations
+
+from continuum_engine.plan.executor import (
+	DEFAULT_LIMITS,
+	DEFAULT_PLAN_JOBS,
+	NodeResult,
+	PlanNode,
+	execute_plan,
+	report_failure,
+	resolve_plan,
+)
+
+__all__ = [
+	"DEFAULT_LIMITS",
+	"DEFAULT_PLAN_JOBS",
+	"NodeResult",
+	"PlanNode",
+	"execute_plan",
+	"report_failure",
+	"resolve_plan",
+]
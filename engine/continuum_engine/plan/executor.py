@@ -0,0 +1,143 @@
+from __future__ import annotations
+
+import time
+import traceback
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Callable
+
+DEFAULT_PLAN_JOBS = 4
+# Concurrent holders allowed per resource group; unlisted groups are exclusive.
+DEFAULT_LIMITS = {"apt": 1, "ollama": 2}
+
+
+@dataclass
+class PlanNode:
+	id: str
+	run: Callable[[], str | None]
+	dependencies: list[str] = field(default_factory=list)
+	resources: list[str] = field(default_factory=list)
+
+
+@dataclass
+class NodeResult:
+	status: str
+	value: str | None = None
+	error: str | None = None
+	exc: BaseException | None = None
+	seconds: float = 0.0
+
+
+StatusCallback = Callable[[str, str, "NodeResult | None"], None]
+
+
+def resolve_plan(
+	targets: list[str],
+	dependencies: dict[str, list[str]],
+	bundles: dict[str, list[str]] | None = None,
+	kind: str = "plan",
+) -> list[str]:
+	bundles = bundles or {}
+	resolved: list[str] = []
+	visiting: set[str] = set()
+	visited: set[str] = set()
+
+	def visit(t: str) -> None:
+		if t in visited:
+			return
+		if t in visiting:
+			raise RuntimeError(f"Cycle detected in {kind} targets: {t}")
+		visiting.add(t)
+		if t in bundles:
+			for sub in bundles[t]:
+				visit(sub)
+		elif t in dependencies:
+			for dep in dependencies[t]:
+				visit(dep)
+			resolved.append(t)
+		else:
+			raise RuntimeError(f"Unknown {kind} target: {t}")
+		visiting.remove(t)
+		visited.add(t)
+
+	for t in targets:
+		visit(t)
+	return resolved
+
+
+def report_failure(label: str, result: NodeResult | None, debug: bool = False) -> None:
+	print(f"[err] {label}: {result.error if result else 'failed'}")
+	if debug and result is not None and result.exc is not None:
+		print("".join(traceback.format_exception(type(result.exc), result.exc, result.exc.__traceback__)))
+
+
+def _timed(node: PlanNode) -> NodeResult:
+	started = time.monotonic()
+	try:
+		value = node.run()
+		return NodeResult("ok", value=value, seconds=time.monotonic() - started)
+	except Exception as e:
+		return NodeResult("failed", error=str(e), exc=e, seconds=time.monotonic() - started)
+
+
+def execute_plan(
+	nodes: list[PlanNode],
+	jobs: int = DEFAULT_PLAN_JOBS,
+	limits: dict[str, int] | None = None,
+	on_status: StatusCallback | None = None,
+	fail_fast: bool = True,
+) -> dict[str, NodeResult]:
+	by_id = {n.id: n for n in nodes}
+	order = [n.id for n in nodes]
+	limits = {**DEFAULT_LIMITS, **(limits or {})}
+	results: dict[str, NodeResult] = {}
+	in_use: dict[str, int] = {}
+	running: dict[Future, str] = {}
+	stopped = False
+
+	def notify(event: str, nid: str, result: NodeResult | None = None) -> None:
+		if on_status is not None:
+			on_status(event, nid, result)
+
+	def deps(nid: str) -> list[str]:
+		# Dependencies outside the plan (already satisfied) do not gate scheduling.
+		return [d for d in by_id[nid].dependencies if d in by_id]
+
+	def resources_free(nid: str) -> bool:
+		return all(in_use.get(r, 0) < limits.get(r, 1) for r in by_id[nid].resources)
+
+	with ThreadPoolExecutor(max_workers=max(1, jobs)) as pool:
+		while True:
+			for nid in order:
+				if nid in results or nid in running.values():
+					continue
+				blocked = [d for d in deps(nid) if d in results and results[d].status != "ok"]
+				if blocked or stopped:
+					reason = f"dependency {blocked[0]} did not complete" if blocked else "plan stopped after a failure"
+					results[nid] = NodeResult("skipped", error=reason)
+					notify("skipped", nid, results[nid])
+					continue
+				if len(running) >= max(1, jobs):
+					break
+				if not all(d in results for d in deps(nid)) or not resources_free(nid):
+					continue
+				for r in by_id[nid].resources:
+					in_use[r] = in_use.get(r, 0) + 1
+				notify("start", nid)
+				running[pool.submit(_timed, by_id[nid])] = nid
+			if not running:
+				break
+			done, _ = wait(list(running), return_when=FIRST_COMPLETED)
+			for fut in done:
+				nid = running.pop(fut)
+				for r in by_id[nid].resources:
+					in_use[r] -= 1
+				results[nid] = fut.result()
+				notify(results[nid].status, nid, results[nid])
+				if results[nid].status != "ok" and fail_fast:
+					stopped = True
+	for nid in order:
+		if nid not in results:
+			results[nid] = NodeResult("skipped", error="unsatisfiable dependencies")
+			notify("skipped", nid, results[nid])
+	return {nid: results[nid] for nid in order if nid in results}
@@ -0,0 +1,35 @@
+from __future__ import annotations
+
+from continuum_engine.probe.backend import (
+	backend_cache_path,
+	backend_capabilities,
+	check_backend,
+	choose_backend,
+)
+from continuum_engine.probe.env import (
+	ENV_CACHE_VERSION,
+	OPTIONAL_LIBS,
+	PROBE_TIMEOUT,
+	cached_packages,
+	env_cache_path,
+	env_fingerprint,
+	fingerprint_key,
+	probe_packages,
+	run_probe,
+)
+
+__all__ = [
+	"ENV_CACHE_VERSION",
+	"OPTIONAL_LIBS",
+	"PROBE_TIMEOUT",
+	"backend_cache_path",
+	"backend_capabilities",
+	"cached_packages",
+	"check_backend",
+	"choose_backend",
+	"env_cache_path",
+	"env_fingerprint",
+	"fingerprint_key",
+	"probe_packages",
+	"run_probe",
+]
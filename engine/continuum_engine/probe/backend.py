@@ -0,0 +1,92 @@
+from __future__ import annotations
+
+import importlib.util
+import json
+import os
+from datetime import datetime, timezone
+from pathlib import Path
+
+from continuum_engine.probe.env import PROBE_TIMEOUT, TORCH_PROBE, _dist_version, env_fingerprint, fingerprint_key, run_probe
+
+BACKEND_CACHE_VERSION = 1
+
+
+def backend_cache_path(ws: Path) -> Path:
+	return ws / ".continuum" / "state" / "backend.json"
+
+
+def _now_iso() -> str:
+	return datetime.now(timezone.utc).replace(microsecond=0).isoformat()
+
+
+def backend_key() -> str:
+	return fingerprint_key(env_fingerprint())
+
+
+def _installed(mod: str) -> bool:
+	if _dist_version(mod) is not None:
+		return True
+	try:
+		return importlib.util.find_spec(mod) is not None
+	except (ImportError, ValueError):
+		return False
+
+
+def probe_capabilities(timeout: float = PROBE_TIMEOUT) -> dict:
+	caps = {
+		"vllm": _installed("vllm"),
+		"torch": _installed("torch"),
+		"transformers": _installed("transformers"),
+		"cuda_available": False,
+		"error": None,
+	}
+	# Only vllm needs a CUDA answer, so torch is imported (in a child) only when vllm could be picked.
+	if caps["vllm"] and caps["torch"]:
+		out = run_probe(TORCH_PROBE, timeout=timeout)
+		caps["cuda_available"] = bool(out.get("cuda_available"))
+		caps["error"] = out.get("error")
+		if out.get("timed_out"):
+			caps["timed_out"] = True
+	return caps
+
+
+def backend_capabilities(ws: Path, refresh: bool = False, timeout: float = PROBE_TIMEOUT) -> tuple[dict, str]:
+	key = backend_key()
+	path = backend_cache_path(ws)
+	if not refresh:
+		try:
+			data = json.loads(path.read_text(encoding="utf-8"))
+			if data.get("version") == BACKEND_CACHE_VERSION and data.get("key") == key and isinstance(data.get("capabilities"), dict):
+				return data["capabilities"], "cache"
+		except Exception:
+			pass
+	caps = probe_capabilities(timeout=timeout)
+	if not caps.get("timed_out") and path.parent.is_dir():
+		tmp = path.with_name(path.name + ".tmp")
+		tmp.write_text(json.dumps({
+			"version": BACKEND_CACHE_VERSION,
+			"key": key,
+			"probed_at": _now_iso(),
+			"capabilities": caps,
+		}, indent=2), encoding="utf-8")
+		os.replace(tmp, path)
+	return caps, "probe"
+
+
+def choose_backend(caps: dict) -> str:
+	if caps.get("vllm") and caps.get("torch"):
+		return "vllm" if caps.get("cuda_available") else "transformers"
+	if caps.get("transformers"):
+		return "transformers"
+	return "python"
+
+
+def check_backend(backend: str, caps: dict) -> str | None:
+	if backend == "vllm":
+		if not (caps.get("vllm") and caps.get("torch")):
+			return "vllm/torch not installed or unavailable"
+		if not caps.get("cuda_available"):
+			return "torch.cuda.is_available() is false"
+	elif backend == "transformers" and not caps.get("transformers"):
+		return "transformers not installed"
+	return None
@@ -0,0 +1,202 @@
+from __future__ import annotations
+
+import hashlib
+import importlib.util
+import json
+import os
+import site
+import subprocess
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from importlib import metadata
+from pathlib import Path
+
+ENV_CACHE_VERSION = 1
+PROBE_TIMEOUT = 30.0
+OPTIONAL_LIBS = ["xformers", "flash_attn", "triton", "bitsandbytes", "vllm", "transformers"]
+NVIDIA_DRIVER = Path("/proc/driver/nvidia/version")
+
+# Runs in a child interpreter so torch's import time and memory never land in the CLI process.
+TORCH_PROBE = """
+import json
+info = {"installed": False, "version": None, "cuda_version": None, "cudnn_version": None,
+	"cuda_available": False, "device_count": 0, "gpus": [], "error": None}
+try:
+	import torch
+	info["installed"] = True
+	info["version"] = getattr(torch, "__version__", None)
+	info["cuda_version"] = getattr(torch.version, "cuda", None)
+	try:
+		info["cudnn_version"] = torch.backends.cudnn.version()
+	except Exception:
+		pass
+	try:
+		info["cuda_available"] = bool(torch.cuda.is_available())
+		info["device_count"] = int(torch.cuda.device_count())
+		for i in range(info["device_count"]):
+			prop = torch.cuda.get_device_properties(i)
+			info["gpus"].append({
+				"name": getattr(prop, "name", None),
+				"total_memory_bytes": int(getattr(prop, "total_memory", 0)),
+				"capability": f"{prop.major}.{prop.minor}" if hasattr(prop, "major") else None,
+			})
+	except Exception as e:
+		info["error"] = str(e)
+except Exception as e:
+	info["error"] = str(e)
+print(json.dumps(info))
+"""
+
+# Fallback for modules without distribution metadata (e.g. vendored or source-path installs).
+IMPORT_PROBE = """
+import json, sys
+try:
+	m = __import__(sys.argv[1])
+	print(json.dumps({"installed": True, "version": getattr(m, "__version__", None), "error": None}))
+except Exception as e:
+	print(json.dumps({"installed": False, "version": None, "error": str(e)}))
+"""
+
+
+def site_dirs() -> list[str]:
+	dirs = set(site.getsitepackages()) if hasattr(site, "getsitepackages") else set()
+	user = site.getusersitepackages() if hasattr(site, "getusersitepackages") else None
+	if user:
+		dirs.add(user)
+	dirs.update(p for p in sys.path if os.path.basename(p) in ("site-packages", "dist-packages"))
+	return sorted(d for d in dirs if os.path.isdir(d))
+
+
+def nvidia_driver() -> str | None:
+	try:
+		return NVIDIA_DRIVER.read_text(encoding="utf-8").splitlines()[0]
+	except (OSError, IndexError):
+		return None
+
+
+def env_fingerprint() -> dict:
+	# Installing or removing a distribution adds/removes a *.dist-info entry, which bumps the directory mtime.
+	mtimes = {}
+	for d in site_dirs():
+		try:
+			mtimes[d] = os.stat(d).st_mtime_ns
+		except OSError:
+			continue
+	return {
+		"executable": sys.executable,
+		"virtual_env": os.environ.get("VIRTUAL_ENV"),
+		"pythonpath": os.environ.get("PYTHONPATH"),
+		"site_mtimes": mtimes,
+		# CUDA availability and the GPU list also depend on the visible devices and the loaded driver.
+		"cuda_visible_devices": os.environ.get("CUDA_VISIBLE_DEVICES"),
+		"nvidia_driver": nvidia_driver(),
+	}
+
+
+def fingerprint_key(fingerprint: dict) -> str:
+	return hashlib.sha256(json.dumps(fingerprint, sort_keys=True).encode("utf-8")).hexdigest()[:32]
+
+
+def run_probe(code: str, *argv: str, timeout: float = PROBE_TIMEOUT) -> dict:
+	try:
+		proc = subprocess.run(
+			[sys.executable, "-c", code, *argv],
+			stdin=subprocess.DEVNULL,
+			capture_output=True,
+			text=True,
+			timeout=timeout,
+		)
+	except subprocess.TimeoutExpired:
+		return {"error": f"probe timed out after {timeout:.0f}s", "timed_out": True}
+	except OSError as e:
+		return {"error": str(e)}
+	lines = proc.stdout.strip().splitlines()
+	if proc.returncode != 0 or not lines:
+		err = (proc.stderr.strip().splitlines() or [f"probe exited with {proc.returncode}"])[-1]
+		return {"error": err}
+	try:
+		return json.loads(lines[-1])
+	except ValueError:
+		return {"error": f"unreadable probe output: {lines[-1][:200]}"}
+
+
+def _dist_version(name: str) -> str | None:
+	try:
+		return metadata.version(name)
+	except metadata.PackageNotFoundError:
+		return None
+	except Exception:
+		return None
+
+
+def _lib_probe(mod: str, timeout: float) -> dict:
+	version = _dist_version(mod)
+	if version is not None:
+		return {"installed": True, "version": version, "error": None}
+	if importlib.util.find_spec(mod) is None:
+		return {"installed": False, "version": None, "error": f"No module named '{mod}'"}
+	out = run_probe(IMPORT_PROBE, mod, timeout=timeout)
+	info = {"installed": bool(out.get("installed")), "version": out.get("version"), "error": out.get("error")}
+	if out.get("timed_out"):
+		info["timed_out"] = True
+	return info
+
+
+def _no_torch(error: str | None) -> dict:
+	return {"installed": False, "version": None, "cuda_version": None, "cudnn_version": None,
+		"cuda_available": False, "device_count": 0, "gpus": [], "error": error}
+
+
+def _torch_probe(timeout: float) -> dict:
+	# Without torch on the path there is nothing to import; skip starting an interpreter.
+	if _dist_version("torch") is None and importlib.util.find_spec("torch") is None:
+		return _no_torch("No module named 'torch'")
+	out = run_probe(TORCH_PROBE, timeout=timeout)
+	if "installed" not in out:
+		info = _no_torch(out.get("error"))
+		if out.get("timed_out"):
+			info["timed_out"] = True
+		info["version"] = _dist_version("torch")
+		info["installed"] = info["version"] is not None
+		return info
+	return out
+
+
+def probe_packages(timeout: float = PROBE_TIMEOUT) -> dict:
+	with ThreadPoolExecutor(max_workers=len(OPTIONAL_LIBS) + 1, thread_name_prefix="continuum-probe") as pool:
+		torch_fut = pool.submit(_torch_probe, timeout)
+		lib_futs = {mod: pool.submit(_lib_probe, mod, timeout) for mod in OPTIONAL_LIBS}
+		return {
+			"torch": torch_fut.result(),
+			"optional_libs": {mod: fut.result() for mod, fut in lib_futs.items()},
+		}
+
+
+def env_cache_path(ws: Path) -> Path:
+	return ws / ".continuum" / "state" / "env.json"
+
+
+def load_cached_probe(ws: Path, key: str) -> dict | None:
+	try:
+		data = json.loads(env_cache_path(ws).read_text(encoding="utf-8"))
+	except Exception:
+		return None
+	probe = data.get("probe") if isinstance(data, dict) else None
+	if not isinstance(probe, dict) or probe.get("version") != ENV_CACHE_VERSION or probe.get("key") != key:
+		return None
+	if not isinstance(data.get("torch"), dict) or not isinstance(data.get("optional_libs"), dict):
+		return None
+	return {"torch": data["torch"], "optional_libs": data["optional_libs"]}
+
+
+def cached_packages(ws: Path | None, refresh: bool = False, timeout: float = PROBE_TIMEOUT) -> tuple[dict, dict]:
+	fingerprint = env_fingerprint()
+	key = fingerprint_key(fingerprint)
+	if ws is not None and not refresh:
+		cached = load_cached_probe(ws, key)
+		if cached is not None:
+			return cached, {"version": ENV_CACHE_VERSION, "key": key, "source": "cache", "fingerprint": fingerprint}
+	packages = probe_packages(timeout=timeout)
+	# A timed-out probe says nothing about the environment; do not let it be cached.
+	complete = not packages["torch"].get("timed_out") and not any(lib.get("timed_out") for lib in packages["optional_libs"].values())
+	return packages, {"version": ENV_CACHE_VERSION, "key": key if complete else None, "source": "probe", "fingerprint": fingerprint}
@@ -1,18 +1,27 @@
 from __future__ import annotations
 
 import json
-import shutil
+import random
+import re
 import subprocess
-import traceback
-from dataclasses import dataclass
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
 from datetime import datetime, timezone
 from pathlib import Path
 from typing import Callable
 
+from continuum_engine.ollama import get_inventory, invalidate_inventory, model_key
+from continuum_engine.plan import NodeResult, PlanNode, execute_plan, report_failure, resolve_plan
+
 DATA_MODELS = [
 	"goekdenizguelmez/JOSIEFIED-Qwen3",
 	"phi3:mini",
 ]
+DEFAULT_PULL_JOBS = 3
+DEFAULT_PULL_RETRIES = 2
+PROGRESS_RE = re.compile(r"(\d{1,3})%")
 
 
 @dataclass
@@ -23,6 +32,7 @@ class Puller:
 	check: Callable[["PullContext"], bool]
 	pull: Callable[["PullContext"], None]
 	verify: Callable[["PullContext"], None]
+	resources: list[str] = field(default_factory=list)
 
 
 @dataclass
@@ -31,21 +41,14 @@ class PullContext:
 	dry_run: bool
 	debug: bool
 	yes: bool
+	jobs: int = DEFAULT_PULL_JOBS
+	retries: int = DEFAULT_PULL_RETRIES
 
 
 def _now_iso() -> str:
 	return datetime.now(timezone.utc).replace(microsecond=0).isoformat()
 
 
-def _run(cmd: list[str], ctx: PullContext, mutate: bool = False) -> subprocess.CompletedProcess:
-	if mutate and ctx.dry_run:
-		print(f"[dry-run] {' '.join(cmd)}")
-		return subprocess.CompletedProcess(cmd, 0)
-	if ctx.debug:
-		return subprocess.run(cmd)
-	return subprocess.run(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
-
-
 def _ensure_state_dir(ws: Path) -> Path:
 	state_dir = ws / ".continuum" / "state"
 	state_dir.mkdir(parents=True, exist_ok=True)
@@ -76,30 +79,88 @@ def _state_update(state: dict, pid: str, result: str, err: str | None) -> None:
 	}
 
 
-def _cmd_exists(cmd: str) -> bool:
-	return shutil.which(cmd) is not None
+def _ollama_list(ctx: PullContext) -> tuple[bool, set[str], str | None]:
+	return get_inventory().list_models()
 
 
-def _ollama_list(ctx: PullContext) -> tuple[bool, set[str], str | None]:
-	if not _cmd_exists("ollama"):
-		return False, set(), "ollama not installed. Run: continuum install ollama"
-	result = _run(["ollama", "list"], ctx, mutate=False)
-	if result.returncode != 0:
-		err = ""
-		if isinstance(result.stderr, str):
-			err = result.stderr.strip()
-		return False, set(), err or "ollama list failed"
-	output = ""
-	if isinstance(result.stdout, str):
-		output = result.stdout
-	models: set[str] = set()
-	for line in output.splitlines():
-		if not line.strip() or line.lower().startswith("name"):
-			continue
-		parts = line.split()
-		if parts:
-			models.add(parts[0])
-	return True, models, None
+def _missing_models(models: set[str]) -> list[str]:
+	return [m for m in DATA_MODELS if model_key(m) not in models]
+
+
+_print_lock = threading.Lock()
+
+
+def _say(msg: str) -> None:
+	with _print_lock:
+		print(msg, flush=True)
+
+
+def _pull_stream(model: str, ctx: PullContext) -> tuple[int, str]:
+	proc = subprocess.Popen(["ollama", "pull", model], stdout=subprocess.PIPE, stderr=subprocess.STDOUT, bufsize=0)
+	last_status = None
+	last_pct = -1
+	tail = ""
+	buf = b""
+	while True:
+		chunk = proc.stdout.read(4096)
+		if not chunk:
+			break
+		buf += chunk
+		# ollama redraws its progress bar with \r, so treat both \r and \n as line ends.
+		parts = re.split(rb"[\r\n]", buf)
+		buf = parts.pop()
+		for raw in parts:
+			line = re.sub(r"\x1b\[[0-9;?]*[A-Za-z]", "", raw.decode("utf-8", errors="replace")).strip()
+			if not line:
+				continue
+			tail = line
+			if ctx.debug:
+				_say(f"[pull] {model}: {line}")
+				continue
+			m = PROGRESS_RE.search(line)
+			status = line[:m.start()].strip() if m else line
+			pct = int(m.group(1)) if m else -1
+			if status != last_status:
+				last_pct = -1
+			# Throttle redraws to one line per 10% step (plus 100%) for each layer.
+			if status != last_status or pct >= last_pct + 10 or (pct == 100 and last_pct != 100):
+				_say(f"[pull] {model}: {status} {pct}%" if m else f"[pull] {model}: {line}")
+				last_status = status
+				last_pct = pct
+	proc.stdout.close()
+	return proc.wait(), tail
+
+
+def _pull_with_retry(model: str, ctx: PullContext) -> str | None:
+	attempts = max(ctx.retries, 0) + 1
+	err = None
+	for attempt in range(1, attempts + 1):
+		started = time.monotonic()
+		try:
+			rc, tail = _pull_stream(model, ctx)
+		except Exception as e:
+			rc, tail = 1, str(e)
+		if rc == 0:
+			_say(f"[ok] {model} pulled in {time.monotonic() - started:.1f}s")
+			return None
+		err = tail or f"exit {rc}"
+		if attempt < attempts:
+			# ollama keeps partial blobs, so a retry resumes the download.
+			delay = min(2 ** attempt, 30) + random.uniform(0, 1)
+			_say(f"[warn] {model}: pull failed ({err}); retry {attempt}/{attempts - 1} in {delay:.1f}s")
+			time.sleep(delay)
+	return err
+
+
+def _pull_models(models: list[str], ctx: PullContext) -> dict[str, str]:
+	if ctx.dry_run:
+		for m in models:
+			print(f"[dry-run] ollama pull {m}")
+		return {}
+	jobs = max(1, min(ctx.jobs, len(models)))
+	with ThreadPoolExecutor(max_workers=jobs) as pool:
+		results = dict(zip(models, pool.map(lambda m: _pull_with_retry(m, ctx), models)))
+	return {m: err for m, err in results.items() if err is not None}
 
 
 def get_pullers() -> dict[str, Puller]:
@@ -107,23 +168,24 @@ def get_pullers() -> dict[str, Puller]:
 		ok, models, _ = _ollama_list(ctx)
 		if not ok:
 			return False
-		return all(m in models for m in DATA_MODELS)
+		return not _missing_models(models)
 
 	def data_models_pull(ctx: PullContext) -> None:
 		ok, models, err = _ollama_list(ctx)
 		if not ok:
 			raise RuntimeError(err or "ollama list failed")
-		missing = [m for m in DATA_MODELS if m not in models]
-		for m in missing:
-			res = _run(["ollama", "pull", m], ctx, mutate=True)
-			if res.returncode != 0 and not ctx.dry_run:
-				raise RuntimeError(f"ollama pull failed: {m}")
+		missing = _missing_models(models)
+		failed = _pull_models(missing, ctx)
+		if missing and not ctx.dry_run:
+			invalidate_inventory()
+		if failed:
+			raise RuntimeError("ollama pull failed: " + "; ".join(f"{m} ({err})" for m, err in failed.items()))
 
 	def data_models_verify(ctx: PullContext) -> None:
 		ok, models, err = _ollama_list(ctx)
 		if not ok:
 			raise RuntimeError(err or "ollama list failed")
-		missing = [m for m in DATA_MODELS if m not in models]
+		missing = _missing_models(models)
 		if missing:
 			raise RuntimeError(f"missing models: {', '.join(missing)}")
 
@@ -135,6 +197,7 @@ def get_pullers() -> dict[str, Puller]:
 			check=data_models_check,
 			pull=data_models_pull,
 			verify=data_models_verify,
+			resources=["ollama"],
 		),
 	}
 
@@ -146,34 +209,9 @@ def list_targets() -> None:
 		print(f"  {pid}: {p.description}")
 
 
-def _resolve_targets(targets: list[str], pullers: dict[str, Puller]) -> list[str]:
-	resolved: list[str] = []
-	visiting: set[str] = set()
-	visited: set[str] = set()
-
-	def visit(t: str) -> None:
-		if t in visited:
-			return
-		if t in visiting:
-			raise RuntimeError(f"Cycle detected in pull targets: {t}")
-		visiting.add(t)
-		if t in pullers:
-			for dep in pullers[t].dependencies:
-				visit(dep)
-			resolved.append(t)
-		else:
-			raise RuntimeError(f"Unknown pull target: {t}")
-		visiting.remove(t)
-		visited.add(t)
-
-	for t in targets:
-		visit(t)
-	return resolved
-
-
 def pull_target(target: str, ctx: PullContext) -> int:
 	pullers = get_pullers()
-	to_pull = _resolve_targets([target], pullers)
+	to_pull = resolve_plan([target], {pid: p.dependencies for pid, p in pullers.items()}, kind="pull")
 	print(f"Will pull: {', '.join(to_pull)}")
 	if not ctx.yes and not ctx.dry_run:
 		resp = input(f"Proceed with pull of {', '.join(to_pull)}? [y/N]: ").strip().lower()
@@ -181,29 +219,47 @@ def pull_target(target: str, ctx: PullContext) -> int:
 			print("Aborted.")
 			return 1
 	state = _load_state(ctx.workspace)
+	nodes: list[PlanNode] = []
 	for pid in to_pull:
 		p = pullers[pid]
 		try:
-			if p.check(ctx):
-				print(f"[ok] {pid} already present")
-				_state_update(state, pid, "already_present", None)
-			else:
-				print(f"[run] pulling {pid}...")
-				p.pull(ctx)
-				p.verify(ctx)
-				print(f"[ok] pulled {pid}")
-				_state_update(state, pid, "success", None)
+			present = p.check(ctx)
 		except Exception as e:
-			print(f"[err] {pid}: {e}")
-			if ctx.debug:
-				print(traceback.format_exc())
+			report_failure(pid, NodeResult("failed", error=str(e), exc=e), ctx.debug)
 			_state_update(state, pid, "failed", str(e))
 			if not ctx.dry_run:
 				_save_state(ctx.workspace, state)
 			return 1
+		if present:
+			print(f"[ok] {pid} already present")
+			_state_update(state, pid, "already_present", None)
+		else:
+			nodes.append(PlanNode(id=pid, run=lambda p=p: _pull_one(p, ctx), dependencies=p.dependencies, resources=p.resources))
+
+	def on_status(event: str, pid: str, result: NodeResult | None) -> None:
+		if event == "start":
+			print(f"[run] pulling {pid}...")
+		elif event == "ok":
+			print(f"[ok] pulled {pid}")
+		elif event == "failed":
+			report_failure(pid, result, ctx.debug)
+		elif event == "skipped":
+			print(f"[warn] {pid} skipped: {result.error}")
+
+	results = execute_plan(nodes, jobs=ctx.jobs, on_status=on_status)
+	for pid, res in results.items():
+		if res.status == "ok":
+			_state_update(state, pid, "success", None)
+		elif res.status == "failed":
+			_state_update(state, pid, "failed", res.error)
 	if not ctx.dry_run:
 		_save_state(ctx.workspace, state)
-	return 0
+	return 0 if all(r.status == "ok" for r in results.values()) else 1
+
+
+def _pull_one(p: Puller, ctx: PullContext) -> None:
+	p.pull(ctx)
+	p.verify(ctx)
 
 
 def run_doctor(ctx: PullContext, json_output: bool = False) -> int:
@@ -230,7 +286,7 @@ def run_doctor(ctx: PullContext, json_output: bool = False) -> int:
 		if pid == "data_models":
 			ok, models, err = _ollama_list(ctx)
 			if ok:
-				missing = [m for m in DATA_MODELS if m not in models]
+				missing = _missing_models(models)
 				if missing:
 					details["missing_models"] = missing
 			else:
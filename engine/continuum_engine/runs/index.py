@@ -0,0 +1,148 @@
+from __future__ import annotations
+
+import sqlite3
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable, Iterator
+
+FIELDS = [
+	"run_id",
+	"status",
+	"command",
+	"started_at",
+	"finished_at",
+	"workspace",
+	"stdout_path",
+	"stderr_path",
+	"error",
+]
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+	run_id TEXT PRIMARY KEY,
+	status TEXT,
+	command TEXT,
+	started_at TEXT,
+	finished_at TEXT,
+	workspace TEXT,
+	stdout_path TEXT,
+	stderr_path TEXT,
+	error TEXT
+);
+CREATE INDEX IF NOT EXISTS runs_status ON runs (status, run_id);
+CREATE INDEX IF NOT EXISTS runs_started_at ON runs (started_at);
+"""
+
+
+def index_path(ws: Path) -> Path:
+	return ws / ".continuum" / "state" / "runs.db"
+
+
+def index_exists(ws: Path) -> bool:
+	return index_path(ws).exists()
+
+
+def open_index(ws: Path) -> sqlite3.Connection:
+	path = index_path(ws)
+	path.parent.mkdir(parents=True, exist_ok=True)
+	conn = sqlite3.connect(str(path), timeout=30)
+	conn.row_factory = sqlite3.Row
+	conn.execute("PRAGMA journal_mode=WAL")
+	conn.execute("PRAGMA synchronous=NORMAL")
+	conn.executescript(_SCHEMA)
+	return conn
+
+
+def _row(entry: dict) -> tuple:
+	return tuple(entry.get(f) for f in FIELDS)
+
+
+def _upsert_sql() -> str:
+	placeholders = ", ".join("?" for _ in FIELDS)
+	return f"INSERT OR REPLACE INTO runs ({', '.join(FIELDS)}) VALUES ({placeholders})"
+
+
+def upsert_runs(ws: Path, entries: list[dict]) -> None:
+	conn = open_index(ws)
+	try:
+		with conn:
+			conn.executemany(_upsert_sql(), [_row(e) for e in entries])
+	finally:
+		conn.close()
+
+
+def rebuild_runs(ws: Path, load_entries: Callable[[], list[dict]]) -> int:
+	# Run directories are read while holding the write lock. create_run/finish_run write run.json
+	# before they upsert, so an upsert committed earlier is already visible on disk, and a later one
+	# lands after this transaction instead of being overwritten by a stale or half-written row.
+	conn = open_index(ws)
+	conn.isolation_level = None
+	try:
+		conn.execute("BEGIN IMMEDIATE")
+		try:
+			entries = load_entries()
+			conn.execute("CREATE TEMP TABLE IF NOT EXISTS present (run_id TEXT PRIMARY KEY)")
+			conn.execute("DELETE FROM present")
+			conn.executemany("INSERT OR IGNORE INTO present (run_id) VALUES (?)", [(e.get("run_id"),) for e in entries])
+			conn.execute("DELETE FROM runs WHERE run_id NOT IN (SELECT run_id FROM present)")
+			conn.executemany(_upsert_sql(), [_row(e) for e in entries])
+			conn.execute("COMMIT")
+		except BaseException:
+			conn.execute("ROLLBACK")
+			raise
+		return len(entries)
+	finally:
+		conn.close()
+
+
+def normalize_since(value: str) -> str:
+	# started_at is stored as UTC "YYYY-MM-DDTHH:MM:SSZ" and compared as a string, so the bound must be in
+	# exactly that form; "2025-01-02 10:00" would otherwise sort after every "2025-01-02T..." value.
+	try:
+		parsed = datetime.fromisoformat(value.strip().replace("Z", "+00:00"))
+	except ValueError:
+		raise ValueError(f"invalid --since value {value!r}; expected an ISO date or date/time, e.g. 2025-01-02 or 2025-01-02T10:00") from None
+	if parsed.tzinfo is not None:
+		parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+	return parsed.replace(microsecond=0).isoformat() + "Z"
+
+
+def _select_sql(limit: int | None, status: str | None, since: str | None) -> tuple[str, list]:
+	clauses = []
+	params: list = []
+	if status:
+		clauses.append("status = ?")
+		params.append(status)
+	if since:
+		clauses.append("started_at >= ?")
+		params.append(normalize_since(since))
+	sql = f"SELECT {', '.join(FIELDS)} FROM runs"
+	if clauses:
+		sql += " WHERE " + " AND ".join(clauses)
+	sql += " ORDER BY run_id DESC"
+	if limit is not None:
+		sql += " LIMIT ?"
+		params.append(max(int(limit), 0))
+	return sql, params
+
+
+def select_runs(ws: Path, limit: int | None = None, status: str | None = None, since: str | None = None) -> list[dict]:
+	return list(iter_select_runs(ws, limit=limit, status=status, since=since))
+
+
+def iter_select_runs(ws: Path, limit: int | None = None, status: str | None = None, since: str | None = None) -> Iterator[dict]:
+	sql, params = _select_sql(limit, status, since)
+	conn = open_index(ws)
+	try:
+		for r in conn.execute(sql, params):
+			yield dict(r)
+	finally:
+		conn.close()
+
+
+def count_runs(ws: Path) -> int:
+	conn = open_index(ws)
+	try:
+		return int(conn.execute("SELECT COUNT(*) FROM runs").fetchone()[0])
+	finally:
+		conn.close()
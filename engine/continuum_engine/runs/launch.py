@@ -0,0 +1,92 @@
+from __future__ import annotations
+
+import argparse
+import subprocess
+import traceback
+from dataclasses import dataclass
+from pathlib import Path
+
+from continuum_engine.runs.logs import DEFAULT_BACKUPS, DEFAULT_MAX_BYTES, resolve_compress, run_captured
+from continuum_engine.runs.manager import create_run, finish_run
+from continuum_engine.runs.telemetry import DEFAULT_INTERVAL, TelemetrySampler, telemetry_path
+
+
+@dataclass
+class LogOptions:
+	max_bytes: int = DEFAULT_MAX_BYTES
+	backups: int = DEFAULT_BACKUPS
+	compress: str | None = None
+	telemetry_interval: float = DEFAULT_INTERVAL
+
+
+def log_options_from_args(args: argparse.Namespace) -> LogOptions:
+	max_mb = getattr(args, "log_max_mb", None)
+	backups = getattr(args, "log_backups", None)
+	interval = getattr(args, "telemetry_interval", None)
+	return LogOptions(
+		max_bytes=int(max_mb * 1024 * 1024) if max_mb is not None else DEFAULT_MAX_BYTES,
+		backups=backups if backups is not None else DEFAULT_BACKUPS,
+		compress=resolve_compress(getattr(args, "log_compress", None)),
+		telemetry_interval=interval if interval is not None else DEFAULT_INTERVAL,
+	)
+
+
+def launch(
+	ws: Path,
+	command: str,
+	cmd: list[str],
+	log_opts: LogOptions | None = None,
+	env: dict | None = None,
+	cwd: str | Path | None = None,
+	debug: bool = False,
+	echo: bool = True,
+) -> int:
+	log_opts = log_opts or LogOptions()
+	run = None
+	try:
+		run = create_run(ws, command=command)
+	except Exception as e:
+		print(f"[warn] Run logging failed: {e}")
+	samplers: list[TelemetrySampler] = []
+
+	def start_telemetry(proc: subprocess.Popen) -> None:
+		if run is None or log_opts.telemetry_interval <= 0:
+			return
+		sampler = TelemetrySampler(proc.pid, telemetry_path(run.run_dir), interval=log_opts.telemetry_interval)
+		sampler.start()
+		samplers.append(sampler)
+
+	try:
+		if run is None:
+			returncode = subprocess.run(cmd, env=env, cwd=cwd).returncode
+		else:
+			try:
+				returncode = run_captured(
+					cmd,
+					run.stdout_path,
+					run.stderr_path,
+					max_bytes=log_opts.max_bytes,
+					backups=log_opts.backups,
+					compress=log_opts.compress,
+					env=env,
+					cwd=cwd,
+					echo=echo,
+					on_start=start_telemetry,
+				)
+			finally:
+				for sampler in samplers:
+					sampler.stop()
+	except KeyboardInterrupt:
+		if run is not None:
+			finish_run(run, "failed")
+		return 130
+	except Exception as e:
+		if run is not None:
+			finish_run(run, "failed")
+		if debug:
+			print(traceback.format_exc())
+		print(f"[err] {e}")
+		return 1
+	if run is not None:
+		finish_run(run, "success" if returncode == 0 else "failed")
+	return returncode
@@ -0,0 +1,361 @@
+from __future__ import annotations
+
+import gzip
+import io
+import itertools
+import os
+import queue
+import shutil
+import subprocess
+import sys
+import threading
+import time
+from pathlib import Path
+from collections import deque
+from typing import BinaryIO, Callable, Iterator
+
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+DEFAULT_BACKUPS = 5
+COMPRESS_CHOICES = ["none", "gzip", "zstd"]
+READ_CHUNK = 64 * 1024
+
+
+def _zstd():
+	try:
+		import zstandard  # type: ignore
+		return zstandard
+	except Exception:
+		return None
+
+
+def resolve_compress(compress: str | None) -> str | None:
+	if not compress or compress == "none":
+		return None
+	if compress == "zstd" and _zstd() is None:
+		# stdout is also the tee target for the child's output; keep our warnings out of it.
+		print("[warn] zstandard not installed, falling back to gzip for rotated logs.", file=sys.stderr)
+		return "gzip"
+	return compress
+
+
+def _suffix(compress: str | None) -> str:
+	return {"gzip": ".gz", "zstd": ".zst"}.get(compress or "", "")
+
+
+def _segment_path(path: Path, i: int, compress: str | None) -> Path:
+	return path.with_name(f"{path.name}.{i}{_suffix(compress)}")
+
+
+class RotatingLog:
+	def __init__(self, path: Path, max_bytes: int = DEFAULT_MAX_BYTES, backups: int = DEFAULT_BACKUPS, compress: str | None = None):
+		self.path = Path(path)
+		self.max_bytes = max(int(max_bytes), 0)
+		self.backups = max(int(backups), 0)
+		self.compress = compress
+		self._lock = threading.Lock()
+		self._fh: BinaryIO = open(self.path, "ab")
+		self._size = self._fh.tell()
+		self._pending: queue.Queue[Path | None] = queue.Queue()
+		self._seq = itertools.count(1)
+		self._compressor: threading.Thread | None = None
+
+	def write(self, data: bytes) -> None:
+		with self._lock:
+			self._fh.write(data)
+			self._fh.flush()
+			self._size += len(data)
+			if self.max_bytes and self._size >= self.max_bytes:
+				self._rotate()
+
+	def close(self) -> None:
+		with self._lock:
+			self._fh.close()
+		# Let queued segments finish compressing so the run's logs are complete once the launcher returns.
+		if self._compressor is not None:
+			self._pending.put(None)
+			self._compressor.join()
+			self._compressor = None
+
+	def _segment(self, i: int) -> Path:
+		return _segment_path(self.path, i, self.compress)
+
+	def _shift(self) -> None:
+		oldest = self._segment(self.backups)
+		if oldest.exists():
+			oldest.unlink()
+		for i in range(self.backups - 1, 0, -1):
+			src = self._segment(i)
+			if src.exists():
+				os.replace(src, self._segment(i + 1))
+
+	def _rotate(self) -> None:
+		self._fh.close()
+		if not self.backups:
+			self.path.unlink()
+		elif self.compress:
+			# Compressing 64 MB inline would stall the pump thread (and the child, on a full pipe);
+			# park the segment under a pending name and let the compressor thread shift and compress it.
+			pending = self.path.with_name(f"{self.path.name}.{next(self._seq)}.pending")
+			os.replace(self.path, pending)
+			if self._compressor is None:
+				self._compressor = threading.Thread(target=self._compress_loop, name="continuum-log-compress", daemon=True)
+				self._compressor.start()
+			self._pending.put(pending)
+		else:
+			self._shift()
+			os.replace(self.path, self._segment(1))
+		self._fh = open(self.path, "ab")
+		self._size = 0
+
+	def _compress_loop(self) -> None:
+		while True:
+			pending = self._pending.get()
+			if pending is None:
+				return
+			try:
+				self._shift()
+				_compress_file(pending, self._segment(1), self.compress)
+			except OSError as e:
+				print(f"[warn] Log rotation failed for {pending}: {e}", file=sys.stderr)
+
+
+def _compress_file(src: Path, dst: Path, compress: str) -> None:
+	tmp = dst.with_name(dst.name + ".tmp")
+	with open(src, "rb") as fin, open(tmp, "wb") as fout:
+		if compress == "zstd" and _zstd() is not None:
+			_zstd().ZstdCompressor(level=3).copy_stream(fin, fout)
+		else:
+			with gzip.GzipFile(fileobj=fout, mode="wb", compresslevel=1) as gz:
+				shutil.copyfileobj(fin, gz, READ_CHUNK)
+	os.replace(tmp, dst)
+	src.unlink()
+
+
+def _pump(src: BinaryIO, sinks: list[Callable[[bytes], None]]) -> None:
+	fd = src.fileno()
+	while True:
+		try:
+			chunk = os.read(fd, READ_CHUNK)
+		except OSError:
+			break
+		if not chunk:
+			break
+		for sink in sinks:
+			try:
+				sink(chunk)
+			except Exception:
+				pass
+	src.close()
+
+
+def _terminal_sink(stream) -> Callable[[bytes], None]:
+	buf = getattr(stream, "buffer", None)
+
+	def write(data: bytes) -> None:
+		if buf is not None:
+			buf.write(data)
+			buf.flush()
+		else:
+			stream.write(data.decode("utf-8", errors="replace"))
+			stream.flush()
+
+	return write
+
+
+def run_captured(
+	cmd: list[str],
+	stdout_path: Path,
+	stderr_path: Path,
+	max_bytes: int = DEFAULT_MAX_BYTES,
+	backups: int = DEFAULT_BACKUPS,
+	compress: str | None = None,
+	env: dict | None = None,
+	cwd: str | Path | None = None,
+	echo: bool = True,
+	on_start: Callable[[subprocess.Popen], None] | None = None,
+) -> int:
+	child_env = dict(os.environ if env is None else env)
+	child_env.setdefault("PYTHONUNBUFFERED", "1")
+	out_log = RotatingLog(stdout_path, max_bytes=max_bytes, backups=backups, compress=compress)
+	err_log = RotatingLog(stderr_path, max_bytes=max_bytes, backups=backups, compress=compress)
+	try:
+		proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, stdin=None, env=child_env, cwd=cwd, bufsize=0)
+		if on_start is not None:
+			on_start(proc)
+		out_sinks = [out_log.write] + ([_terminal_sink(sys.stdout)] if echo else [])
+		err_sinks = [err_log.write] + ([_terminal_sink(sys.stderr)] if echo else [])
+		readers = [
+			threading.Thread(target=_pump, args=(proc.stdout, out_sinks), daemon=True),
+			threading.Thread(target=_pump, args=(proc.stderr, err_sinks), daemon=True),
+		]
+		for t in readers:
+			t.start()
+		try:
+			returncode = proc.wait()
+		except KeyboardInterrupt:
+			# The child shares our process group and received SIGINT too; let it wind down.
+			try:
+				proc.wait(timeout=10)
+			except Exception:
+				proc.kill()
+			raise
+		finally:
+			for t in readers:
+				t.join(timeout=5)
+		return returncode
+	finally:
+		out_log.close()
+		err_log.close()
+
+
+def log_segments(path: Path) -> list[Path]:
+	# Newest first: the live file, segments still waiting for compression, then .1, .2, ...
+	segments = [path] if path.exists() else []
+	pending = []
+	for p in path.parent.glob(f"{path.name}.*.pending"):
+		seq = p.name[len(path.name) + 1:-len(".pending")]
+		if seq.isdigit():
+			pending.append((int(seq), p))
+	segments.extend(p for _, p in sorted(pending, reverse=True))
+	for i in itertools.count(1):
+		found = next((p for p in (_segment_path(path, i, c) for c in (None, "gzip", "zstd")) if p.exists()), None)
+		if found is None:
+			break
+		segments.append(found)
+	return segments
+
+
+def _open_segment(path: Path) -> BinaryIO:
+	if path.suffix == ".gz":
+		return gzip.open(path, "rb")
+	if path.suffix == ".zst":
+		zstd = _zstd()
+		if zstd is None:
+			raise OSError(f"zstandard not installed, cannot read {path}")
+		return io.BufferedReader(zstd.ZstdDecompressor().stream_reader(open(path, "rb"), closefd=True))
+	return open(path, "rb")
+
+
+def _tail_file(f: BinaryIO, end: int, n: int, block_size: int) -> bytes:
+	pos = end
+	data = b""
+	while pos > 0 and data.count(b"\n") <= n:
+		step = min(block_size, pos)
+		pos -= step
+		f.seek(pos)
+		data = f.read(step) + data
+	return data
+
+
+def _tail_bytes(path: Path, n: int, block_size: int) -> bytes:
+	if path.suffix in (".gz", ".zst"):
+		# Compressed segments can't be read backwards; stream them and keep the last lines.
+		with _open_segment(path) as f:
+			return b"".join(deque(f, maxlen=n + 1))
+	with open(path, "rb") as f:
+		return _tail_file(f, f.seek(0, os.SEEK_END), n, block_size)
+
+
+def tail_with_position(path: Path, n: int, block_size: int = 8192) -> tuple[list[str], tuple[int | None, int]]:
+	# Also returns (inode, offset) of the live file where the tail ends, so follow() can pick up from
+	# exactly there instead of skipping whatever was written in between.
+	position: tuple[int | None, int] = (None, 0)
+	data = b""
+	# Rotation cuts at write boundaries, not lines, so segments are joined as bytes before splitting.
+	for segment in log_segments(path):
+		try:
+			if segment == path:
+				with open(path, "rb") as f:
+					st = os.fstat(f.fileno())
+					position = (st.st_ino, st.st_size)
+					chunk = _tail_file(f, st.st_size, n, block_size) if n > 0 else b""
+			else:
+				chunk = _tail_bytes(segment, n, block_size)
+		except OSError:
+			break
+		data = chunk + data
+		if n <= 0 or data.count(b"\n") > n:
+			break
+	if n <= 0:
+		return [], position
+	lines = data.decode("utf-8", errors="replace").splitlines()
+	return lines[-n:], position
+
+
+def tail_lines(path: Path, n: int, block_size: int = 8192) -> list[str]:
+	if n <= 0:
+		return []
+	return tail_with_position(path, n, block_size)[0]
+
+
+def _uncompressed_segment(path: Path, ino: int) -> Path | None:
+	# A rotated segment keeps its inode until it is compressed.
+	for segment in log_segments(path)[1:]:
+		if segment.suffix in (".gz", ".zst"):
+			continue
+		try:
+			if os.stat(segment).st_ino == ino:
+				return segment
+		except OSError:
+			continue
+	return None
+
+
+def follow(
+	path: Path,
+	should_stop: Callable[[], bool],
+	poll: float = 0.5,
+	start: tuple[int | None, int] | None = None,
+) -> Iterator[str]:
+	# Without `start`, only lines written after the first open are yielded. With the (inode, offset) from
+	# tail_with_position(), reading resumes where the tail ended, even if the log rotated in between.
+	fh = None
+	ino, pos = start if start is not None else (None, 0)
+	pending = b""
+	try:
+		while True:
+			try:
+				st = os.stat(path)
+			except FileNotFoundError:
+				st = None
+			if st is not None and (fh is None or st.st_ino != ino or st.st_size < pos):
+				resume = False
+				if fh is not None:
+					if st.st_ino != ino:
+						# Rotated: the old descriptor still reads the renamed segment, so drain what's left of it.
+						pending += fh.read()
+					fh.close()
+				elif start is not None and ino is not None:
+					if st.st_ino == ino:
+						resume = st.st_size >= pos
+					else:
+						old = _uncompressed_segment(path, ino)
+						if old is not None:
+							with open(old, "rb") as f:
+								f.seek(pos)
+								pending += f.read()
+				fh = open(path, "rb")
+				if resume:
+					fh.seek(pos)
+				elif start is None and ino is None:
+					fh.seek(0, os.SEEK_END)
+				ino = os.fstat(fh.fileno()).st_ino
+				pos = fh.tell()
+			data = fh.read() if fh is not None else b""
+			if data:
+				pos += len(data)
+				pending += data
+			if b"\n" in pending:
+				*lines, pending = pending.split(b"\n")
+				for line in lines:
+					yield line.decode("utf-8", errors="replace")
+			if data:
+				continue
+			if should_stop():
+				if pending:
+					yield pending.decode("utf-8", errors="replace")
+				return
+			time.sleep(poll)
+	finally:
+		if fh is not None:
+			fh.close()
@@ -1,9 +1,19 @@
 from __future__ import annotations
 
 import json
+import os
+import sys
 from dataclasses import dataclass
 from datetime import datetime
 from pathlib import Path
+from typing import Iterator
+
+from continuum_engine.runs import index as run_index
+
+try:
+	import fcntl
+except ImportError:
+	fcntl = None
 
 def _now_iso() -> str:
 	return datetime.utcnow().replace(microsecond=0).isoformat() + "Z"
@@ -16,17 +26,47 @@ class Run:
 	stdout_path: Path
 	stderr_path: Path
 
+def _read_counter(path: Path) -> dict:
+	try:
+		data = json.loads(path.read_text(encoding="utf-8"))
+	except Exception:
+		return {}
+	return data if isinstance(data, dict) else {}
+
+def _allocate_run_dir(workspace: Path, runs_root: Path) -> tuple[str, Path]:
+	# A per-day counter under an exclusive lock makes allocation O(1); mkdir(exist_ok=False)
+	# stays the source of truth, so a lost or stale counter only costs a few retries.
+	state_dir = workspace / ".continuum" / "state"
+	state_dir.mkdir(parents=True, exist_ok=True)
+	counter_path = state_dir / "run_counter.json"
+	today = datetime.utcnow().strftime("%Y-%m-%d")
+	with open(state_dir / "run_counter.lock", "a+") as lock:
+		if fcntl is not None:
+			fcntl.flock(lock.fileno(), fcntl.LOCK_EX)
+		try:
+			counter = _read_counter(counter_path)
+			n = int(counter.get("last", 0)) + 1 if counter.get("date") == today else 1
+			while True:
+				run_id = f"run_{today}_{n:03d}"
+				run_dir = runs_root / run_id
+				try:
+					run_dir.mkdir(parents=False, exist_ok=False)
+					break
+				except FileExistsError:
+					n += 1
+			tmp = counter_path.with_name(f"{counter_path.name}.{os.getpid()}.tmp")
+			tmp.write_text(json.dumps({"date": today, "last": n}), encoding="utf-8")
+			os.replace(tmp, counter_path)
+		finally:
+			if fcntl is not None:
+				fcntl.flock(lock.fileno(), fcntl.LOCK_UN)
+	return run_id, run_dir
+
 def create_run(workspace: Path, command: str) -> Run:
 	runs_root = workspace / ".continuum" / "runs"
 	runs_root.mkdir(parents=True, exist_ok=True)
 
-	today = datetime.utcnow().strftime("%Y-%m-%d")
-	existing = sorted([p for p in runs_root.glob(f"run_{today}_*") if p.is_dir()])
-	n = len(existing) + 1
-	run_id = f"run_{today}_{n:03d}"
-
-	run_dir = runs_root / run_id
-	run_dir.mkdir(parents=True, exist_ok=False)
+	run_id, run_dir = _allocate_run_dir(workspace, runs_root)
 
 	meta_path = run_dir / "run.json"
 	stdout_path = run_dir / "stdout.log"
@@ -45,6 +85,7 @@ def create_run(workspace: Path, command: str) -> Run:
 	meta_path.write_text(json.dumps(meta, indent=2), encoding="utf-8")
 	stdout_path.write_text("", encoding="utf-8")
 	stderr_path.write_text("", encoding="utf-8")
+	_index_meta(workspace, meta)
 	return Run(
 		run_id=run_id,
 		run_dir=run_dir,
@@ -58,6 +99,7 @@ def finish_run(run: Run, status: str) -> None:
 	meta["status"] = status
 	meta["finished_at"] = _now_iso()
 	run.meta_path.write_text(json.dumps(meta, indent=2), encoding="utf-8")
+	_index_meta(Path(meta.get("workspace") or run.run_dir.parents[2]), meta)
 
 def list_runs(workspace: Path) -> list[Path]:
 	runs_root = workspace / ".continuum" / "runs"
@@ -72,3 +114,46 @@ def read_run_meta(run_dir: Path) -> dict:
 	if not meta_path.exists():
 		raise FileNotFoundError(f"Missing run.json: {meta_path}")
 	return json.loads(meta_path.read_text(encoding="utf-8"))
+
+def _index_entry(meta: dict, error: str | None = None) -> dict:
+	entry = {f: meta.get(f) for f in run_index.FIELDS}
+	entry["error"] = error
+	return entry
+
+def _index_meta(workspace: Path, meta: dict) -> None:
+	# The index is built lazily by the first query; until then run.json is the source of truth.
+	try:
+		if run_index.index_exists(workspace):
+			run_index.upsert_runs(workspace, [_index_entry(meta)])
+	except Exception as e:
+		print(f"[warn] Run index update failed for {meta.get('run_id')}: {e} (run `continuum runs reindex`)", file=sys.stderr)
+
+def _scan_run_entries(workspace: Path) -> list[dict]:
+	entries = []
+	for run_dir in list_runs(workspace):
+		try:
+			entries.append(_index_entry(read_run_meta(run_dir)))
+		except Exception as e:
+			entries.append(_index_entry({"run_id": run_dir.name, "status": "corrupt"}, error=str(e)))
+	return entries
+
+def reindex_runs(workspace: Path) -> int:
+	# Fail on a missing runs folder before the index database gets created.
+	list_runs(workspace)
+	return run_index.rebuild_runs(workspace, lambda: _scan_run_entries(workspace))
+
+def _ensure_index(workspace: Path) -> None:
+	if not run_index.index_exists(workspace):
+		reindex_runs(workspace)
+
+def query_runs(workspace: Path, limit: int | None = None, status: str | None = None, since: str | None = None) -> list[dict]:
+	_ensure_index(workspace)
+	return run_index.select_runs(workspace, limit=limit, status=status, since=since)
+
+def iter_runs(workspace: Path, limit: int | None = None, status: str | None = None, since: str | None = None) -> Iterator[dict]:
+	_ensure_index(workspace)
+	return run_index.iter_select_runs(workspace, limit=limit, status=status, since=since)
+
+def count_runs(workspace: Path) -> int:
+	_ensure_index(workspace)
+	return run_index.count_runs(workspace)
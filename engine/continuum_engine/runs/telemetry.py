@@ -0,0 +1,221 @@
+from __future__ import annotations
+
+import json
+import os
+import threading
+import time
+from pathlib import Path
+
+TELEMETRY_VERSION = 1
+DEFAULT_INTERVAL = 2.0
+FLUSH_EVERY = 15
+COLUMNS = ["t", "cpu_percent", "rss_bytes", "read_bytes", "write_bytes", "threads", "gpu_mem_bytes"]
+
+
+def _psutil():
+	try:
+		import psutil  # type: ignore
+		return psutil
+	except Exception:
+		return None
+
+
+def _nvml():
+	try:
+		import pynvml  # type: ignore
+		pynvml.nvmlInit()
+		return pynvml
+	except Exception:
+		return None
+
+
+def telemetry_path(run_dir: Path) -> Path:
+	return run_dir / "telemetry.json"
+
+
+class TelemetrySampler:
+	def __init__(self, pid: int, out_path: Path, interval: float = DEFAULT_INTERVAL):
+		self.pid = pid
+		self.out_path = Path(out_path)
+		self.interval = max(float(interval), 0.1)
+		self.columns: dict[str, list] = {c: [] for c in COLUMNS}
+		self._stop = threading.Event()
+		self._thread: threading.Thread | None = None
+		self._procs: dict = {}
+		# Per-pid I/O bookkeeping so exited processes stay counted: last seen (ppid, read, write) of live
+		# pids, totals carried forward from exited ones, and per-pid amounts already carried for children
+		# that the kernel folds into the parent's own counters once it reaps them.
+		self._io_seen: dict[int, tuple[int, int, int]] = {}
+		self._io_carried = [0, 0]
+		self._io_folded: dict[int, tuple[int, int]] = {}
+		self._flushed_rows = 0
+		self._psutil = _psutil()
+		self._nvml = None
+		self._gpu_handles: list = []
+
+	@property
+	def available(self) -> bool:
+		return self._psutil is not None
+
+	def start(self) -> None:
+		if not self.available:
+			return
+		self._thread = threading.Thread(target=self._loop, name="continuum-telemetry", daemon=True)
+		self._thread.start()
+
+	def stop(self) -> None:
+		if self._thread is None:
+			return
+		self._stop.set()
+		self._thread.join(timeout=self.interval + 5)
+		self._flush()
+		if self._nvml is not None:
+			try:
+				self._nvml.nvmlShutdown()
+			except Exception:
+				pass
+
+	def _loop(self) -> None:
+		psutil = self._psutil
+		try:
+			root = psutil.Process(self.pid)
+		except Exception:
+			return
+		self._nvml = _nvml()
+		if self._nvml is not None:
+			try:
+				self._gpu_handles = [self._nvml.nvmlDeviceGetHandleByIndex(i) for i in range(self._nvml.nvmlDeviceGetCount())]
+			except Exception:
+				self._gpu_handles = []
+		started = time.monotonic()
+		while not self._stop.is_set():
+			try:
+				self._sample(root, time.monotonic() - started)
+			except psutil.NoSuchProcess:
+				break
+			except Exception:
+				pass
+			rows = len(self.columns["t"])
+			if rows != self._flushed_rows and rows % FLUSH_EVERY == 0:
+				self._flush()
+			self._stop.wait(self.interval)
+
+	def _tree(self, root) -> list:
+		psutil = self._psutil
+		current = {root.pid: root}
+		try:
+			for child in root.children(recursive=True):
+				current[child.pid] = child
+		except psutil.Error:
+			pass
+		# Reuse Process objects so cpu_percent() measures against the previous sample.
+		for pid, proc in current.items():
+			if pid not in self._procs:
+				self._procs[pid] = proc
+				try:
+					proc.cpu_percent(None)
+				except psutil.Error:
+					pass
+		self._procs = {pid: self._procs[pid] for pid in current}
+		return list(self._procs.values())
+
+	def _sample(self, root, t: float) -> None:
+		psutil = self._psutil
+		if not root.is_running():
+			raise psutil.NoSuchProcess(self.pid)
+		cpu = 0.0
+		rss = 0
+		threads = 0
+		pids = set()
+		tree = self._tree(root)
+		for proc in tree:
+			try:
+				with proc.oneshot():
+					cpu += proc.cpu_percent(None)
+					rss += proc.memory_info().rss
+					threads += proc.num_threads()
+					try:
+						io = proc.io_counters()
+						self._io_seen[proc.pid] = (proc.ppid(), io.read_bytes, io.write_bytes)
+					except (psutil.AccessDenied, AttributeError):
+						pass
+				pids.add(proc.pid)
+			except psutil.Error:
+				continue
+		read_bytes, write_bytes = self._io_totals({proc.pid for proc in tree})
+		row = [round(t, 2), round(cpu, 1), rss, read_bytes, write_bytes, threads, self._gpu_mem(pids)]
+		for name, value in zip(COLUMNS, row):
+			self.columns[name].append(value)
+
+	def _io_totals(self, alive: set[int]) -> tuple[int, int]:
+		for pid in [p for p in self._io_seen if p not in alive]:
+			ppid, read, write = self._io_seen.pop(pid)
+			folded_read, folded_write = self._io_folded.pop(pid, (0, 0))
+			self._io_carried[0] += read - folded_read
+			self._io_carried[1] += write - folded_write
+			# Once the parent reaps it, this pid's counters show up in the parent's; don't count them twice.
+			if ppid in alive:
+				r, w = self._io_folded.get(ppid, (0, 0))
+				self._io_folded[ppid] = (r + read, w + write)
+		# Pids that are alive but unreadable this round (zombies, transient errors) keep their last value.
+		read_bytes, write_bytes = self._io_carried
+		for pid, (_, read, write) in self._io_seen.items():
+			folded_read, folded_write = self._io_folded.get(pid, (0, 0))
+			read_bytes += read - folded_read
+			write_bytes += write - folded_write
+		return read_bytes, write_bytes
+
+	def _gpu_mem(self, pids: set[int]) -> int | None:
+		if self._nvml is None or not self._gpu_handles:
+			return None
+		total = 0
+		for handle in self._gpu_handles:
+			try:
+				for p in self._nvml.nvmlDeviceGetComputeRunningProcesses(handle):
+					if p.pid in pids and p.usedGpuMemory:
+						total += int(p.usedGpuMemory)
+			except Exception:
+				continue
+		return total
+
+	def _flush(self) -> None:
+		data = {
+			"version": TELEMETRY_VERSION,
+			"interval": self.interval,
+			"columns": self.columns,
+		}
+		try:
+			tmp = self.out_path.with_name(self.out_path.name + ".tmp")
+			tmp.write_text(json.dumps(data, separators=(",", ":")), encoding="utf-8")
+			os.replace(tmp, self.out_path)
+			self._flushed_rows = len(self.columns["t"])
+		except Exception:
+			pass
+
+
+def summarize_telemetry(run_dir: Path) -> dict | None:
+	path = telemetry_path(run_dir)
+	if not path.exists():
+		return None
+	try:
+		cols = json.loads(path.read_text(encoding="utf-8")).get("columns", {})
+	except Exception:
+		return None
+	t = cols.get("t") or []
+	cpu = cols.get("cpu_percent") or []
+	rss = cols.get("rss_bytes") or []
+	gpu = [g for g in cols.get("gpu_mem_bytes") or [] if g is not None]
+	read_bytes = cols.get("read_bytes") or []
+	write_bytes = cols.get("write_bytes") or []
+	return {
+		"samples": len(t),
+		"sampled_seconds": t[-1] if t else 0.0,
+		"peak_rss_bytes": max(rss) if rss else None,
+		"avg_cpu_percent": round(sum(cpu) / len(cpu), 1) if cpu else None,
+		"peak_cpu_percent": max(cpu) if cpu else None,
+		"peak_threads": max(cols.get("threads") or [0]) if t else None,
+		# Running totals over the whole tree, including processes that already exited.
+		"read_bytes": max(read_bytes) if read_bytes else None,
+		"write_bytes": max(write_bytes) if write_bytes else None,
+		"peak_gpu_mem_bytes": max(gpu) if gpu else None,
+	}
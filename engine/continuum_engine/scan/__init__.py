@@ -0,0 +1,15 @@
+from __future__ import annotations
+
+from continuum_engine.scan.manager import (
+	hash_file,
+	index_totals,
+	load_index,
+	scan_workspace,
+)
+
+__all__ = [
+	"hash_file",
+	"index_totals",
+	"load_index",
+	"scan_workspace",
+]
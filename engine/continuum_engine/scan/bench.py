@@ -0,0 +1,104 @@
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import shutil
+import tempfile
+import time
+from pathlib import Path
+
+from continuum_engine.utils.walk import DEFAULT_JOBS, EXCLUDE_DIRS, scandir_listing, walk
+
+
+def make_tree(root: Path, files: int, per_dir: int = 1000, fanout: int = 32) -> None:
+	# Two-level layout (fanout x N dirs of per_dir files each) so listing parallelism has work to spread.
+	dirs = max(1, -(-files // per_dir))
+	made = 0
+	for d in range(dirs):
+		sub = root / f"g{d % fanout:03d}" / f"d{d:05d}"
+		sub.mkdir(parents=True, exist_ok=True)
+		for i in range(min(per_dir, files - made)):
+			with open(sub / f"f{i:05d}.bin", "wb") as f:
+				f.write(b"x" * (i % 64))
+		made += min(per_dir, files - made)
+
+
+def os_walk_totals(root: Path) -> tuple[int, int]:
+	# What scan did before the shared walker: os.walk plus one Path.stat() per file.
+	files = 0
+	total = 0
+	for dirpath, dirnames, filenames in os.walk(root):
+		dirnames[:] = [d for d in dirnames if d not in EXCLUDE_DIRS]
+		for name in filenames:
+			total += Path(dirpath, name).stat().st_size
+			files += 1
+	return files, total
+
+
+def walker_totals(root: Path, jobs: int) -> tuple[int, int]:
+	files = 0
+	total = 0
+	for _, entries in walk(root, scandir_listing, jobs=jobs):
+		for _, st in entries:
+			total += st.st_size
+			files += 1
+	return files, total
+
+
+def _timed(fn, *args) -> tuple[float, tuple[int, int]]:
+	started = time.perf_counter()
+	result = fn(*args)
+	return time.perf_counter() - started, result
+
+
+def run_benchmark(root: Path, jobs_list: list[int]) -> list[dict]:
+	rows = []
+	seconds, (files, total) = _timed(os_walk_totals, root)
+	rows.append({"method": "os.walk+stat", "jobs": 1, "seconds": round(seconds, 3), "files": files, "bytes": total})
+	for jobs in jobs_list:
+		seconds, (files, total) = _timed(walker_totals, root, jobs)
+		rows.append({"method": "walk", "jobs": jobs, "seconds": round(seconds, 3), "files": files, "bytes": total})
+	base = rows[0]["seconds"]
+	for r in rows:
+		r["speedup"] = round(base / r["seconds"], 2) if r["seconds"] else None
+	return rows
+
+
+def main(argv: list[str] | None = None) -> int:
+	parser = argparse.ArgumentParser(prog="python -m continuum_engine.scan.bench", description="Compare the shared scandir walker with os.walk + stat on a synthetic tree")
+	parser.add_argument("--root", help="Existing tree to walk (default: build a synthetic one in a temp dir)")
+	parser.add_argument("--files", type=int, default=1_000_000, help="Files in the synthetic tree (default: 1000000)")
+	parser.add_argument("--per-dir", type=int, default=1000, help="Files per synthetic directory (default: 1000)")
+	parser.add_argument("--jobs", default=f"1,4,{DEFAULT_JOBS}", help=f"Comma-separated walker thread counts (default: 1,4,{DEFAULT_JOBS})")
+	parser.add_argument("--keep", action="store_true", help="Keep the synthetic tree")
+	parser.add_argument("--json", action="store_true", help="Output JSON")
+	args = parser.parse_args(argv)
+
+	jobs_list = [int(x) for x in args.jobs.split(",") if x.strip()]
+	tmp = None
+	if args.root:
+		root = Path(args.root).expanduser().resolve()
+	else:
+		tmp = Path(tempfile.mkdtemp(prefix="continuum-walk-bench-"))
+		root = tmp
+		started = time.perf_counter()
+		make_tree(root, args.files, per_dir=args.per_dir)
+		if not args.json:
+			print(f"[ok] built {args.files} files under {root} in {time.perf_counter() - started:.1f}s")
+	try:
+		rows = run_benchmark(root, jobs_list)
+	finally:
+		if tmp is not None and not args.keep:
+			shutil.rmtree(tmp, ignore_errors=True)
+	if args.json:
+		print(json.dumps(rows, indent=2))
+		return 0
+	print("METHOD\tJOBS\tSECONDS\tFILES\tSPEEDUP")
+	for r in rows:
+		print(f"{r['method']}\t{r['jobs']}\t{r['seconds']}\t{r['files']}\t{r['speedup']}")
+	return 0
+
+
+if __name__ == "__main__":
+	raise SystemExit(main())
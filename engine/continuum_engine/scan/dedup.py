@@ -0,0 +1,235 @@
+from __future__ import annotations
+
+import errno
+import fcntl
+import json
+import os
+import stat
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from pathlib import Path
+
+from continuum_engine.scan.manager import HASH_CHUNK_BYTES, hash_algo, hash_file, load_index, new_hasher
+from continuum_engine.utils.walk import DEFAULT_JOBS
+
+REPORT_VERSION = 1
+# Files smaller than a filesystem block free nothing when linked.
+DEDUP_MIN_BYTES = 4096
+# Tier 2 hashes this much from each end; files up to twice this go straight to the full hash.
+PARTIAL_BYTES = 4 * 1024 * 1024
+# linux/fs.h: _IOW(0x94, 9, int)
+FICLONE = 0x40049409
+CONSOLIDATE_MODES = ("hardlink", "reflink")
+
+
+def _report_path(ws: Path) -> Path:
+	return ws / ".continuum" / "state" / "dedup.json"
+
+
+def _now_iso() -> str:
+	return datetime.now(timezone.utc).replace(microsecond=0).isoformat()
+
+
+def partial_hash(path: str, size: int) -> str:
+	h = new_hasher()
+	with open(path, "rb", buffering=0) as f:
+		h.update(f.read(PARTIAL_BYTES))
+		f.seek(size - PARTIAL_BYTES)
+		h.update(f.read(PARTIAL_BYTES))
+	return h.hexdigest()
+
+
+def _group(items: list, key_fn, jobs: int) -> tuple[list[list], int]:
+	# Returns groups of items sharing a key (singletons dropped) and the number of keys computed.
+	def keyed(item):
+		try:
+			return key_fn(item), item
+		except OSError:
+			return None, item
+
+	groups: dict = {}
+	with ThreadPoolExecutor(max_workers=max(1, jobs), thread_name_prefix="continuum-dedup") as pool:
+		for key, item in pool.map(keyed, items):
+			if key is not None:
+				groups.setdefault(key, []).append(item)
+	return [g for g in groups.values() if len(g) > 1], len(items)
+
+
+def find_duplicates(ws: Path, min_size: int = DEDUP_MIN_BYTES, jobs: int = DEFAULT_JOBS) -> dict:
+	index = load_index(ws)
+	algo_ok = index.get("hash_algo") == hash_algo()
+	stats = {"size_candidates": 0, "partial_hashed": 0, "full_hashed": 0, "full_reused": 0, "already_linked": 0}
+
+	# Tier 1: size, straight from the scan index.
+	by_size: dict[int, list] = {}
+	for rel, record in index["dirs"].items():
+		for name, rec in record.get("files", {}).items():
+			if rec[0] >= min_size:
+				by_size.setdefault(rec[0], []).append((os.path.join(rel, name) if rel else name, rec))
+
+	# Files sharing an inode are already one copy; hash one representative per inode.
+	groups: list[list[dict]] = []
+	for size, files in by_size.items():
+		if len(files) < 2:
+			continue
+		inodes: dict[tuple, dict] = {}
+		for rel, rec in files:
+			try:
+				st = os.stat(ws / rel)
+			except OSError:
+				continue
+			# Skip files that changed since the index was written; their record is stale.
+			if st.st_size != rec[0] or st.st_mtime_ns != rec[1] or st.st_ino != rec[2]:
+				continue
+			node = inodes.setdefault((st.st_dev, st.st_ino), {"size": size, "paths": [], "digest": rec[3] if algo_ok else None})
+			node["paths"].append(rel)
+		if len(inodes) > 1:
+			stats["size_candidates"] += len(inodes)
+			groups.append(list(inodes.values()))
+		stats["already_linked"] += sum(len(n["paths"]) - 1 for n in inodes.values())
+
+	# Tier 2: head + tail hash, only where it reads less than the whole file.
+	narrowed: list[list[dict]] = []
+	partial_items = []
+	for g in groups:
+		if g[0]["size"] > 2 * PARTIAL_BYTES and any(n["digest"] is None for n in g):
+			partial_items.extend(g)
+		else:
+			narrowed.append(g)
+	if partial_items:
+		split, stats["partial_hashed"] = _group(
+			partial_items, lambda n: (n["size"], partial_hash(str(ws / n["paths"][0]), n["size"])), jobs
+		)
+		narrowed.extend(split)
+
+	# Tier 3: full content hash, reusing digests already in the scan index.
+	full_items = []
+	for g in narrowed:
+		for n in g:
+			if n["digest"] is None:
+				full_items.append(n)
+			else:
+				stats["full_reused"] += 1
+
+	def full_hash(n: dict) -> None:
+		try:
+			n["digest"] = hash_file(ws / n["paths"][0])
+		except OSError:
+			n["digest"] = None
+
+	if full_items:
+		with ThreadPoolExecutor(max_workers=max(1, jobs), thread_name_prefix="continuum-dedup") as pool:
+			list(pool.map(full_hash, full_items))
+		stats["full_hashed"] = len(full_items)
+
+	sets: list[dict] = []
+	for g in narrowed:
+		by_digest: dict[str, list[dict]] = {}
+		for n in g:
+			if n["digest"] is not None:
+				by_digest.setdefault(n["digest"], []).append(n)
+		for digest, nodes in by_digest.items():
+			if len(nodes) < 2:
+				continue
+			nodes.sort(key=lambda n: min(n["paths"]))
+			sets.append({
+				"size": nodes[0]["size"],
+				"hash": digest,
+				"copies": [sorted(n["paths"]) for n in nodes],
+			})
+	sets.sort(key=lambda s: s["size"] * (len(s["copies"]) - 1), reverse=True)
+
+	report = {
+		"version": REPORT_VERSION,
+		"workspace": str(ws),
+		"generated_at": _now_iso(),
+		"hash_algo": hash_algo(),
+		"min_size": min_size,
+		"duplicate_sets": len(sets),
+		"duplicate_files": sum(len(s["copies"]) - 1 for s in sets),
+		"reclaimable_bytes": sum(s["size"] * (len(s["copies"]) - 1) for s in sets),
+		"stats": stats,
+		"sets": sets,
+	}
+	path = _report_path(ws)
+	path.parent.mkdir(parents=True, exist_ok=True)
+	tmp = path.with_name(path.name + ".tmp")
+	tmp.write_text(json.dumps(report, indent=2), encoding="utf-8")
+	os.replace(tmp, path)
+	return report
+
+
+def _reflink(src: str, dst: str) -> None:
+	st = os.stat(dst)
+	tmp = dst + ".continuum-dedup"
+	with open(src, "rb") as fsrc, open(tmp, "wb") as fdst:
+		try:
+			fcntl.ioctl(fdst.fileno(), FICLONE, fsrc.fileno())
+		except OSError:
+			fdst.close()
+			os.unlink(tmp)
+			raise
+	os.chmod(tmp, st.st_mode & 0o7777)
+	os.utime(tmp, ns=(st.st_atime_ns, st.st_mtime_ns))
+	os.replace(tmp, dst)
+
+
+def _same_bytes(a: str, b: str) -> bool:
+	# The digest is not collision-proof (xxh3 isn't cryptographic); compare bytes before replacing a file.
+	with open(a, "rb", buffering=0) as fa, open(b, "rb", buffering=0) as fb:
+		while True:
+			ca = fa.read(HASH_CHUNK_BYTES)
+			if ca != fb.read(HASH_CHUNK_BYTES):
+				return False
+			if not ca:
+				return True
+
+
+def _hardlink(src: str, dst: str) -> None:
+	tmp = dst + ".continuum-dedup"
+	os.link(src, tmp)
+	os.replace(tmp, dst)
+
+
+def consolidate(ws: Path, report: dict, mode: str, dry_run: bool = False) -> dict:
+	if mode not in CONSOLIDATE_MODES:
+		raise ValueError(f"unknown consolidate mode: {mode}")
+	link = _hardlink if mode == "hardlink" else _reflink
+	result = {"mode": mode, "dry_run": dry_run, "linked": 0, "bytes": 0, "skipped": 0, "errors": []}
+	for s in report["sets"]:
+		keep = str(ws / s["copies"][0][0])
+		try:
+			keep_st = os.lstat(keep)
+			# The kept copy becomes the content of every other copy, so it must still match the report.
+			if not stat.S_ISREG(keep_st.st_mode) or keep_st.st_size != s["size"] or hash_file(keep) != s["hash"]:
+				result["skipped"] += sum(len(c) for c in s["copies"][1:])
+				continue
+		except OSError as e:
+			result["errors"].append(f"{s['copies'][0][0]}: {e.strerror}")
+			continue
+		for copy in s["copies"][1:]:
+			for rel in copy:
+				dst = str(ws / rel)
+				try:
+					st = os.lstat(dst)
+					# Only touch regular files that still look like the ones that were hashed; a symlink
+					# swapped in since the report would otherwise be followed.
+					if not stat.S_ISREG(st.st_mode) or st.st_size != s["size"] or (st.st_dev, st.st_ino) == (keep_st.st_dev, keep_st.st_ino):
+						result["skipped"] += 1
+						continue
+					if mode == "hardlink" and st.st_dev != keep_st.st_dev:
+						result["skipped"] += 1
+						continue
+					if not _same_bytes(keep, dst):
+						result["skipped"] += 1
+						continue
+					if not dry_run:
+						link(keep, dst)
+				except OSError as e:
+					if e.errno in (errno.EOPNOTSUPP, errno.EXDEV, errno.EINVAL) and mode == "reflink":
+						raise RuntimeError(f"reflink not supported for {rel} ({e.strerror}); use --consolidate hardlink or a CoW filesystem (btrfs, XFS)")
+					result["errors"].append(f"{rel}: {e.strerror or e}")
+					continue
+				result["linked"] += 1
+				result["bytes"] += s["size"]
+	return result
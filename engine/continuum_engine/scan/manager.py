@@ -0,0 +1,201 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Callable
+
+from continuum_engine.utils.walk import DEFAULT_JOBS, EXCLUDE_DIRS, scandir_listing, walk
+
+try:
+	import xxhash  # type: ignore
+except Exception:
+	xxhash = None
+
+INDEX_VERSION = 1
+HASH_CHUNK_BYTES = 4 * 1024 * 1024
+
+
+def _index_path(ws: Path) -> Path:
+	return ws / ".continuum" / "cache" / "scan_index.json"
+
+
+def _state_path(ws: Path) -> Path:
+	return ws / ".continuum" / "state" / "scan.json"
+
+
+def hash_algo() -> str:
+	return "xxh3_128" if xxhash is not None else "blake2b_128"
+
+
+def new_hasher():
+	if xxhash is not None:
+		return xxhash.xxh3_128()
+	return hashlib.blake2b(digest_size=16)
+
+
+def hash_file(path: str | Path) -> str:
+	h = new_hasher()
+	buf = bytearray(HASH_CHUNK_BYTES)
+	view = memoryview(buf)
+	with open(path, "rb", buffering=0) as f:
+		while True:
+			n = f.readinto(buf)
+			if not n:
+				break
+			h.update(view[:n])
+	return h.hexdigest()
+
+
+def _empty_index(ws: Path) -> dict:
+	return {
+		"version": INDEX_VERSION,
+		"workspace": str(ws),
+		"hash_algo": hash_algo(),
+		"dirs": {},
+	}
+
+
+def load_index(ws: Path) -> dict:
+	path = _index_path(ws)
+	if not path.exists():
+		return _empty_index(ws)
+	try:
+		index = json.loads(path.read_text(encoding="utf-8"))
+	except Exception:
+		return _empty_index(ws)
+	if not isinstance(index, dict) or index.get("version") != INDEX_VERSION or index.get("workspace") != str(ws):
+		return _empty_index(ws)
+	if not isinstance(index.get("dirs"), dict):
+		return _empty_index(ws)
+	return index
+
+
+def save_index(ws: Path, index: dict) -> None:
+	path = _index_path(ws)
+	path.parent.mkdir(parents=True, exist_ok=True)
+	tmp = path.with_name(path.name + ".tmp")
+	tmp.write_text(json.dumps(index, separators=(",", ":")), encoding="utf-8")
+	os.replace(tmp, path)
+
+
+def _ext_of(name: str) -> str:
+	suffix = os.path.splitext(name)[1].lower().lstrip(".")
+	return suffix if suffix else "<none>"
+
+
+def _list_dir(path: str, cached: dict | None, want_hash: bool, algo_ok: bool) -> tuple[dict, int]:
+	prev_files = cached.get("files", {}) if cached else {}
+	files: dict[str, list] = {}
+	hashed = 0
+	entries, dirs = scandir_listing(path, "", exclude=EXCLUDE_DIRS)
+	for name, st in entries:
+		digest = None
+		prev = prev_files.get(name)
+		if prev and algo_ok and prev[0] == st.st_size and prev[1] == st.st_mtime_ns and prev[2] == st.st_ino:
+			digest = prev[3]
+		if digest is None and want_hash:
+			try:
+				digest = hash_file(os.path.join(path, name))
+				hashed += 1
+			except OSError:
+				digest = None
+		files[name] = [st.st_size, st.st_mtime_ns, st.st_ino, digest]
+	dirs.sort()
+	return {"files": files, "dirs": dirs}, hashed
+
+
+def visit_dir(path: str, rel: str, old_dirs: dict, want_hash: bool, algo_ok: bool) -> tuple[tuple[dict, bool, int], list[str]]:
+	mtime_ns = os.stat(path).st_mtime_ns
+	cached = old_dirs.get(rel)
+	# In-place writes to a file don't touch its directory's mtime, so entries are always re-stat'd;
+	# an unchanged directory mtime only means no entries were added or removed.
+	unchanged = cached is not None and cached.get("mtime_ns") == mtime_ns
+	listing, hashed = _list_dir(path, cached, want_hash, algo_ok)
+	record = {"mtime_ns": mtime_ns, **listing}
+	return (record, unchanged, hashed), listing["dirs"]
+
+
+def scan_workspace(
+	ws: Path,
+	full: bool = False,
+	want_hash: bool = True,
+	jobs: int = DEFAULT_JOBS,
+	on_dir: Callable[[str, dict], None] | None = None,
+) -> dict:
+	index = _empty_index(ws) if full else load_index(ws)
+	algo_ok = index.get("hash_algo") == hash_algo()
+	old_dirs: dict = index["dirs"]
+	new_dirs: dict = {}
+	stats = {"dirs_listed": 0, "dirs_unchanged": 0, "files_hashed": 0}
+	totals = _empty_totals()
+
+	def list_dir(path: str, rel: str) -> tuple:
+		return visit_dir(path, rel, old_dirs, want_hash, algo_ok)
+
+	for rel, (record, unchanged, hashed) in walk(ws, list_dir, jobs=jobs):
+		new_dirs[rel] = record
+		stats["dirs_listed"] += 1
+		stats["dirs_unchanged"] += int(unchanged)
+		stats["files_hashed"] += hashed
+		for name, rec in record["files"].items():
+			add_to_totals(totals, name, rec, 1)
+		if on_dir is not None:
+			on_dir(rel, record)
+
+	index = {
+		"version": INDEX_VERSION,
+		"workspace": str(ws),
+		"hash_algo": hash_algo(),
+		"dirs": new_dirs,
+		"totals": totals,
+	}
+	save_index(ws, index)
+	return write_summary(ws, totals, {"hash_algo": hash_algo() if want_hash else None, **stats})
+
+
+def _empty_totals() -> dict:
+	return {"files": 0, "bytes": 0, "extensions": {}}
+
+
+def add_to_totals(totals: dict, name: str, rec: list, sign: int) -> None:
+	totals["files"] += sign
+	totals["bytes"] += sign * rec[0]
+	ext = _ext_of(name)
+	count = totals["extensions"].get(ext, 0) + sign
+	if count > 0:
+		totals["extensions"][ext] = count
+	else:
+		totals["extensions"].pop(ext, None)
+
+
+def index_totals(index: dict) -> dict:
+	totals = index.get("totals")
+	if isinstance(totals, dict) and isinstance(totals.get("extensions"), dict):
+		return totals
+	totals = _empty_totals()
+	for record in index["dirs"].values():
+		for name, rec in record.get("files", {}).items():
+			add_to_totals(totals, name, rec, 1)
+	index["totals"] = totals
+	return totals
+
+
+def write_summary(ws: Path, totals: dict, index_stats: dict) -> dict:
+	top_ext = dict(sorted(totals["extensions"].items(), key=lambda kv: kv[1], reverse=True)[:20])
+	result = {
+		"workspace": str(ws),
+		"total_files": totals["files"],
+		"total_bytes": totals["bytes"],
+		"extension_counts": top_ext,
+		"index": {
+			"path": str(_index_path(ws)),
+			**index_stats,
+		},
+	}
+	path = _state_path(ws)
+	tmp = path.with_name(path.name + ".tmp")
+	tmp.write_text(json.dumps(result, indent=2), encoding="utf-8")
+	os.replace(tmp, path)
+	return result
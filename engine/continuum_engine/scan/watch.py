@@ -0,0 +1,319 @@
+from __future__ import annotations
+
+import errno
+import os
+import stat
+import threading
+import time
+from pathlib import Path
+
+from continuum_engine.checkpoints import checkpoints_root, list_checkpoints, update_checkpoints
+from continuum_engine.scan.manager import (
+	add_to_totals,
+	hash_algo,
+	hash_file,
+	index_totals,
+	load_index,
+	save_index,
+	scan_workspace,
+	visit_dir,
+	write_summary,
+)
+from continuum_engine.utils import inotify
+from continuum_engine.utils.walk import DEFAULT_JOBS, EXCLUDE_DIRS, walk
+
+WATCH_MASK = (
+	inotify.IN_CREATE | inotify.IN_DELETE | inotify.IN_MODIFY | inotify.IN_CLOSE_WRITE | inotify.IN_ATTRIB
+	| inotify.IN_MOVED_FROM | inotify.IN_MOVED_TO | inotify.IN_DELETE_SELF | inotify.IN_MOVE_SELF | inotify.IN_ONLYDIR
+)
+DEFAULT_FLUSH_INTERVAL = 2.0
+DEFAULT_SWEEP_INTERVAL = 30.0
+# After a queue overflow, stay on mtime sweeps for this many sweep intervals before re-arming inotify.
+OVERFLOW_COOLDOWN_SWEEPS = 4
+
+
+def _join(rel: str, name: str) -> str:
+	return f"{rel}/{name}" if rel else name
+
+
+class WorkspaceWatcher:
+	def __init__(
+		self,
+		ws: Path,
+		want_hash: bool = False,
+		flush_interval: float = DEFAULT_FLUSH_INTERVAL,
+		sweep_interval: float = DEFAULT_SWEEP_INTERVAL,
+		jobs: int = DEFAULT_JOBS,
+	):
+		self.ws = ws
+		self.want_hash = want_hash
+		self.flush_interval = max(flush_interval, 0.1)
+		self.sweep_interval = max(sweep_interval, 1.0)
+		self.jobs = jobs
+		self.ckpt_rel = str(checkpoints_root(ws).relative_to(ws))
+		self.index: dict = {}
+		self.totals: dict = {}
+		self.ino: inotify.Inotify | None = None
+		self.wd_rel: dict[int, str] = {}
+		self.pending: set[tuple[str, str]] = set()
+		self.touched_dirs: set[str] = set()
+		self.touched_ckpts: set[str] = set()
+		self.dirty = False
+		self.mode = "sweep"
+		self.rearm_at: float | None = None
+		self.watch_limit_hit = False
+		self.stats = {"events": 0, "files_changed": 0, "dirs_added": 0, "dirs_removed": 0, "sweeps": 0, "overflows": 0, "watch_limit_hits": 0}
+
+	def _sweep(self, full: bool = False) -> None:
+		scan_workspace(self.ws, full=full, want_hash=self.want_hash, jobs=self.jobs)
+		list_checkpoints(self.ws)
+		self.index = load_index(self.ws)
+		self.totals = index_totals(self.index)
+		self.stats["sweeps"] += 1
+
+	def _arm(self) -> bool:
+		if not inotify.inotify_available():
+			return False
+		try:
+			self.ino = inotify.Inotify()
+		except OSError:
+			return False
+		self.wd_rel = {}
+		self._sweep()
+		try:
+			for rel in sorted(self.index["dirs"]):
+				self._add_watch(rel)
+		except OSError as e:
+			self._disarm()
+			if e.errno == errno.ENOSPC:
+				self.stats["watch_limit_hits"] += 1
+				print("[warn] inotify watch limit reached (fs.inotify.max_user_watches); using mtime sweeps")
+				# Watches may free up (other watchers exit, the tree shrinks); try again after the cooldown.
+				self.rearm_at = time.monotonic() + self.sweep_interval * OVERFLOW_COOLDOWN_SWEEPS
+			return False
+		# Catch anything that changed while the watches were being placed.
+		self._sweep()
+		self.mode = "inotify"
+		return True
+
+	def _disarm(self) -> None:
+		if self.ino is not None:
+			self.ino.close()
+		self.ino = None
+		self.wd_rel = {}
+		self.pending.clear()
+		self.watch_limit_hit = False
+		self.mode = "sweep"
+
+	def _add_watch(self, rel: str) -> None:
+		try:
+			wd = self.ino.add_watch(str(self.ws / rel) if rel else str(self.ws), WATCH_MASK)
+		except OSError as e:
+			if e.errno in (errno.ENOENT, errno.ENOTDIR):
+				return
+			raise
+		self.wd_rel[wd] = rel
+
+	def _note_ckpt(self, rel: str) -> None:
+		prefix = self.ckpt_rel + "/"
+		if rel.startswith(prefix):
+			self.touched_ckpts.add(rel[len(prefix):].split("/", 1)[0])
+
+	def _add_tree(self, rel: str) -> None:
+		algo_ok = self.index.get("hash_algo") == hash_algo()
+		self._drop_tree(rel)
+
+		def list_dir(path: str, sub: str) -> tuple:
+			drel = _join(rel, sub) if sub else rel
+			# Watch before listing so files created mid-listing still raise an event.
+			try:
+				self._add_watch(drel)
+			except OSError as e:
+				if e.errno != errno.ENOSPC:
+					raise
+				# Out of watches: still index the directory (the walker would skip it and its subtree
+				# would vanish from the totals), and let run() fall back to sweeps.
+				self.watch_limit_hit = True
+			return visit_dir(path, drel, {}, self.want_hash, algo_ok)
+
+		for sub, (record, _, _) in walk(self.ws / rel, list_dir, jobs=self.jobs):
+			self.index["dirs"][_join(rel, sub) if sub else rel] = record
+			for name, rec in record["files"].items():
+				add_to_totals(self.totals, name, rec, 1)
+			self.stats["dirs_added"] += 1
+
+	def _drop_tree(self, rel: str) -> None:
+		prefix = rel + "/"
+		for drel in [d for d in self.index["dirs"] if d == rel or d.startswith(prefix)]:
+			for name, rec in self.index["dirs"].pop(drel).get("files", {}).items():
+				add_to_totals(self.totals, name, rec, -1)
+			self.stats["dirs_removed"] += 1
+		for wd in [wd for wd, r in self.wd_rel.items() if r == rel or r.startswith(prefix)]:
+			self.wd_rel.pop(wd, None)
+			if self.ino is not None:
+				self.ino.rm_watch(wd)
+
+	def _set_subdir(self, rel: str, name: str, present: bool) -> None:
+		record = self.index["dirs"].get(rel)
+		if record is None:
+			return
+		dirs = set(record.get("dirs", []))
+		dirs.add(name) if present else dirs.discard(name)
+		record["dirs"] = sorted(dirs)
+		self.touched_dirs.add(rel)
+
+	def _handle(self, ev: inotify.Event) -> None:
+		self.stats["events"] += 1
+		rel = self.wd_rel.get(ev.wd)
+		if rel is None:
+			return
+		if ev.mask & (inotify.IN_DELETE_SELF | inotify.IN_MOVE_SELF | inotify.IN_IGNORED):
+			if not ev.name:
+				self.wd_rel.pop(ev.wd, None)
+			return
+		if not ev.name:
+			return
+		child = _join(rel, ev.name)
+		if ev.is_dir:
+			if ev.name in EXCLUDE_DIRS:
+				return
+			if ev.mask & (inotify.IN_CREATE | inotify.IN_MOVED_TO):
+				self._add_tree(child)
+				self._set_subdir(rel, ev.name, True)
+			elif ev.mask & (inotify.IN_DELETE | inotify.IN_MOVED_FROM):
+				self._drop_tree(child)
+				self._set_subdir(rel, ev.name, False)
+			self._note_ckpt(child)
+			self.dirty = True
+			return
+		self.pending.add((rel, ev.name))
+
+	def _apply_file(self, rel: str, name: str) -> None:
+		record = self.index["dirs"].get(rel)
+		if record is None:
+			return
+		files = record.setdefault("files", {})
+		old = files.get(name)
+		path = os.path.join(self.ws, rel, name)
+		try:
+			st = os.stat(path)
+			if stat.S_ISDIR(st.st_mode):
+				st = None
+		except OSError:
+			st = None
+		if st is None:
+			if old is not None:
+				add_to_totals(self.totals, name, files.pop(name), -1)
+		else:
+			same = old is not None and old[0] == st.st_size and old[1] == st.st_mtime_ns and old[2] == st.st_ino
+			digest = old[3] if same else None
+			if digest is None and self.want_hash:
+				try:
+					digest = hash_file(path)
+				except OSError:
+					digest = None
+			new = [st.st_size, st.st_mtime_ns, st.st_ino, digest]
+			if new == old:
+				return
+			if old is not None:
+				add_to_totals(self.totals, name, old, -1)
+			files[name] = new
+			add_to_totals(self.totals, name, new, 1)
+		self.stats["files_changed"] += 1
+		self.touched_dirs.add(rel)
+		self._note_ckpt(_join(rel, name))
+		self.dirty = True
+
+	def _checkpoint_stats(self, name: str) -> tuple[int, int]:
+		rel = _join(self.ckpt_rel, name)
+		prefix = rel + "/"
+		total = 0
+		newest_ns = 0
+		for drel, record in self.index["dirs"].items():
+			if drel == rel or drel.startswith(prefix):
+				for rec in record.get("files", {}).values():
+					total += rec[0]
+					newest_ns = max(newest_ns, rec[1])
+		return total, newest_ns
+
+	def flush(self) -> bool:
+		for rel, name in sorted(self.pending):
+			self._apply_file(rel, name)
+		self.pending.clear()
+		if not self.dirty:
+			return False
+		# Our view of these directories is complete, so a later incremental scan may reuse them.
+		for rel in self.touched_dirs:
+			record = self.index["dirs"].get(rel)
+			if record is not None:
+				try:
+					record["mtime_ns"] = os.stat(self.ws / rel if rel else self.ws).st_mtime_ns
+				except OSError:
+					pass
+		self.index["totals"] = self.totals
+		save_index(self.ws, self.index)
+		write_summary(self.ws, self.totals, {"hash_algo": hash_algo() if self.want_hash else None, "watch": self.mode, **self.stats})
+		if self.touched_ckpts:
+			update_checkpoints(self.ws, {name: self._checkpoint_stats(name) for name in self.touched_ckpts})
+		self.touched_dirs.clear()
+		self.touched_ckpts.clear()
+		self.dirty = False
+		return True
+
+	def _overflow(self) -> None:
+		self.stats["overflows"] += 1
+		print("[warn] inotify queue overflowed; falling back to mtime sweeps")
+		self._disarm()
+		# Dropped events may include in-place writes that left size and mtime intact; rebuild from scratch.
+		self._sweep(full=True)
+		self.rearm_at = time.monotonic() + self.sweep_interval * OVERFLOW_COOLDOWN_SWEEPS
+
+	def _watch_limit(self) -> None:
+		self.stats["watch_limit_hits"] += 1
+		print("[warn] inotify watch limit reached (fs.inotify.max_user_watches); falling back to mtime sweeps")
+		self._disarm()
+		self._sweep()
+		self.rearm_at = time.monotonic() + self.sweep_interval * OVERFLOW_COOLDOWN_SWEEPS
+
+	def run(self, stop: threading.Event | None = None, on_flush=None) -> None:
+		stop = stop or threading.Event()
+		if not self._arm():
+			self._sweep()
+		next_flush = time.monotonic() + self.flush_interval
+		next_sweep = time.monotonic() + self.sweep_interval
+		try:
+			while not stop.is_set():
+				now = time.monotonic()
+				if self.mode == "sweep":
+					if self.rearm_at is not None and now >= self.rearm_at:
+						self.rearm_at = None
+						if self._arm():
+							continue
+					if now >= next_sweep:
+						self._sweep()
+						next_sweep = now + self.sweep_interval
+						if on_flush is not None:
+							on_flush(self)
+					stop.wait(min(1.0, max(next_sweep - now, 0.05)))
+					continue
+				try:
+					events = self.ino.read(timeout=max(next_flush - now, 0.05))
+				except OSError:
+					self._overflow()
+					continue
+				if any(ev.mask & inotify.IN_Q_OVERFLOW for ev in events):
+					self._overflow()
+					continue
+				for ev in events:
+					self._handle(ev)
+				if self.watch_limit_hit:
+					self._watch_limit()
+					continue
+				if time.monotonic() >= next_flush:
+					if self.flush() and on_flush is not None:
+						on_flush(self)
+					next_flush = time.monotonic() + self.flush_interval
+		finally:
+			if self.mode == "inotify":
+				self.flush()
+			self._disarm()
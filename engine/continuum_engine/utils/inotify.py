@@ -0,0 +1,120 @@
+from __future__ import annotations
+
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+from dataclasses import dataclass
+
+IN_ACCESS = 0x00000001
+IN_MODIFY = 0x00000002
+IN_ATTRIB = 0x00000004
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ONLYDIR = 0x01000000
+IN_ISDIR = 0x40000000
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+
+DIR_CHANGES = (
+	IN_MODIFY | IN_ATTRIB | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO
+	| IN_CREATE | IN_DELETE | IN_DELETE_SELF | IN_MOVE_SELF
+)
+
+_EVENT = struct.Struct("iIII")
+_libc = None
+
+
+def _load_libc():
+	global _libc
+	if _libc is None:
+		try:
+			libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+			libc.inotify_init1.argtypes = [ctypes.c_int]
+			libc.inotify_add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+			libc.inotify_rm_watch.argtypes = [ctypes.c_int, ctypes.c_int]
+			_libc = libc
+		except (OSError, AttributeError):
+			_libc = False
+	return _libc or None
+
+
+def inotify_available() -> bool:
+	return _load_libc() is not None
+
+
+@dataclass
+class Event:
+	wd: int
+	mask: int
+	cookie: int
+	name: str
+
+	@property
+	def is_dir(self) -> bool:
+		return bool(self.mask & IN_ISDIR)
+
+
+class Inotify:
+	def __init__(self):
+		libc = _load_libc()
+		if libc is None:
+			raise OSError("inotify is not available on this platform")
+		self._libc = libc
+		fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+		if fd < 0:
+			err = ctypes.get_errno()
+			raise OSError(err, os.strerror(err))
+		self.fd = fd
+		self.paths: dict[int, str] = {}
+
+	def fileno(self) -> int:
+		return self.fd
+
+	def add_watch(self, path: str, mask: int = DIR_CHANGES) -> int:
+		wd = self._libc.inotify_add_watch(self.fd, os.fsencode(path), mask)
+		if wd < 0:
+			err = ctypes.get_errno()
+			raise OSError(err, os.strerror(err), path)
+		self.paths[wd] = path
+		return wd
+
+	def rm_watch(self, wd: int) -> None:
+		self.paths.pop(wd, None)
+		self._libc.inotify_rm_watch(self.fd, wd)
+
+	def read(self, timeout: float | None = None) -> list[Event]:
+		ready, _, _ = select.select([self.fd], [], [], timeout)
+		if not ready:
+			return []
+		events: list[Event] = []
+		while True:
+			try:
+				buf = os.read(self.fd, 64 * 1024)
+			except BlockingIOError:
+				break
+			if not buf:
+				break
+			offset = 0
+			while offset + _EVENT.size <= len(buf):
+				wd, mask, cookie, length = _EVENT.unpack_from(buf, offset)
+				offset += _EVENT.size
+				name = buf[offset:offset + length].rstrip(b"\0").decode("utf-8", errors="surrogateescape")
+				offset += length
+				if mask & IN_IGNORED:
+					self.paths.pop(wd, None)
+				events.append(Event(wd, mask, cookie, name))
+		return events
+
+	def close(self) -> None:
+		if self.fd >= 0:
+			os.close(self.fd)
+			self.fd = -1
@@ -0,0 +1,110 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import socket
+import stat
+import tempfile
+from contextlib import contextmanager
+from pathlib import Path
+
+# AF_UNIX paths are capped at 108 bytes on Linux; longer workspace paths use a hashed name in the temp dir.
+MAX_SOCKET_PATH = 100
+
+
+def _fallback_dir() -> Path:
+	return Path(tempfile.gettempdir()) / f"continuum-{os.getuid()}"
+
+
+def runtime_dir() -> Path:
+	# Per-user and private: $XDG_RUNTIME_DIR when the session has one, else a 0700 dir in the temp dir.
+	xdg = os.environ.get("XDG_RUNTIME_DIR")
+	if xdg and os.path.isdir(xdg):
+		return Path(xdg)
+	return _fallback_dir()
+
+
+def socket_path(ws: Path, name: str) -> Path:
+	path = ws / ".continuum" / f"{name}.sock"
+	if len(str(path)) <= MAX_SOCKET_PATH:
+		return path
+	digest = hashlib.sha1(str(ws).encode("utf-8")).hexdigest()[:16]
+	return runtime_dir() / f"continuum-{name}-{digest}.sock"
+
+
+def prepare_listen(path: Path) -> None:
+	# Called by servers before binding: never take over a socket someone is still answering on, and
+	# only clear one left behind by a crash.
+	if path.parent == _fallback_dir():
+		path.parent.mkdir(mode=0o700, exist_ok=True)
+		st = os.lstat(path.parent)
+		if not stat.S_ISDIR(st.st_mode) or st.st_uid != os.getuid() or st.st_mode & 0o077:
+			raise RuntimeError(f"refusing to listen in {path.parent}: not a private directory owned by this user")
+	if not os.path.lexists(path):
+		return
+	probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+	probe.settimeout(1.0)
+	try:
+		probe.connect(str(path))
+	except OSError:
+		path.unlink(missing_ok=True)
+		return
+	finally:
+		probe.close()
+	raise RuntimeError(f"another server is already listening on {path}")
+
+
+@contextmanager
+def private_umask():
+	# bind() creates the socket file with the process umask; keep it owner-only from the start
+	# rather than chmod-ing it after other users could already have connected.
+	old = os.umask(0o077)
+	try:
+		yield
+	finally:
+		os.umask(old)
+
+
+def encode(obj) -> bytes:
+	return json.dumps(obj, separators=(",", ":"), default=str).encode("utf-8") + b"\n"
+
+
+def decode(line: bytes):
+	return json.loads(line.decode("utf-8"))
+
+
+class Connection:
+	def __init__(self, path: Path, timeout: float | None = 5.0):
+		self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+		self.sock.settimeout(timeout)
+		try:
+			self.sock.connect(str(path))
+		except OSError:
+			self.sock.close()
+			raise
+		self._reader = self.sock.makefile("rb")
+
+	def request(self, message: dict):
+		self.sock.sendall(encode(message))
+		line = self._reader.readline()
+		if not line:
+			raise ConnectionError("connection closed by peer")
+		return decode(line)
+
+	def close(self) -> None:
+		try:
+			self._reader.close()
+		finally:
+			self.sock.close()
+
+	def __enter__(self) -> "Connection":
+		return self
+
+	def __exit__(self, *exc) -> None:
+		self.close()
+
+
+def request(path: Path, message: dict, timeout: float | None = 5.0):
+	with Connection(path, timeout=timeout) as conn:
+		return conn.request(message)
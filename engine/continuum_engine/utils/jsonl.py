@@ -0,0 +1,63 @@
+from __future__ import annotations
+
+import json
+import os
+import sys
+from typing import Any, Iterable
+
+try:
+	import orjson  # type: ignore
+except Exception:
+	orjson = None
+
+
+def dumps_line(obj: Any) -> bytes:
+	if orjson is not None:
+		return orjson.dumps(obj, default=str, option=orjson.OPT_APPEND_NEWLINE)
+	return json.dumps(obj, separators=(",", ":"), default=str).encode("utf-8") + b"\n"
+
+
+class JsonlWriter:
+	def __init__(self, stream=None):
+		self.out = stream if stream is not None else sys.stdout.buffer
+		# Terminals see each record immediately; pipes get block-buffered writes.
+		self.line_flush = self.out.isatty() if hasattr(self.out, "isatty") else False
+		self.count = 0
+		self.closed = False
+
+	def write(self, obj: Any) -> None:
+		if self.closed:
+			return
+		try:
+			self.out.write(dumps_line(obj))
+			if self.line_flush:
+				self.out.flush()
+		except BrokenPipeError:
+			self._reader_gone()
+			return
+		self.count += 1
+
+	def close(self) -> None:
+		if self.closed:
+			return
+		try:
+			self.out.flush()
+		except BrokenPipeError:
+			self._reader_gone()
+
+	def _reader_gone(self) -> None:
+		# The reader (e.g. `head`) went away; point stdout at /dev/null so the interpreter's final flush stays quiet.
+		self.closed = True
+		devnull = os.open(os.devnull, os.O_WRONLY)
+		os.dup2(devnull, sys.stdout.fileno())
+		os.close(devnull)
+
+
+def write_jsonl(records: Iterable[Any], stream=None) -> int:
+	writer = JsonlWriter(stream)
+	for rec in records:
+		writer.write(rec)
+		if writer.closed:
+			break
+	writer.close()
+	return writer.count
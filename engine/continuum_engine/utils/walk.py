@@ -0,0 +1,83 @@
+from __future__ import annotations
+
+import os
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from pathlib import Path
+from typing import Any, Callable, Iterator
+
+EXCLUDE_DIRS = frozenset({".continuum", ".git", ".venv"})
+DEFAULT_JOBS = min(32, (os.cpu_count() or 1) + 4)
+
+# list_dir(abs_path, rel_path) -> (result, subdir_names)
+ListDir = Callable[[str, str], tuple]
+
+
+def scandir_listing(path: str, rel: str, exclude: frozenset[str] | set[str] = EXCLUDE_DIRS) -> tuple[list[tuple[str, os.stat_result]], list[str]]:
+	files: list[tuple[str, os.stat_result]] = []
+	dirs: list[str] = []
+	with os.scandir(path) as it:
+		for entry in it:
+			try:
+				if entry.is_dir():
+					if entry.name not in exclude and not entry.is_symlink():
+						dirs.append(entry.name)
+					continue
+				files.append((entry.name, entry.stat()))
+			except OSError:
+				continue
+	return files, dirs
+
+
+def walk(root: str | Path, list_dir: ListDir | None = None, jobs: int = DEFAULT_JOBS) -> Iterator[tuple[str, Any]]:
+	root = str(root)
+	if list_dir is None:
+		list_dir = scandir_listing
+	jobs = max(1, int(jobs))
+	if jobs == 1:
+		stack = [""]
+		while stack:
+			rel = stack.pop()
+			try:
+				result, subdirs = list_dir(os.path.join(root, rel) if rel else root, rel)
+			except OSError:
+				continue
+			stack.extend(os.path.join(rel, d) if rel else d for d in subdirs)
+			yield rel, result
+		return
+
+	pool = ThreadPoolExecutor(max_workers=jobs, thread_name_prefix="continuum-walk")
+	pending: dict = {}
+	try:
+		pending[pool.submit(list_dir, root, "")] = ""
+		while pending:
+			done, _ = wait(pending, return_when=FIRST_COMPLETED)
+			for fut in done:
+				rel = pending.pop(fut)
+				try:
+					result, subdirs = fut.result()
+				except OSError:
+					continue
+				for d in subdirs:
+					child = os.path.join(rel, d) if rel else d
+					pending[pool.submit(list_dir, os.path.join(root, child), child)] = child
+				yield rel, result
+	finally:
+		for fut in pending:
+			fut.cancel()
+		pool.shutdown(wait=True)
+
+
+def tree_stats(path: str | Path, jobs: int = DEFAULT_JOBS) -> tuple[int, int]:
+	# Total size plus the newest mtime anywhere below `path`; both come from the same stat calls.
+	total = 0
+	newest = 0
+	for _, files in walk(path, lambda p, r: scandir_listing(p, r, exclude=frozenset()), jobs=jobs):
+		for _, st in files:
+			total += st.st_size
+			if st.st_mtime_ns > newest:
+				newest = st.st_mtime_ns
+	return total, newest
+
+
+def tree_size(path: str | Path, jobs: int = DEFAULT_JOBS) -> int:
+	return tree_stats(path, jobs=jobs)[0]
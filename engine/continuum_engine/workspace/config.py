@@ -0,0 +1,61 @@
+from __future__ import annotations
+
+import re
+from pathlib import Path
+
+DEFAULT_STAGES = {
+	"stage1_raw_dir": "datasets/stage1_raw",
+	"stage2_curated_dir": "datasets/stage2_curated",
+	"stage3_annotated_dir": "datasets/stage3_annotated",
+}
+
+
+def _detab(text: str) -> str:
+	# DEFAULT_YAML indents with tabs, which YAML itself does not allow.
+	return re.sub(r"^\t+", lambda m: "  " * len(m.group(0)), text, flags=re.M)
+
+
+def _parse_simple(text: str) -> dict:
+	out: dict = {}
+	section: dict | None = None
+	for raw in text.splitlines():
+		line = raw.split("#", 1)[0].rstrip()
+		if not line.strip() or ":" not in line:
+			continue
+		key, _, value = line.strip().partition(":")
+		value = value.strip().strip('"').strip("'")
+		if line[0] in " \t" and section is not None:
+			section[key] = value
+		elif value:
+			out[key] = value
+			section = None
+		else:
+			section = out.setdefault(key, {})
+	return out
+
+
+def load_config(ws: Path) -> dict:
+	path = ws / "continuum.yaml"
+	if not path.exists():
+		return {}
+	text = _detab(path.read_text(encoding="utf-8"))
+	try:
+		import yaml  # type: ignore
+	except ImportError:
+		data = _parse_simple(text)
+	else:
+		try:
+			data = yaml.safe_load(text)
+		except yaml.YAMLError as e:
+			raise ValueError(f"invalid continuum.yaml: {' '.join(str(e).split())}") from None
+	return data if isinstance(data, dict) else {}
+
+
+def stage_dirs(ws: Path) -> dict[str, Path]:
+	stages = load_config(ws).get("stages") or {}
+	out = {}
+	for key, default in DEFAULT_STAGES.items():
+		value = stages.get(key) if isinstance(stages, dict) else None
+		p = Path(value or default).expanduser()
+		out[key] = p if p.is_absolute() else ws / p
+	return out
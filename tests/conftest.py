@@ -0,0 +1,20 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+from continuum_engine.workspace.layout import init_workspace
+
+
+@pytest.fixture(autouse=True)
+def _no_daemon(monkeypatch):
+	# Keep tests on the in-process code paths even if a developer has a daemon running.
+	monkeypatch.setenv("CONTINUUM_NO_DAEMON", "1")
+
+
+@pytest.fixture
+def ws(tmp_path: Path) -> Path:
+	root = tmp_path / "ws"
+	init_workspace(root)
+	return root
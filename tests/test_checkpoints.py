@@ -0,0 +1,35 @@
+from __future__ import annotations
+
+import json
+import os
+import time
+
+from continuum_engine.checkpoints import checkpoints_root, list_checkpoints, update_checkpoints
+
+
+def _manifest(ws) -> dict:
+	return json.loads((ws / ".continuum" / "state" / "checkpoints.json").read_text(encoding="utf-8"))["entries"]
+
+
+def test_watcher_update_settles_only_quiet_directories(ws):
+	root = checkpoints_root(ws)
+	old_ns = time.time_ns() - 3600 * 10**9
+	for name in ("fresh", "quiet"):
+		(root / name).mkdir(parents=True)
+		(root / name / "w.bin").write_bytes(b"x" * 10)
+	os.utime(root / "quiet", ns=(old_ns, old_ns))
+	update_checkpoints(ws, {"fresh": (10, time.time_ns()), "quiet": (10, old_ns)})
+	entries = _manifest(ws)
+	assert entries["fresh"]["settled"] is False
+	assert entries["quiet"]["settled"] is True
+
+
+def test_unsettled_watcher_entry_is_measured_again(ws):
+	root = checkpoints_root(ws)
+	(root / "ck").mkdir(parents=True)
+	(root / "ck" / "w.bin").write_bytes(b"x" * 10)
+	update_checkpoints(ws, {"ck": (10, time.time_ns())})
+	# Grows in place: the directory mtime stays put, so only a re-measure picks this up.
+	with open(root / "ck" / "w.bin", "ab") as f:
+		f.write(b"x" * 90)
+	assert [e["size_bytes"] for e in list_checkpoints(ws)] == [100]
@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+import os
+from types import SimpleNamespace
+
+from continuum_engine.scan import scan_workspace
+from continuum_engine.scan.dedup import consolidate, find_duplicates
+
+BLOB = bytes(range(256)) * 64
+
+
+def _dupes(ws):
+	data = ws / "dups"
+	data.mkdir()
+	(data / "a.bin").write_bytes(BLOB)
+	(data / "b.bin").write_bytes(BLOB)
+	scan_workspace(ws, want_hash=True)
+	report = find_duplicates(ws)
+	assert report["duplicate_files"] == 1
+	return data / "a.bin", data / "b.bin", report
+
+
+def test_hardlink_merges_copies(ws):
+	a, b, report = _dupes(ws)
+	result = consolidate(ws, report, "hardlink")
+	assert (result["linked"], result["bytes"], result["skipped"]) == (1, len(BLOB), 0)
+	assert os.stat(a).st_ino == os.stat(b).st_ino
+	assert b.read_bytes() == BLOB
+
+
+def test_skips_copy_changed_after_report(ws):
+	a, b, report = _dupes(ws)
+	b.write_bytes(BLOB[::-1])
+	result = consolidate(ws, report, "hardlink")
+	assert (result["linked"], result["skipped"]) == (0, 1)
+	assert b.read_bytes() == BLOB[::-1]
+	assert os.stat(a).st_ino != os.stat(b).st_ino
+
+
+def test_skips_symlinked_copy(ws):
+	a, b, report = _dupes(ws)
+	other = ws / "other.bin"
+	other.write_bytes(BLOB)
+	b.unlink()
+	b.symlink_to(other)
+	result = consolidate(ws, report, "hardlink")
+	assert (result["linked"], result["skipped"]) == (0, 1)
+	assert b.is_symlink() and os.stat(other).st_ino != os.stat(a).st_ino
+
+
+def test_hardlink_skips_other_device(ws, monkeypatch):
+	a, b, report = _dupes(ws)
+	real = os.lstat
+
+	def lstat(path, *args, **kwargs):
+		st = real(path, *args, **kwargs)
+		if str(path) == str(b):
+			return SimpleNamespace(st_mode=st.st_mode, st_size=st.st_size, st_dev=st.st_dev + 1, st_ino=st.st_ino)
+		return st
+
+	monkeypatch.setattr(os, "lstat", lstat)
+	result = consolidate(ws, report, "hardlink")
+	assert (result["linked"], result["skipped"]) == (0, 1)
+	assert real(a).st_ino != real(b).st_ino
+
+
+def test_dry_run_leaves_files_untouched(ws):
+	a, b, report = _dupes(ws)
+	before = [os.stat(p) for p in (a, b)]
+	result = consolidate(ws, report, "hardlink", dry_run=True)
+	assert (result["dry_run"], result["linked"]) == (True, 1)
+	after = [os.stat(p) for p in (a, b)]
+	assert [(st.st_ino, st.st_nlink, st.st_mtime_ns) for st in after] == [(st.st_ino, st.st_nlink, st.st_mtime_ns) for st in before]
+	assert not list((ws / "dups").glob("*.continuum-dedup"))
@@ -0,0 +1,61 @@
+from __future__ import annotations
+
+from continuum_engine.install.bench import make_status
+from continuum_engine.install.dpkg import DpkgSnapshot, is_installed, parse_status
+
+STATUS = """Package: git
+Status: hold ok installed
+Architecture: amd64
+
+Package: libc6
+Status: deinstall ok config-files
+Architecture: i386
+Multi-Arch: same
+
+Package: libc6
+Status: install ok installed
+Architecture: amd64
+Multi-Arch: same
+
+Package: curl
+Status: deinstall ok config-files
+Architecture: amd64
+
+Package: tzdata
+Status: install ok installed
+Architecture: all
+Description: time zone data
+ Status: indented continuation lines are ignored
+"""
+
+
+def test_held_packages_count_as_installed():
+	assert is_installed("hold ok installed")
+	assert is_installed("install ok installed")
+	assert not is_installed("deinstall ok config-files")
+	assert not is_installed("install ok half-configured")
+	assert not is_installed(None)
+
+
+def test_multi_arch_stanzas_do_not_overwrite_each_other():
+	packages = parse_status(STATUS)
+	assert is_installed(packages["libc6"])
+	assert is_installed(packages["libc6:amd64"])
+	assert not is_installed(packages["libc6:i386"])
+	assert "tzdata:all" not in packages
+
+
+def test_snapshot_rereads_changed_status_file(tmp_path):
+	path = tmp_path / "status"
+	path.write_text(STATUS, encoding="utf-8")
+	snap = DpkgSnapshot(path)
+	assert snap.installed("git") and not snap.installed("curl")
+	path.write_text(STATUS.replace("Package: curl\nStatus: deinstall ok config-files", "Package: curl\nStatus: install ok installed"), encoding="utf-8")
+	assert snap.installed("curl")
+
+
+def test_bench_fixture_marks_every_checked_package_installed(tmp_path):
+	path = tmp_path / "status"
+	make_status(path, extra=10)
+	packages = parse_status(path.read_text(encoding="utf-8"))
+	assert all(is_installed(packages[name]) for name in ("git", "curl", "nodejs", "python3"))
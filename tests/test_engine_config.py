@@ -0,0 +1,36 @@
+from __future__ import annotations
+
+import pytest
+
+from continuum_engine.cli import main
+from continuum_engine.workspace.config import load_config
+
+
+@pytest.fixture
+def engine_ws(ws):
+	app = ws / "external" / "model_data_1o" / "app"
+	app.mkdir(parents=True)
+	(app / "run_all.py").write_text("print('ran')\n", encoding="utf-8")
+	return ws
+
+
+def test_malformed_yaml_raises_value_error(ws):
+	pytest.importorskip("yaml")
+	(ws / "continuum.yaml").write_text("engine:\n  shardable: [true\n", encoding="utf-8")
+	with pytest.raises(ValueError, match="^invalid continuum.yaml: "):
+		load_config(ws)
+
+
+def test_engine_shards_reports_malformed_yaml(engine_ws, capsys):
+	pytest.importorskip("yaml")
+	(engine_ws / "continuum.yaml").write_text("engine: {shardable: true\n", encoding="utf-8")
+	assert main(["engine", "--workspace", str(engine_ws), "--shards", "2"]) == 1
+	out = capsys.readouterr().out
+	assert "[err] invalid continuum.yaml: " in out
+	assert "Traceback" not in out
+
+
+def test_engine_shards_requires_opt_in(engine_ws, capsys):
+	(engine_ws / "continuum.yaml").write_text("engine:\n  shardable: false\n", encoding="utf-8")
+	assert main(["engine", "--workspace", str(engine_ws), "--shards", "2"]) == 1
+	assert "[err] Sharded mode is opt-in" in capsys.readouterr().out
@@ -0,0 +1,122 @@
+from __future__ import annotations
+
+import os
+import subprocess
+import sys
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+from continuum_engine.infer.client import SOCKET_NAME, stop_server, submit
+from continuum_engine.infer.server import MicroBatcher, load_script
+from continuum_engine.utils.ipc import socket_path
+
+ENGINE = Path(__file__).resolve().parent.parent / "engine"
+
+# CPU-only stand-in for a served model: doubles numbers, rejects the input "bad", and records
+# the size of every predict() call so tests can see how requests were batched.
+STUB_MODEL = """
+def load():
+	return {"scale": 2, "calls": []}
+
+def predict(model, inputs):
+	model["calls"].append(len(inputs))
+	for x in inputs:
+		if x == "bad":
+			raise ValueError(f"cannot score {x!r}")
+	return [x * model["scale"] for x in inputs]
+"""
+
+
+@pytest.fixture
+def script(tmp_path: Path) -> Path:
+	path = tmp_path / "stub_model.py"
+	path.write_text(STUB_MODEL, encoding="utf-8")
+	return path
+
+
+@pytest.fixture
+def batcher(script):
+	module = load_script(script)
+	b = MicroBatcher(module.predict, module.load(), max_batch_size=16, max_wait_ms=200)
+	b.start()
+	yield b
+	b.stop()
+
+
+def _submit_together(b: MicroBatcher, requests: list[list]) -> list[list]:
+	barrier = threading.Barrier(len(requests))
+	results: list = [None] * len(requests)
+
+	def client(i: int) -> None:
+		barrier.wait()
+		slots = b.submit(requests[i])
+		for slot in slots:
+			slot.done.wait(5)
+		results[i] = slots
+
+	threads = [threading.Thread(target=client, args=(i,)) for i in range(len(requests))]
+	for t in threads:
+		t.start()
+	for t in threads:
+		t.join()
+	return results
+
+
+def test_concurrent_requests_share_batches(batcher):
+	results = _submit_together(batcher, [[i, i + 100] for i in range(6)])
+	for i, slots in enumerate(results):
+		assert [s.error for s in slots] == [None, None]
+		assert [s.output for s in slots] == [2 * i, 2 * (i + 100)]
+	assert batcher.stats["items"] == 12
+	assert batcher.stats["batches"] < 12
+	assert batcher.stats["max_batch"] > 2
+
+
+def test_bad_input_fails_only_its_own_request(batcher):
+	results = _submit_together(batcher, [[1, 2], ["bad"], [3]])
+	assert batcher.stats["max_batch"] == 4
+	assert [s.output for s in results[0]] == [2, 4]
+	assert [s.output for s in results[2]] == [6]
+	assert all(s.error is None for s in results[0] + results[2])
+	assert "cannot score 'bad'" in results[1][0].error
+	assert batcher.stats["errors"] == 1
+
+
+def test_server_over_socket(ws, script):
+	env = dict(os.environ, PYTHONPATH=str(ENGINE))
+	proc = subprocess.Popen(
+		[sys.executable, "-m", "continuum_engine.infer.server", "--workspace", str(ws), "--script", str(script), "--max-wait-ms", "100"],
+		env=env, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True,
+	)
+	try:
+		sock = socket_path(ws, SOCKET_NAME)
+		deadline = time.monotonic() + 10
+		while not sock.exists() and time.monotonic() < deadline:
+			time.sleep(0.05)
+		assert sock.exists(), "inference server did not come up"
+
+		outputs: dict[int, object] = {}
+
+		def client(i: int) -> None:
+			try:
+				outputs[i] = list(submit(ws, ["bad"] if i == 0 else [i, i * 10], timeout=10))
+			except RuntimeError as e:
+				outputs[i] = str(e)
+
+		threads = [threading.Thread(target=client, args=(i,)) for i in range(4)]
+		for t in threads:
+			t.start()
+		for t in threads:
+			t.join()
+		assert "cannot score 'bad'" in outputs[0]
+		for i in range(1, 4):
+			assert outputs[i] == [2 * i, 20 * i]
+		assert stop_server(ws)
+		assert proc.wait(timeout=10) == 0
+	finally:
+		if proc.poll() is None:
+			proc.kill()
+			proc.wait()
@@ -0,0 +1,143 @@
+from __future__ import annotations
+
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from continuum_engine.ollama.inventory import ModelInventory, OllamaHTTP, full_digest, model_key
+
+MODELS = [
+	{"name": "phi3:mini", "digest": "4f2222927938" + "0" * 52},
+	{"name": "goekdenizguelmez/JOSIEFIED-Qwen3:latest", "digest": "a1b2c3d4e5f6" + "0" * 52},
+]
+
+
+class StubServer(ThreadingHTTPServer):
+	daemon_threads = True
+
+	def __init__(self):
+		super().__init__(("127.0.0.1", 0), StubHandler)
+		self.calls: list[tuple[str, str]] = []
+		self.peers: set[int] = set()
+
+
+class StubHandler(BaseHTTPRequestHandler):
+	protocol_version = "HTTP/1.1"
+
+	def log_message(self, *args) -> None:
+		pass
+
+	def _reply(self, status: int, payload: dict) -> None:
+		body = json.dumps(payload).encode("utf-8")
+		self.send_response(status)
+		self.send_header("Content-Type", "application/json")
+		self.send_header("Content-Length", str(len(body)))
+		self.end_headers()
+		self.wfile.write(body)
+
+	def do_GET(self) -> None:
+		self.server.calls.append(("GET", self.path))
+		self.server.peers.add(self.client_address[1])
+		if self.path == "/api/tags":
+			self._reply(200, {"models": MODELS})
+		else:
+			self._reply(404, {"error": "not found"})
+
+	def do_POST(self) -> None:
+		payload = json.loads(self.rfile.read(int(self.headers.get("Content-Length") or 0)) or b"{}")
+		self.server.calls.append(("POST", self.path))
+		self.server.peers.add(self.client_address[1])
+		if self.path == "/api/show" and model_key(payload.get("model", "")) in {m["name"] for m in MODELS}:
+			self._reply(200, {"details": {}})
+		else:
+			self._reply(404, {"error": f"model '{payload.get('model')}' not found"})
+
+
+@pytest.fixture
+def server():
+	srv = StubServer()
+	thread = threading.Thread(target=srv.serve_forever, daemon=True)
+	thread.start()
+	yield srv
+	srv.shutdown()
+	srv.server_close()
+
+
+@pytest.fixture
+def inventory(server):
+	inv = ModelInventory(ttl=60, client=OllamaHTTP("127.0.0.1", server.server_address[1]))
+	yield inv
+	inv.client.close()
+
+
+def test_tags_are_memoized_within_ttl(server, inventory):
+	ok, models, err = inventory.list_models()
+	assert ok and err is None
+	assert models == {"phi3:mini", "goekdenizguelmez/JOSIEFIED-Qwen3:latest"}
+	assert inventory.has("goekdenizguelmez/JOSIEFIED-Qwen3")
+	assert inventory.digest("phi3:mini") == MODELS[0]["digest"]
+	assert server.calls == [("GET", "/api/tags")]
+	assert inventory.cli_calls == 0
+
+
+def test_invalidate_refetches(server, inventory):
+	inventory.list_models()
+	inventory.invalidate()
+	inventory.list_models()
+	assert server.calls.count(("GET", "/api/tags")) == 2
+
+
+def test_ttl_expiry_refetches(server):
+	inv = ModelInventory(ttl=0, client=OllamaHTTP("127.0.0.1", server.server_address[1]))
+	inv.list_models()
+	inv.list_models()
+	assert server.calls.count(("GET", "/api/tags")) == 2
+
+
+def test_show_answers_from_fresh_tags(server, inventory):
+	inventory.list_models()
+	assert inventory.show("phi3:mini")
+	assert not inventory.show("llama3")
+	assert ("POST", "/api/show") not in server.calls
+
+
+def test_show_without_tags_uses_api_and_memoizes(server, inventory):
+	assert inventory.show("phi3:mini")
+	assert not inventory.show("missing:7b")
+	assert inventory.show("phi3:mini")
+	assert server.calls == [("POST", "/api/show"), ("POST", "/api/show")]
+
+
+def test_requests_share_one_keep_alive_connection(server, inventory):
+	inventory.show("missing:1b")
+	inventory.list_models()
+	inventory.invalidate()
+	inventory.list_models()
+	assert len(server.calls) == 3
+	assert len(server.peers) == 1
+
+
+def test_unreachable_daemon_falls_back_to_cli(monkeypatch):
+	monkeypatch.setenv("PATH", "")
+	inv = ModelInventory(client=OllamaHTTP("127.0.0.1", 9, timeout=0.5))
+	ok, models, err = inv.list_models()
+	assert not ok and models == set()
+	assert "ollama not installed" in err
+
+
+@pytest.mark.parametrize("name,key", [("phi3", "phi3:latest"), ("phi3:mini", "phi3:mini"), ("host:5000/ns/m", "host:5000/ns/m:latest")])
+def test_model_key(name, key):
+	assert model_key(name) == key
+
+
+@pytest.mark.parametrize("raw,digest", [
+	("4f2222927938" + "0" * 52, "4f2222927938" + "0" * 52),
+	("sha256:4F2222927938" + "0" * 52, "4f2222927938" + "0" * 52),
+	("4f2222927938", None),
+	(None, None),
+])
+def test_full_digest(raw, digest):
+	# `ollama list` only prints a 12-digit id; it must not stand in for the full digest.
+	assert full_digest(raw) == digest
@@ -0,0 +1,92 @@
+from __future__ import annotations
+
+import os
+import socket
+import socketserver
+import stat
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+from continuum_engine.utils import ipc
+from continuum_engine.utils.ipc import prepare_listen, private_umask, request, socket_path
+
+ENGINE = Path(__file__).resolve().parent.parent / "engine"
+
+
+class _Echo(socketserver.StreamRequestHandler):
+	def handle(self) -> None:
+		for line in self.rfile:
+			self.wfile.write(line)
+
+
+@pytest.fixture
+def server(tmp_path):
+	path = tmp_path / "s.sock"
+	with private_umask():
+		srv = socketserver.UnixStreamServer(str(path), _Echo)
+	yield path, srv
+	srv.server_close()
+
+
+def test_socket_is_owner_only_from_bind(server):
+	path, _ = server
+	assert stat.S_IMODE(os.stat(path).st_mode) & 0o077 == 0
+
+
+def test_prepare_listen_refuses_live_socket(server):
+	path, _ = server
+	with pytest.raises(RuntimeError, match="already listening"):
+		prepare_listen(path)
+	assert path.exists()
+
+
+def test_prepare_listen_clears_stale_socket(tmp_path):
+	path = tmp_path / "stale.sock"
+	sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+	sock.bind(str(path))
+	sock.close()
+	prepare_listen(path)
+	assert not os.path.lexists(path)
+
+
+def test_long_paths_use_the_user_runtime_dir(tmp_path, monkeypatch):
+	ws = tmp_path / ("w" * 120)
+	monkeypatch.setenv("XDG_RUNTIME_DIR", str(tmp_path))
+	assert socket_path(ws, "daemon").parent == tmp_path
+
+
+def test_temp_fallback_dir_is_private(tmp_path, monkeypatch):
+	monkeypatch.delenv("XDG_RUNTIME_DIR", raising=False)
+	monkeypatch.setattr(ipc.tempfile, "gettempdir", lambda: str(tmp_path))
+	path = socket_path(tmp_path / ("w" * 120), "daemon")
+	assert path.parent == tmp_path / f"continuum-{os.getuid()}"
+	prepare_listen(path)
+	assert stat.S_IMODE(os.stat(path.parent).st_mode) == 0o700
+	os.chmod(path.parent, 0o755)
+	with pytest.raises(RuntimeError, match="not a private directory"):
+		prepare_listen(path)
+
+
+def test_second_daemon_does_not_orphan_the_first(ws):
+	env = dict(os.environ, PYTHONPATH=str(ENGINE))
+	env.pop("CONTINUUM_NO_DAEMON", None)
+	cmd = [sys.executable, "-m", "continuum_engine.cli", "daemon", "run", "--workspace", str(ws)]
+	first = subprocess.Popen(cmd, env=env, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True)
+	try:
+		sock = socket_path(ws, "daemon")
+		deadline = time.monotonic() + 10
+		while not sock.exists() and time.monotonic() < deadline:
+			time.sleep(0.05)
+		pid = request(sock, {"op": "ping"})["result"]["pid"]
+		second = subprocess.run(cmd, env=env, capture_output=True, text=True, timeout=20)
+		assert second.returncode == 1
+		assert "[err] another server is already listening" in second.stdout
+		assert request(sock, {"op": "ping"})["result"]["pid"] == pid
+		assert stat.S_IMODE(os.stat(sock).st_mode) & 0o077 == 0
+	finally:
+		first.terminate()
+		first.wait(timeout=10)
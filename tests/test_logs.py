@@ -0,0 +1,110 @@
+from __future__ import annotations
+
+import gzip
+import threading
+import time
+
+import pytest
+
+from continuum_engine.runs import logs
+from continuum_engine.runs.logs import RotatingLog, follow, log_segments, resolve_compress, tail_lines, tail_with_position
+
+
+def _line(i: int) -> bytes:
+	return f"line {i:05d} ".encode("ascii") + b"x" * 40 + b"\n"
+
+
+def _write(log: RotatingLog, lines: range) -> None:
+	for i in lines:
+		log.write(_line(i))
+
+
+def _expected(lines: range) -> list[str]:
+	return [_line(i).decode("ascii").rstrip("\n") for i in lines]
+
+
+def test_rotation_keeps_backups_and_drops_oldest(tmp_path):
+	path = tmp_path / "stdout.log"
+	log = RotatingLog(path, max_bytes=1000, backups=3)
+	_write(log, range(200))
+	log.close()
+	segments = log_segments(path)
+	assert [p.name for p in segments] == ["stdout.log", "stdout.log.1", "stdout.log.2", "stdout.log.3"]
+	assert all(p.stat().st_size <= 1000 + len(_line(0)) for p in segments)
+	assert not (tmp_path / "stdout.log.4").exists()
+
+
+def test_gzip_segments_compress_in_background_and_tail_spans_them(tmp_path):
+	path = tmp_path / "stdout.log"
+	log = RotatingLog(path, max_bytes=1000, backups=5, compress="gzip")
+	_write(log, range(100))
+	log.close()
+	names = [p.name for p in log_segments(path)]
+	assert names[1:] == [f"stdout.log.{i}.gz" for i in range(1, 6)]
+	assert not list(tmp_path.glob("*.pending")) and not list(tmp_path.glob("*.tmp"))
+	newest = gzip.decompress((tmp_path / "stdout.log.1.gz").read_bytes()).decode("ascii").splitlines()
+	live = path.read_text(encoding="ascii").splitlines()
+	assert newest + live == _expected(range(100))[-len(newest) - len(live):]
+	# More lines than the live file holds come out of the compressed segments, in order.
+	assert tail_lines(path, 40) == _expected(range(60, 100))
+
+
+def test_tail_reads_pending_segments(tmp_path):
+	path = tmp_path / "stdout.log"
+	path.write_bytes(b"".join(_line(i) for i in range(5, 8)))
+	(tmp_path / "stdout.log.2.pending").write_bytes(b"".join(_line(i) for i in range(2, 5)))
+	(tmp_path / "stdout.log.1").write_bytes(b"".join(_line(i) for i in range(0, 2)))
+	assert tail_lines(path, 8) == _expected(range(8))
+
+
+def test_follow_resumes_where_the_tail_ended(tmp_path):
+	path = tmp_path / "stdout.log"
+	log = RotatingLog(path, max_bytes=0)
+	_write(log, range(10))
+	lines, position = tail_with_position(path, 3)
+	assert lines == _expected(range(7, 10))
+	# Written after the tail was read but before follow() opened the file.
+	_write(log, range(10, 15))
+	log.close()
+	assert list(follow(path, lambda: True, poll=0.01, start=position)) == _expected(range(10, 15))
+
+
+def test_follow_resumes_after_rotation_between_tail_and_follow(tmp_path):
+	path = tmp_path / "stdout.log"
+	log = RotatingLog(path, max_bytes=1000, backups=3)
+	_write(log, range(5))
+	_, position = tail_with_position(path, 5)
+	_write(log, range(5, 30))
+	log.close()
+	assert list(follow(path, lambda: True, poll=0.01, start=position)) == _expected(range(5, 30))
+
+
+@pytest.mark.parametrize("compress", [None, "gzip"])
+def test_follow_across_rotations(tmp_path, compress):
+	path = tmp_path / "stdout.log"
+	log = RotatingLog(path, max_bytes=1000, backups=5, compress=compress)
+	_write(log, range(3))
+	_, position = tail_with_position(path, 0)
+	done = threading.Event()
+
+	def writer() -> None:
+		for i in range(3, 200):
+			log.write(_line(i))
+			if i % 10 == 0:
+				time.sleep(0.02)
+		log.close()
+		done.set()
+
+	t = threading.Thread(target=writer)
+	t.start()
+	got = list(follow(path, done.is_set, poll=0.005, start=position))
+	t.join()
+	assert got == _expected(range(3, 200))
+
+
+def test_zstd_fallback_warns_on_stderr(monkeypatch, capsys):
+	monkeypatch.setattr(logs, "_zstd", lambda: None)
+	assert resolve_compress("zstd") == "gzip"
+	out = capsys.readouterr()
+	assert out.out == ""
+	assert out.err.startswith("[warn] zstandard not installed")
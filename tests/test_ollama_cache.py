@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+import asyncio
+import sqlite3
+
+import pytest
+
+from continuum_engine.ollama.bench import StubOllama
+from continuum_engine.ollama.cache import ResponseCache, cache_path, open_cache
+from continuum_engine.ollama.client import AsyncOllamaClient
+from continuum_engine.ollama.manifests import manifest_relpath
+
+MODEL = "stub-json:latest"
+
+
+@pytest.fixture
+def manifest(tmp_path, monkeypatch):
+	# The cache key needs a model digest; an on-disk manifest provides one without a daemon.
+	models = tmp_path / "ollama-models"
+	monkeypatch.setenv("OLLAMA_MODELS", str(models))
+	path = models / manifest_relpath(MODEL)
+	path.parent.mkdir(parents=True)
+	path.write_text('{"layers": ["v1"]}', encoding="utf-8")
+	return path
+
+
+async def _generate(ws, prompts: list[tuple[str, dict | None]], rewrite=None) -> dict:
+	stub = StubOllama(tokens=4, token_ms=0.5)
+	port = await stub.start()
+	try:
+		async with AsyncOllamaClient(host="127.0.0.1", port=port, workspace=ws) as client:
+			results = []
+			for i, (prompt, options) in enumerate(prompts):
+				if rewrite is not None and i == len(prompts) // 2:
+					rewrite()
+					client._digests.clear()
+				results.append(await client.generate(MODEL, prompt, options))
+			return {"results": results, "stats": dict(client.stats)}
+	finally:
+		await stub.close()
+
+
+def test_deterministic_request_is_served_from_cache(ws, manifest):
+	out = asyncio.run(_generate(ws, [("hi", {"temperature": 0}), ("hi", {"temperature": 0})]))
+	first, second = out["results"]
+	assert second == first and first["done"]
+	assert out["stats"]["requests"] == 1
+	assert out["stats"]["cache_hits"] == 1
+
+
+def test_sampled_requests_are_not_cached(ws, manifest):
+	out = asyncio.run(_generate(ws, [("hi", None), ("hi", {"temperature": 0.8})] * 2))
+	assert out["stats"]["requests"] == 4
+	assert out["stats"]["cache_hits"] == out["stats"]["cache_misses"] == 0
+	cache = open_cache(ws)
+	try:
+		assert cache.stats()["entries"] == 0
+	finally:
+		cache.close()
+
+
+def test_recreated_model_misses(ws, manifest):
+	out = asyncio.run(_generate(
+		ws, [("hi", {"seed": 1}), ("hi", {"seed": 1})],
+		rewrite=lambda: manifest.write_text('{"layers": ["v2"]}', encoding="utf-8"),
+	))
+	assert out["stats"]["requests"] == 2
+	assert out["stats"]["cache_hits"] == 0
+
+
+def test_workspace_client_owns_its_cache(ws):
+	async def open_and_close():
+		client = AsyncOllamaClient(workspace=ws)
+		cache = client.cache
+		await client.aclose()
+		return cache
+
+	cache = asyncio.run(open_and_close())
+	assert cache.path == cache_path(ws) and cache.path.exists()
+	with pytest.raises(sqlite3.ProgrammingError):
+		cache.stats()
+
+
+def test_passed_cache_is_left_open(ws):
+	cache = open_cache(ws)
+
+	async def use():
+		async with AsyncOllamaClient(workspace=ws, cache=cache) as client:
+			return client.cache
+
+	try:
+		assert asyncio.run(use()) is cache
+		assert cache.stats()["entries"] == 0
+	finally:
+		cache.close()
+
+
+def test_eviction_keeps_total_under_budget(tmp_path):
+	cache = ResponseCache(tmp_path / "ollama.db", max_bytes=2000)
+	try:
+		for i in range(50):
+			cache.put(f"k{i}", MODEL, {"response": "x" * 100, "i": i})
+		# Touching an old entry makes it recently used, so it survives the next evictions.
+		assert cache.get("k45") is not None
+		for i in range(50, 55):
+			cache.put(f"k{i}", MODEL, {"response": "x" * 100, "i": i})
+		stats = cache.stats()
+		assert stats["bytes"] <= 2000
+		assert stats["evictions"] > 0
+		assert cache.get("k0") is None
+		assert cache.get("k45") is not None
+		assert cache.get("k54")["i"] == 54
+	finally:
+		cache.close()
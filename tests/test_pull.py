@@ -0,0 +1,97 @@
+from __future__ import annotations
+
+import json
+import os
+import stat
+import sys
+import time
+
+import pytest
+
+from continuum_engine.pull import manager as pull_manager
+from continuum_engine.pull.manager import PullContext
+
+# Stand-in for the ollama CLI: `ollama pull <model>` redraws a progress bar with \r for the
+# configured number of seconds, failing the first `fail` attempts (counted in a state file).
+STUB_OLLAMA = """#!{python}
+import json, os, sys, time
+plan = json.load(open(os.environ["STUB_OLLAMA_PLAN"]))
+model = sys.argv[2]
+spec = plan[model]
+counter = os.path.join(os.environ["STUB_OLLAMA_STATE"], model.replace("/", "_").replace(":", "_"))
+attempt = int(open(counter).read()) + 1 if os.path.exists(counter) else 1
+open(counter, "w").write(str(attempt))
+sys.stdout.write("pulling manifest\\n")
+steps = 10
+for i in range(1, steps + 1):
+	time.sleep(spec["seconds"] / steps)
+	sys.stdout.write(f"\\rpulling 8eeb52dfb3bb... {{i * 100 // steps}}% ▕████▏")
+	sys.stdout.flush()
+	if attempt <= spec.get("fail", 0) and i == steps // 2:
+		sys.stdout.write("\\nError: max retries exceeded: connection reset\\n")
+		sys.exit(1)
+sys.stdout.write("\\nsuccess\\n")
+"""
+
+
+@pytest.fixture
+def stub_ollama(tmp_path, monkeypatch):
+	bin_dir = tmp_path / "bin"
+	state = tmp_path / "state"
+	bin_dir.mkdir()
+	state.mkdir()
+	script = bin_dir / "ollama"
+	script.write_text(STUB_OLLAMA.format(python=sys.executable), encoding="utf-8")
+	script.chmod(script.stat().st_mode | stat.S_IEXEC)
+	plan_path = tmp_path / "plan.json"
+	monkeypatch.setenv("PATH", f"{bin_dir}{os.pathsep}{os.environ.get('PATH', '')}")
+	monkeypatch.setenv("STUB_OLLAMA_PLAN", str(plan_path))
+	monkeypatch.setenv("STUB_OLLAMA_STATE", str(state))
+
+	def configure(plan: dict) -> None:
+		plan_path.write_text(json.dumps(plan), encoding="utf-8")
+
+	return configure
+
+
+def _ctx(ws, jobs=3, retries=0) -> PullContext:
+	return PullContext(workspace=ws, dry_run=False, debug=False, yes=True, jobs=jobs, retries=retries)
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="stand-in ollama is a shebang script")
+def test_concurrent_pull_time_tracks_longest_model(ws, stub_ollama, capsys):
+	durations = {"a:1b": 0.6, "b:3b": 1.2, "c:7b": 0.9}
+	stub_ollama({m: {"seconds": s} for m, s in durations.items()})
+	started = time.monotonic()
+	failed = pull_manager._pull_models(list(durations), _ctx(ws, jobs=3))
+	elapsed = time.monotonic() - started
+	assert failed == {}
+	# Concurrent: close to the longest pull, well under the 2.7s a sequential loop would take.
+	assert elapsed < max(durations.values()) + 0.8, elapsed
+	out = capsys.readouterr().out
+	for model in durations:
+		assert f"[pull] {model}: pulling 8eeb52dfb3bb... 100%" in out
+		assert f"[ok] {model} pulled" in out
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="stand-in ollama is a shebang script")
+def test_pull_jobs_limit_serializes(ws, stub_ollama):
+	stub_ollama({"a:1b": {"seconds": 0.4}, "b:1b": {"seconds": 0.4}})
+	started = time.monotonic()
+	assert pull_manager._pull_models(["a:1b", "b:1b"], _ctx(ws, jobs=1)) == {}
+	assert time.monotonic() - started >= 0.8
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="stand-in ollama is a shebang script")
+def test_failed_pull_is_retried(ws, stub_ollama, monkeypatch, capsys):
+	stub_ollama({"flaky:1b": {"seconds": 0.2, "fail": 1}, "broken:1b": {"seconds": 0.1, "fail": 99}})
+	sleeps = []
+	monkeypatch.setattr(pull_manager.time, "sleep", sleeps.append)
+	failed = pull_manager._pull_models(["flaky:1b", "broken:1b"], _ctx(ws, jobs=2, retries=2))
+	assert list(failed) == ["broken:1b"]
+	assert "max retries exceeded" in failed["broken:1b"]
+	out = capsys.readouterr().out
+	assert "[warn] flaky:1b: pull failed" in out
+	assert "[ok] flaky:1b pulled" in out
+	# One backoff for flaky, two for broken; each grows with the attempt number.
+	assert len(sleeps) == 3 and all(d >= 2 for d in sleeps)
@@ -0,0 +1,51 @@
+from __future__ import annotations
+
+import multiprocessing as mp
+import sys
+
+import pytest
+
+from continuum_engine.runs.manager import count_runs, create_run, list_runs, query_runs
+
+WORKERS = 64
+
+
+def _create(ws, barrier, results) -> None:
+	barrier.wait()
+	try:
+		results.put(create_run(ws, "stress").run_id)
+	except Exception as e:
+		results.put(f"error: {e!r}")
+
+
+def _run_concurrently(ws, workers: int) -> list[str]:
+	ctx = mp.get_context("fork" if sys.platform != "win32" else "spawn")
+	barrier = ctx.Barrier(workers)
+	results = ctx.Queue()
+	procs = [ctx.Process(target=_create, args=(ws, barrier, results)) for _ in range(workers)]
+	for p in procs:
+		p.start()
+	ids = [results.get(timeout=60) for _ in procs]
+	for p in procs:
+		p.join(timeout=60)
+	return ids
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="run ID allocation locks with fcntl")
+def test_concurrent_create_run_ids_are_unique(ws):
+	count_runs(ws)  # build the index so every process also upserts into it
+	ids = _run_concurrently(ws, WORKERS)
+	assert [i for i in ids if i.startswith("error")] == []
+	assert len(set(ids)) == WORKERS
+	# IDs stay dense: the counter hands out 1..N with no gaps or reuse.
+	assert sorted(int(i.rsplit("_", 1)[1]) for i in ids) == list(range(1, WORKERS + 1))
+	assert {p.name for p in list_runs(ws)} == set(ids)
+	assert {r["run_id"] for r in query_runs(ws)} == set(ids)
+
+
+def test_lost_counter_falls_back_to_mkdir(ws):
+	first = create_run(ws, "a").run_id
+	(ws / ".continuum" / "state" / "run_counter.json").unlink()
+	second = create_run(ws, "b").run_id
+	assert first != second
+	assert int(second.rsplit("_", 1)[1]) == int(first.rsplit("_", 1)[1]) + 1
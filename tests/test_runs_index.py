@@ -0,0 +1,39 @@
+from __future__ import annotations
+
+import argparse
+
+import pytest
+
+from continuum_engine.commands import runs as runs_cmd
+from continuum_engine.runs.index import normalize_since, select_runs, upsert_runs
+
+STARTED = ["2025-01-01T23:59:59Z", "2025-01-02T09:59:59Z", "2025-01-02T10:00:00Z", "2025-01-02T18:30:00Z", "2025-01-03T00:00:00Z"]
+
+
+@pytest.fixture
+def indexed(ws):
+	upsert_runs(ws, [{"run_id": f"{i + 1:06d}", "status": "success", "started_at": s} for i, s in enumerate(STARTED)])
+	return ws
+
+
+@pytest.mark.parametrize("raw,normalized", [
+	("2025-01-02 10:00", "2025-01-02T10:00:00Z"),
+	("2025-01-02T10:00:00Z", "2025-01-02T10:00:00Z"),
+	("2025-01-02", "2025-01-02T00:00:00Z"),
+	("2025-01-02T12:00:00+02:00", "2025-01-02T10:00:00Z"),
+	("2025-01-02T10:00:00.750", "2025-01-02T10:00:00Z"),
+])
+def test_normalize_since(raw, normalized):
+	assert normalize_since(raw) == normalized
+
+
+@pytest.mark.parametrize("since", ["2025-01-02 10:00", "2025-01-02T10:00", "2025-01-02T11:00+01:00"])
+def test_since_keeps_runs_of_that_day(indexed, since):
+	started = sorted(r["started_at"] for r in select_runs(indexed, since=since))
+	assert started == STARTED[2:]
+
+
+def test_invalid_since_prints_err(indexed, capsys):
+	args = argparse.Namespace(workspace=str(indexed), runs_cmd="list", since="yesterday", jsonl=False, json=False, limit=None, status=None)
+	assert runs_cmd.run(args) == 1
+	assert capsys.readouterr().out.startswith("[err] invalid --since value 'yesterday'")
@@ -0,0 +1,58 @@
+from __future__ import annotations
+
+import os
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+ENGINE = Path(__file__).resolve().parent.parent / "engine"
+# Startup cost over a bare interpreter, in ms; override for slow CI machines.
+BUDGET_MS = float(os.environ.get("CONTINUUM_STARTUP_BUDGET_MS", "250"))
+HEAVY = ("torch", "vllm", "transformers", "asyncio", "continuum_engine.install", "continuum_engine.pull", "continuum_engine.create", "continuum_engine.ollama")
+
+
+def _env() -> dict:
+	env = dict(os.environ)
+	env["PYTHONPATH"] = str(ENGINE)
+	env["CONTINUUM_NO_DAEMON"] = "1"
+	return env
+
+
+def _imported(args: list[str], cwd: Path) -> set[str]:
+	proc = subprocess.run(
+		[sys.executable, "-X", "importtime", "-m", "continuum_engine.cli", *args],
+		cwd=cwd, env=_env(), capture_output=True, text=True,
+	)
+	assert proc.returncode == 0, proc.stdout + proc.stderr
+	names = set()
+	for line in proc.stderr.splitlines():
+		if line.startswith("import time:") and "|" in line:
+			names.add(line.rsplit("|", 1)[1].strip())
+	return names
+
+
+def _wall_ms(cmd: list[str], cwd: Path, runs: int = 5) -> float:
+	times = []
+	for _ in range(runs):
+		started = time.perf_counter()
+		subprocess.run(cmd, cwd=cwd, env=_env(), capture_output=True, check=False)
+		times.append((time.perf_counter() - started) * 1000)
+	return statistics.median(times)
+
+
+@pytest.mark.parametrize("args", [["--help"], ["status"], ["runs", "list"]])
+def test_cli_does_not_import_heavy_modules(ws, args):
+	names = _imported(args, ws)
+	loaded = sorted(n for n in names if any(n == h or n.startswith(h + ".") for h in HEAVY))
+	assert loaded == []
+
+
+@pytest.mark.parametrize("args", [["--help"], ["status"]])
+def test_cli_startup_within_budget(ws, args):
+	bare = _wall_ms([sys.executable, "-c", "pass"], ws)
+	cli = _wall_ms([sys.executable, "-m", "continuum_engine.cli", *args], ws)
+	assert cli - bare <= BUDGET_MS, f"continuum {' '.join(args)}: {cli - bare:.0f}ms over a bare interpreter (budget {BUDGET_MS:.0f}ms)"
@@ -0,0 +1,66 @@
+from __future__ import annotations
+
+import subprocess
+import sys
+import textwrap
+
+import pytest
+
+from continuum_engine.runs.telemetry import TelemetrySampler, summarize_telemetry, telemetry_path
+
+psutil = pytest.importorskip("psutil")
+
+MB = 1024 * 1024
+
+# Writes `argv[2]` MiB to `argv[1]` and fsyncs so the bytes show up in write_bytes, then lingers
+# `argv[3]` seconds so the sampler sees it alive with those counters.
+WRITER = (
+	"import os, sys, time; fd = os.open(sys.argv[1], os.O_WRONLY | os.O_CREAT)\n"
+	"for _ in range(int(sys.argv[2])): os.write(fd, b'x' * (1 << 20))\n"
+	"os.fsync(fd); os.close(fd); time.sleep(float(sys.argv[3]))"
+)
+
+# One writer reaped by the launcher, one reaped by an intermediate process, and one orphaned by an
+# intermediate that exits first. The kernel folds reaped children into their parent's counters, but
+# the orphan is reaped outside the tree, so only the sampler's carried total keeps its bytes.
+TREE = textwrap.dedent("""
+	import subprocess, sys, time
+	py, writer, out = sys.argv[1], sys.argv[2], sys.argv[3]
+	subprocess.run([py, "-c", writer, f"{out}.direct", "4", "0.3"])
+	subprocess.run([py, "-c", "import subprocess, sys; subprocess.run(sys.argv[1:])", py, "-c", writer, f"{out}.nested", "4", "0.3"])
+	subprocess.run([py, "-c", "import subprocess, sys, time; subprocess.Popen(sys.argv[1:]); time.sleep(0.6)", py, "-c", writer, f"{out}.orphan", "4", "0.6"])
+	time.sleep(1.0)
+""")
+
+
+def test_exited_children_stay_in_io_totals(tmp_path):
+	run_dir = tmp_path / "run"
+	run_dir.mkdir()
+	proc = subprocess.Popen([sys.executable, "-c", TREE, sys.executable, WRITER, str(tmp_path / "data")])
+	sampler = TelemetrySampler(proc.pid, telemetry_path(run_dir), interval=0.1)
+	sampler.start()
+	proc.wait()
+	sampler.stop()
+	summary = summarize_telemetry(run_dir)
+	assert summary["samples"] >= 5
+	# Reaped writers fold into their parent's counters; counting them again as well would overshoot.
+	assert 12 * MB <= summary["write_bytes"] < 20 * MB
+	written = sampler.columns["write_bytes"]
+	assert written == sorted(written)
+
+
+def test_no_rewrite_without_new_rows(tmp_path, monkeypatch):
+	proc = subprocess.Popen([sys.executable, "-c", "import time; time.sleep(1)"])
+	sampler = TelemetrySampler(proc.pid, tmp_path / "telemetry.json", interval=0.1)
+
+	def broken(root, t):
+		raise RuntimeError("sampling failed")
+
+	flushes = []
+	monkeypatch.setattr(sampler, "_sample", broken)
+	monkeypatch.setattr(sampler, "_flush", lambda: flushes.append(len(sampler.columns["t"])))
+	sampler.start()
+	proc.wait()
+	sampler._stop.set()
+	sampler._thread.join()
+	assert flushes == []
@@ -0,0 +1,46 @@
+from __future__ import annotations
+
+import os
+
+import pytest
+
+from continuum_engine.scan.bench import make_tree, os_walk_totals, walker_totals
+from continuum_engine.utils.walk import scandir_listing, tree_size, walk
+
+
+@pytest.fixture
+def tree(tmp_path):
+	root = tmp_path / "tree"
+	make_tree(root, 500, per_dir=40, fanout=4)
+	(root / ".git").mkdir()
+	(root / ".git" / "HEAD").write_text("ref", encoding="utf-8")
+	return root
+
+
+@pytest.mark.parametrize("jobs", [1, 4])
+def test_walker_matches_os_walk(tree, jobs):
+	assert walker_totals(tree, jobs) == os_walk_totals(tree)
+
+
+def test_walk_yields_every_directory_once(tree):
+	rels = [rel for rel, _ in walk(tree, scandir_listing, jobs=8)]
+	expected = {"" if d == str(tree) else os.path.relpath(d, tree) for d, dirs, _ in os.walk(tree) if ".git" not in d.split(os.sep)}
+	assert len(rels) == len(set(rels))
+	assert set(rels) == expected
+
+
+def test_tree_size_includes_excluded_names(tree):
+	_, total = os_walk_totals(tree)
+	assert tree_size(tree, jobs=4) == total + len("ref")
+
+
+def test_walk_skips_unreadable_directories(tmp_path):
+	(tmp_path / "ok").mkdir()
+	(tmp_path / "ok" / "a").write_bytes(b"12")
+
+	def list_dir(path, rel):
+		if rel == "ok":
+			raise PermissionError(path)
+		return scandir_listing(path, rel)
+
+	assert [rel for rel, _ in walk(tmp_path, list_dir, jobs=2)] == [""]
@@ -0,0 +1,77 @@
+from __future__ import annotations
+
+import errno
+import threading
+import time
+
+import pytest
+
+from continuum_engine.scan.watch import WorkspaceWatcher
+from continuum_engine.utils import inotify
+
+pytestmark = pytest.mark.skipif(not inotify.inotify_available(), reason="inotify not available")
+
+
+def _out_of_watches(watcher: WorkspaceWatcher, monkeypatch, prefix: str) -> None:
+	real = watcher._add_watch
+
+	def add_watch(rel: str) -> None:
+		if rel.startswith(prefix):
+			raise OSError(errno.ENOSPC, "No space left on device")
+		real(rel)
+
+	monkeypatch.setattr(watcher, "_add_watch", add_watch)
+
+
+def _wait_for(cond, timeout: float = 10.0) -> bool:
+	deadline = time.monotonic() + timeout
+	while not cond() and time.monotonic() < deadline:
+		time.sleep(0.02)
+	return cond()
+
+
+def test_new_tree_is_indexed_when_watches_run_out(ws, monkeypatch):
+	watcher = WorkspaceWatcher(ws)
+	assert watcher._arm()
+	try:
+		(ws / "data" / "sub").mkdir(parents=True)
+		(ws / "data" / "a.bin").write_bytes(b"x" * 10)
+		(ws / "data" / "sub" / "b.bin").write_bytes(b"x" * 20)
+		_out_of_watches(watcher, monkeypatch, "data")
+		watcher._add_tree("data")
+		assert set(watcher.index["dirs"]["data"]["files"]) == {"a.bin"}
+		assert set(watcher.index["dirs"]["data/sub"]["files"]) == {"b.bin"}
+		assert watcher.watch_limit_hit
+	finally:
+		watcher._disarm()
+
+
+def test_run_falls_back_to_sweeps_when_watches_run_out(ws, monkeypatch):
+	watcher = WorkspaceWatcher(ws, flush_interval=0.1)
+	stop = threading.Event()
+	t = threading.Thread(target=watcher.run, args=(stop,))
+	t.start()
+	try:
+		assert _wait_for(lambda: watcher.mode == "inotify")
+		_out_of_watches(watcher, monkeypatch, "data")
+		(ws / "data" / "sub").mkdir(parents=True)
+		(ws / "data" / "sub" / "b.bin").write_bytes(b"x" * 20)
+		assert _wait_for(lambda: watcher.stats["watch_limit_hits"] == 1)
+		assert _wait_for(lambda: watcher.mode == "sweep" and watcher.rearm_at is not None)
+		assert "data/sub" in watcher.index["dirs"]
+	finally:
+		stop.set()
+		t.join(timeout=10)
+
+
+def test_arm_schedules_rearm_when_watches_run_out(ws, monkeypatch):
+	watcher = WorkspaceWatcher(ws)
+
+	def add_watch(rel: str) -> None:
+		raise OSError(errno.ENOSPC, "No space left on device")
+
+	monkeypatch.setattr(watcher, "_add_watch", add_watch)
+	before = time.monotonic()
+	assert not watcher._arm()
+	assert watcher.mode == "sweep"
+	assert watcher.rearm_at is not None and watcher.rearm_at > before